@@ -24,6 +24,9 @@ import sys
 import os
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
+from sbcp_events import subscribe_finality
+from sbcp_load import LoadGenerator, LoadProfile, default_transaction, find_saturation, http_transaction_sender
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -34,7 +37,10 @@ class ExperimentConfig:
     num_validators: int = 10
     byzantine_fraction: float = 0.2
     num_transactions: int = 1000
-    transaction_rate: float = 10.0  # TPS
+    transaction_rate: float = 10.0  # TPS offered as Poisson arrivals (see sbcp_load)
+    saturation_levels: int = 5  # Load steps of the saturation search, doubling from transaction_rate
+    saturation_step_seconds: float = 10.0
+    saturation_max_p99: float = 1.0  # Seconds of corrected p99 latency still counted as sustained
     network_latency_ms: float = 50.0
     experiment_duration: int = 300  # seconds
     use_docker: bool = False
@@ -198,6 +204,7 @@ class SBCPExperimentOrchestrator:
         experiments = [
             ("confidence_evolution", self.experiment_confidence_evolution),
             ("throughput_scaling", self.experiment_throughput_scaling),
+            ("saturation_search", self.experiment_saturation_search),
             ("byzantine_resilience", self.experiment_byzantine_resilience),
             ("network_latency_impact", self.experiment_network_latency),
             ("fraud_detection", self.experiment_fraud_detection),
@@ -298,13 +305,13 @@ class SBCPExperimentOrchestrator:
                 
             logger.info(f"Testing throughput with {validator_count} validators")
             
-            start_time = time.time()
             successful_transactions = 0
+            urls = [f"http://localhost:{self.config.validator_base_port + validator_id}"
+                    for validator_id in range(validator_count)]
             
-            async with aiohttp.ClientSession() as session:
-                # Send burst of transactions
-                tasks = []
-                for i in range(50):  # 50 transactions per test
+            async with aiohttp.ClientSession(timeout=self.http_timeout) as session:
+                async def send(i: int):
+                    nonlocal successful_transactions
                     tx_data = {
                         "tx_id": f"throughput_test_{validator_count}_{i}",
                         "from_addr": f"addr_{i % 10}",
@@ -316,26 +323,31 @@ class SBCPExperimentOrchestrator:
                     }
                     
                     # Send to subset of validators
-                    for validator_id in range(validator_count):
-                        port = self.config.validator_base_port + validator_id
-                        task = self.send_transaction(session, f"http://localhost:{port}", tx_data)
-                        tasks.append(task)
+                    responses = await asyncio.gather(*(self.send_transaction(session, url, tx_data) for url in urls),
+                                                     return_exceptions=True)
+                    successful_transactions += sum(1 for r in responses if not isinstance(r, Exception))
                 
-                # Execute all tasks
-                responses = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Count successful responses
-                successful_transactions = sum(1 for r in responses if not isinstance(r, Exception))
+                # 50 transactions per test, arriving as a Poisson stream at the configured rate;
+                # the profile runs long enough that max_requests, not its duration, ends the test
+                transactions_per_test = 50
+                generator = LoadGenerator(send)
+                load = await generator.run_open_loop(
+                    LoadProfile.constant(self.config.transaction_rate,
+                                         4 * transactions_per_test / self.config.transaction_rate),
+                    max_requests=transactions_per_test
+                )
             
-            end_time = time.time()
-            duration = end_time - start_time
+            duration = load["elapsed"]
             tps = successful_transactions / duration
             
             results["scaling_data"].append({
                 "validator_count": validator_count,
                 "successful_transactions": successful_transactions,
                 "duration": duration,
-                "tps": tps
+                "tps": tps,
+                "offered_tps": load["offered_tps"],
+                "latency_p50": load["response_time"]["p50"],
+                "latency_p99": load["response_time"]["p99"]
             })
             
             logger.info(f"Validator count {validator_count}: {tps:.2f} TPS")
@@ -345,6 +357,28 @@ class SBCPExperimentOrchestrator:
         
         return results
     
+    async def experiment_saturation_search(self) -> Dict[str, Any]:
+        """Step the offered load up until the cluster stops keeping up, to find its saturation point"""
+        levels = [self.config.transaction_rate * 2 ** step for step in range(self.config.saturation_levels)]
+        logger.info(f"Starting saturation search at {levels} TPS")
+        
+        urls = [f"http://localhost:{self.config.validator_base_port + i}" for i in range(self.config.num_validators)]
+        async with aiohttp.ClientSession(timeout=self.http_timeout) as session:
+            generator = LoadGenerator(http_transaction_sender(session, urls, default_transaction("saturation_test")))
+            load = await generator.run_open_loop(LoadProfile.steps(levels, self.config.saturation_step_seconds))
+        
+        saturation = find_saturation(load, self.config.saturation_max_p99)
+        for stage in load["stages"]:
+            logger.info(f"Offered {stage['offered_tps']:.1f} TPS: achieved {stage['achieved_tps']:.1f} TPS, "
+                        f"p99 {stage['response_time']['p99'] * 1000:.1f} ms, {stage['errors']} errors")
+        
+        return {
+            "experiment": "saturation_search",
+            "load": load,
+            "max_sustained_tps": saturation["offered_tps"] if saturation else 0.0,
+            "saturation_stage": saturation
+        }
+    
     async def experiment_byzantine_resilience(self) -> Dict[str, Any]:
         """Experiment 3: Test Byzantine fault tolerance"""
         logger.info("Starting Byzantine resilience experiment")
@@ -562,6 +596,16 @@ class SBCPExperimentOrchestrator:
                     "complexity_class": 2
                 }
                 
+                # Tier transitions are pushed by the first validator, timed from the transaction's timestamp
+                finality_times = {}
+                
+                async def watch_finality():
+                    stream_url = f"http://localhost:{self.config.validator_base_port}/finality/stream"
+                    async for event in subscribe_finality(session, stream_url, tx_id=tx_data["tx_id"]):
+                        finality_times[event["tier"]] = event["elapsed"]
+                
+                watcher = asyncio.create_task(watch_finality())
+                
                 # Send to all validators and track convergence
                 validator_responses = []
                 for validator_id in range(self.config.num_validators):
@@ -578,6 +622,11 @@ class SBCPExperimentOrchestrator:
                     except:
                         pass
                 
+                try:
+                    await asyncio.wait_for(watcher, timeout=2.0)
+                except asyncio.TimeoutError:
+                    pass  # Tiers not reached within the window are simply absent
+                
                 # Analyze convergence
                 if validator_responses:
                     convergence_time = max(r["response_time"] for r in validator_responses)
@@ -589,6 +638,7 @@ class SBCPExperimentOrchestrator:
                         "convergence_time": convergence_time,
                         "final_confidence": final_confidence,
                         "consensus_agreement": consensus_agreement,
+                        "finality_times": finality_times,
                         "validator_responses": validator_responses
                     })
         
@@ -895,6 +945,7 @@ async def main():
     parser.add_argument("--validators", type=int, default=10, help="Number of validators")
     parser.add_argument("--byzantine-fraction", type=float, default=0.2, help="Byzantine validator fraction")
     parser.add_argument("--transactions", type=int, default=100, help="Number of test transactions")
+    parser.add_argument("--rate", type=float, default=10.0, help="Offered transaction rate (TPS)")
     parser.add_argument("--docker", action="store_true", help="Use Docker containers")
     parser.add_argument("--results-dir", default="./experiment_results", help="Results directory")
     
@@ -905,6 +956,7 @@ async def main():
         num_validators=args.validators,
         byzantine_fraction=args.byzantine_fraction,
         num_transactions=args.transactions,
+        transaction_rate=args.rate,
         use_docker=args.docker,
         results_dir=args.results_dir
     )
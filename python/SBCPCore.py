@@ -5,12 +5,17 @@ import json
 import time
 import hashlib
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Set, Optional, Tuple
+from typing import Dict, List, Set, Optional, Tuple, Union
 from enum import Enum
 import random
 from collections import defaultdict, deque
 import logging
 
+from sbcp_confidence import confidence_batch, confidence_from_sums, lambda_rate, preset, scaled_elapsed
+from sbcp_history import HistorySink, RingHistorySink
+from sbcp_registry import ValidatorRegistry, ValidatorView
+from sbcp_scheduler import EventScheduler
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -46,60 +51,71 @@ class Transaction:
         if self.arrival_time == 0.0:
             self.arrival_time = time.time()
 
-@dataclass
-class Validator:
-    node_id: str
-    reputation: float = 1.0
-    stake_weight: float = 1.0
-    processing_capacity: float = 1.0
-    network_latency: float = 0.05  # 50ms default
-    is_byzantine: bool = False
-    validation_accuracy: float = 1.0
-    
 class SBCPSimulator:
-    def __init__(self, num_validators: int = 20, byzantine_fraction: float = 0.2):
-        self.validators: Dict[str, Validator] = {}
+    def __init__(self, num_validators: int = 20, byzantine_fraction: float = 0.2,
+                 seed: Union[int, np.random.Generator, None] = None,
+                 scheduler: Optional[EventScheduler] = None,
+                 history_sink: Optional[HistorySink] = None):
+        self.validators = ValidatorRegistry(
+            columns=("reputation", "stake_weight", "processing_capacity", "network_latency", "validation_accuracy"),
+            capacity=num_validators
+        )
         self.transactions: Dict[str, Transaction] = {}
-        self.confidence_history: Dict[str, List[Tuple[float, float]]] = {}
+        # Bounded (elapsed time, confidence) points per tx_id; see sbcp_history for other modes
+        self.confidence_history: HistorySink = history_sink or RingHistorySink()
         self.network_load = 0.0
         self.lambda_base = 0.5
+        self.confidence_params = preset("core", lambda_base=self.lambda_base)
         self.rolling_hash = hashlib.sha256(b"genesis").hexdigest()
         
+        # Simulated clock for network latency (EventScheduler(realtime=True) restores wall-clock sleeps)
+        self.scheduler = scheduler or EventScheduler()
+        
+        # Independent random streams so the scalar and batch paths draw identical numbers
+        if isinstance(seed, np.random.Generator):
+            seed = int(seed.integers(2 ** 63))
+        validator_seq, tx_seq, selection_seq, vote_seq = np.random.SeedSequence(seed).spawn(4)
+        validator_rng = np.random.default_rng(validator_seq)
+        self._tx_rng = np.random.default_rng(tx_seq)
+        self._selection_rng = np.random.default_rng(selection_seq)
+        self._vote_rng = np.random.default_rng(vote_seq)
+        
         # Initialize validators
         byzantine_count = int(num_validators * byzantine_fraction)
         for i in range(num_validators):
-            validator = Validator(
-                node_id=f"validator_{i}",
-                reputation=random.uniform(0.7, 1.0),
-                stake_weight=random.uniform(0.5, 2.0),
-                processing_capacity=random.uniform(0.8, 1.5),
-                network_latency=random.uniform(0.01, 0.1),
+            self.validators.add(
+                f"validator_{i}",
                 is_byzantine=(i < byzantine_count),
-                validation_accuracy=0.3 if i < byzantine_count else random.uniform(0.95, 1.0)
+                reputation=float(validator_rng.uniform(0.7, 1.0)),
+                stake_weight=float(validator_rng.uniform(0.5, 2.0)),
+                processing_capacity=float(validator_rng.uniform(0.8, 1.5)),
+                network_latency=float(validator_rng.uniform(0.01, 0.1)),
+                validation_accuracy=0.3 if i < byzantine_count else float(validator_rng.uniform(0.95, 1.0))
             )
-            self.validators[validator.node_id] = validator
+    
             
+    @staticmethod
+    def _address_risk(addr: str) -> float:
+        """Stable per-address risk in [0, 1) (built-in hash() is salted per process)"""
+        return int(hashlib.sha256(addr.encode()).hexdigest()[:8], 16) % 100 / 100.0
+    
     def compute_risk_score(self, tx: Transaction) -> float:
         """ML-driven risk assessment simulation"""
         # Simplified risk model based on transaction characteristics
         value_risk = min(tx.value / 10000, 1.0)  # Higher values = higher risk
         
         # Simulate sender/receiver reputation (simplified)
-        sender_risk = hash(tx.from_addr) % 100 / 100.0
-        receiver_risk = hash(tx.to_addr) % 100 / 100.0
+        sender_risk = self._address_risk(tx.from_addr)
+        receiver_risk = self._address_risk(tx.to_addr)
         
         # Combined risk score
         risk = (0.4 * value_risk + 0.3 * sender_risk + 0.3 * receiver_risk)
         return min(risk, 1.0)
     
     def compute_confidence_score(self, tx: Transaction, current_time: float) -> float:
-        """Compute confidence score using the formula C(T,t) = 1 - e^(-λ(t)·V(T,t))"""
-        # Use a minimum time elapsed to avoid zero confidence
-        time_elapsed = max(current_time - tx.arrival_time, 0.001)  # At least 1ms
-        
+        """Compute confidence score using the formula C(T,t) = 1 - e^(-λ(t)·V(T,t)) (sbcp_confidence "core" preset)"""
         # Network stability factor
         network_stability = 1.0 - (self.network_load / 2.0)
-        lambda_t = max(self.lambda_base * (1 + 0.1 * network_stability), 1.0)  # Ensure lambda >= 1.0
         
         # Validation weight V(T,t) = Σ(wi * vi * Ri)
         validation_weight = 0.0
@@ -114,49 +130,52 @@ class SBCPSimulator:
                 validation_weight += wi * vi * ri
                 total_validators_voted += 1
         
-        # Ensure we have some validation weight
-        if validation_weight == 0 and total_validators_voted > 0:
-            validation_weight = 0.1  # Minimum weight for any validation activity
-        
         # Debug output (remove after fixing)
         if tx.tx_id == "tx_0":  # Debug first transaction
+            time_elapsed = scaled_elapsed(self.confidence_params, current_time - tx.arrival_time)
+            lambda_t = lambda_rate(self.confidence_params, network_stability)
             print(f"DEBUG tx_0: time_elapsed={time_elapsed:.6f}, lambda_t={lambda_t:.3f}, validation_weight={validation_weight:.3f}")
         
-        # Confidence score calculation
-        exponent = -lambda_t * validation_weight * time_elapsed
-        confidence = 1.0 - np.exp(exponent)
-        return min(confidence, 1.0)
+        # Confidence score calculation (a vote-bearing transaction with no weight counts as 0.1)
+        return confidence_from_sums(self.confidence_params, validation_weight, 0.0, total_validators_voted,
+                                    current_time - tx.arrival_time, participation=network_stability)
     
-    def validate_transaction(self, tx: Transaction, validator: Validator) -> bool:
+    def validate_transaction(self, tx: Transaction, validator: ValidatorView, draw: Optional[float] = None) -> bool:
         """Simulate validator decision with reputation-based accuracy"""
+        if draw is None:
+            draw = float(self._vote_rng.random())
+        
         if validator.is_byzantine:
             # Byzantine validators are unreliable
-            return random.random() < validator.validation_accuracy
+            return draw < validator.validation_accuracy
         else:
             # Honest validators with high accuracy
             base_validity = tx.risk_score < 0.8  # Simple validity rule
-            return random.random() < validator.validation_accuracy if base_validity else False
+            return draw < validator.validation_accuracy if base_validity else False
     
     def process_transaction(self, tx: Transaction) -> None:
         """Process individual transaction through state machine"""
-        current_time = time.time()
+        current_time = self.scheduler.now
         
         # Risk assessment
         tx.risk_score = self.compute_risk_score(tx)
         
-        # Route to validators based on complexity
+        # Route to validators based on complexity (one draw per validator keeps streams aligned with batch mode)
+        validator_ids = self.validators.node_ids
         required_validators = min(5 + tx.complexity_class * 2, len(self.validators))
-        selected_validators = random.sample(list(self.validators.keys()), required_validators)
+        selection_order = np.argsort(self._selection_rng.random(len(validator_ids)), kind='stable')
+        selected_validators = [validator_ids[j] for j in selection_order[:required_validators]]
+        vote_draws = self._vote_rng.random(len(validator_ids))
         
         # Validation process
-        for validator_id in selected_validators:
+        for position, validator_id in enumerate(selected_validators):
             validator = self.validators[validator_id]
             
             # Simulate network delay
-            time.sleep(validator.network_latency / 1000)  # Convert to seconds
+            self.scheduler.sleep(validator.network_latency / 1000)  # Convert to seconds
             
             # Validator decision
-            vote = self.validate_transaction(tx, validator)
+            vote = self.validate_transaction(tx, validator, float(vote_draws[position]))
             tx.validator_votes[validator_id] = vote
             tx.validation_count += 1
             
@@ -174,9 +193,7 @@ class SBCPSimulator:
             tx.state = TransactionState.VALIDATED
             
         # Store in confidence history for analysis
-        if tx.tx_id not in self.confidence_history:
-            self.confidence_history[tx.tx_id] = []
-        self.confidence_history[tx.tx_id].append((current_time - tx.arrival_time, tx.confidence_score))
+        self.confidence_history.append(tx.tx_id, current_time - tx.arrival_time, tx.confidence_score)
         
         # Update rolling hash
         tx_hash = hashlib.sha256(json.dumps(asdict(tx), default=str).encode()).hexdigest()
@@ -193,18 +210,21 @@ class SBCPSimulator:
             'throughput_metrics': []
         }
         
-        start_time = time.time()
+        start_time = self.scheduler.now
         
         for i in range(num_transactions):
             # Generate transaction
+            u = self._tx_rng.random(4)
+            now = self.scheduler.now
             tx = Transaction(
                 tx_id=f"tx_{i}",
-                from_addr=f"addr_{random.randint(0, 100)}",
-                to_addr=f"addr_{random.randint(0, 100)}",
-                value=random.uniform(1, 10000),
-                timestamp=time.time(),
-                complexity_class=random.choice([1, 2, 3])
+                from_addr=f"addr_{int(u[0] * 101)}",
+                to_addr=f"addr_{int(u[1] * 101)}",
+                value=float(1.0 + 9999.0 * u[2]),
+                timestamp=now,
+                complexity_class=int(u[3] * 3) + 1
             )
+            tx.arrival_time = now
             
             self.transactions[tx.tx_id] = tx
             self.process_transaction(tx)
@@ -223,10 +243,10 @@ class SBCPSimulator:
             
             # Record finality time if achieved
             if tx.state == TransactionState.FINALIZED:
-                finality_time = time.time() - tx.arrival_time
+                finality_time = self.scheduler.now - tx.arrival_time
                 results['finality_times'].append(finality_time)
         
-        end_time = time.time()
+        end_time = self.scheduler.now
         total_time = end_time - start_time
         
         # Calculate throughput metrics
@@ -241,17 +261,167 @@ class SBCPSimulator:
         
         return results
     
+    def run_confidence_simulation_batch(self, num_transactions: int = 100) -> Dict:
+        """
+        Vectorized equivalent of run_confidence_simulation
+        Draws votes for all transactions x validators as NumPy arrays and always reports virtual time.
+        Per-transaction results and the final rolling hash match the scalar path run on a virtual
+        scheduler with the same seed. Transactions are not kept in self.transactions.
+        """
+        results = {
+            'transactions': [],
+            'confidence_curves': [],
+            'finality_times': [],
+            'throughput_metrics': []
+        }
+        
+        wall_start = time.time()
+        n = num_transactions
+        k = len(self.validators)
+        
+        stake = self.validators.column('stake_weight')
+        reputation = self.validators.column('reputation')
+        accuracy = self.validators.column('validation_accuracy')
+        byzantine = self.validators.is_byzantine
+        latency = self.validators.column('network_latency')
+        
+        # Transaction generation (same draws as the scalar path)
+        tx_draws = self._tx_rng.random((n, 4))
+        from_idx = (tx_draws[:, 0] * 101).astype(np.int64)
+        to_idx = (tx_draws[:, 1] * 101).astype(np.int64)
+        values = 1.0 + 9999.0 * tx_draws[:, 2]
+        complexity = (tx_draws[:, 3] * 3).astype(np.int64) + 1
+        
+        # Risk assessment via per-address lookup tables
+        addr_risk = np.array([self._address_risk(f"addr_{j}") for j in range(101)])
+        value_risk = np.minimum(values / 10000, 1.0)
+        risk = np.minimum(0.4 * value_risk + 0.3 * addr_risk[from_idx] + 0.3 * addr_risk[to_idx], 1.0)
+        
+        # Validator routing and votes
+        required = np.minimum(5 + complexity * 2, k)
+        max_required = int(required.max()) if n else 0
+        selected = np.argsort(self._selection_rng.random((n, k)), axis=1, kind='stable')[:, :max_required]
+        vote_draws = self._vote_rng.random((n, k))[:, :max_required]
+        active = np.arange(max_required)[None, :] < required[:, None]
+        
+        sel_accuracy = accuracy[selected]
+        votes = (vote_draws < sel_accuracy) & (byzantine[selected] | (risk < 0.8)[:, None])
+        
+        # V(T,t) accumulated column by column to reproduce the scalar summation order
+        validation_weight = np.zeros(n)
+        for j in range(max_required):
+            contribution = stake[selected[:, j]] * votes[:, j].astype(float) * reputation[selected[:, j]]
+            validation_weight += np.where(active[:, j], contribution, 0.0)
+        
+        # Network load as seen by each transaction in the scalar loop
+        base_count = len(self.transactions)
+        network_load = np.minimum((base_count + np.arange(n)) / 1000.0, 1.0)
+        if n:
+            network_load[0] = self.network_load
+        network_stability = 1.0 - (network_load / 2.0)
+        
+        # Confidence is evaluated at arrival, so elapsed time is always the 1ms floor
+        confidence = confidence_batch(self.confidence_params, validation_weight, 0.0, required, 0.0,
+                                      participation=network_stability)
+        
+        # Virtual clock: each vote advances time by its validator latency
+        vote_delays = np.where(active, latency[selected] / 1000, 0.0)
+        clock = np.cumsum(np.concatenate(([self.scheduler.now], vote_delays[active])))
+        vote_counts = np.cumsum(required)
+        arrival_times = clock[np.concatenate(([0], vote_counts[:-1]))] if n else clock[:0]
+        completion_times = clock[vote_counts] if n else clock[:0]
+        
+        states = np.select(
+            [confidence >= 0.9999, confidence >= 0.99, confidence >= 0.5],
+            [3, 2, 1],
+            default=0
+        )
+        state_by_code = [TransactionState.VALIDATED, TransactionState.CONSENSUS,
+                         TransactionState.COMMITTED, TransactionState.FINALIZED]
+        
+        # Rolling hash is a sequential chain; serialize the same fields asdict(tx) would produce
+        validator_ids = self.validators.node_ids
+        selected_list = selected.tolist()
+        votes_list = votes.tolist()
+        values_list = values.tolist()
+        risk_list = risk.tolist()
+        confidence_list = confidence.tolist()
+        arrival_list = arrival_times.tolist()
+        completion_list = completion_times.tolist()
+        required_list = required.tolist()
+        complexity_list = complexity.tolist()
+        from_list = from_idx.tolist()
+        to_list = to_idx.tolist()
+        states_list = states.tolist()
+        
+        rolling_hash = self.rolling_hash
+        for i in range(n):
+            state = state_by_code[states_list[i]]
+            tx_id = f"tx_{i}"
+            validator_votes = {
+                validator_ids[selected_list[i][j]]: votes_list[i][j]
+                for j in range(required_list[i])
+            }
+            tx_record = {
+                'tx_id': tx_id,
+                'from_addr': f"addr_{from_list[i]}",
+                'to_addr': f"addr_{to_list[i]}",
+                'value': values_list[i],
+                'timestamp': arrival_list[i],
+                'risk_score': risk_list[i],
+                'complexity_class': complexity_list[i],
+                'security_level': 2,
+                'confidence_score': confidence_list[i],
+                'state': state,
+                'validation_count': required_list[i],
+                'validator_votes': validator_votes,
+                'arrival_time': arrival_list[i]
+            }
+            tx_hash = hashlib.sha256(json.dumps(tx_record, default=str).encode()).hexdigest()
+            rolling_hash = hashlib.sha256((rolling_hash + tx_hash).encode()).hexdigest()
+            
+            results['transactions'].append({
+                'tx_id': tx_id,
+                'confidence': confidence_list[i],
+                'state': state.value,
+                'validation_count': required_list[i],
+                'risk_score': risk_list[i]
+            })
+            if state == TransactionState.FINALIZED:
+                results['finality_times'].append(completion_list[i] - arrival_list[i])
+        
+        self.rolling_hash = rolling_hash
+        self.confidence_history.extend([f"tx_{i}" for i in range(n)], np.zeros(n), confidence)
+        if n:
+            if not self.scheduler.realtime:
+                self.scheduler.run(until=float(clock[-1]))
+            self.network_load = min((base_count + n) / 1000.0, 1.0)
+        
+        total_time = (completion_list[-1] - arrival_list[0]) if n else 0.0
+        results['throughput_metrics'] = {
+            'total_transactions': n,
+            'total_time': total_time,
+            'tps': n / total_time if total_time > 0 else 0,
+            'avg_confidence': np.mean(confidence_list) if n else 0,
+            'finality_rate': len(results['finality_times']) / n if n else 0,
+            'avg_finality_time': np.mean(results['finality_times']) if results['finality_times'] else 0,
+            'wall_clock_time': time.time() - wall_start
+        }
+        
+        return results
+    
     def plot_confidence_evolution(self, tx_ids: List[str] = None):
         """Plot confidence score evolution over time"""
         if tx_ids is None:
-            tx_ids = list(self.confidence_history.keys())[:10]  # Plot first 10
+            tx_ids = self.confidence_history.keys(limit=10)  # Plot first 10 retained
             
         plt.figure(figsize=(12, 8))
         
         for tx_id in tx_ids:
-            if tx_id in self.confidence_history:
-                times, confidences = zip(*self.confidence_history[tx_id])
-                plt.plot(times, confidences, label=f'TX {tx_id[-2:]}', alpha=0.7)
+            # Read each series from the sink only when it is drawn
+            points = self.confidence_history.series(tx_id)
+            if len(points):
+                plt.plot(points['time'], points['confidence'], label=f'TX {tx_id[-2:]}', alpha=0.7)
         
         plt.axhline(y=0.99, color='g', linestyle='--', label='Practical Finality (99%)')
         plt.axhline(y=0.9999, color='r', linestyle='--', label='Crypto Finality (99.99%)')
@@ -265,21 +435,48 @@ class SBCPSimulator:
     
     def analyze_byzantine_impact(self) -> Dict:
         """Analyze impact of Byzantine validators"""
-        honest_validators = [v for v in self.validators.values() if not v.is_byzantine]
-        byzantine_validators = [v for v in self.validators.values() if v.is_byzantine]
+        byzantine = self.validators.is_byzantine
+        reputation = self.validators.column('reputation')
+        honest_count = int((~byzantine).sum())
+        byzantine_count = int(byzantine.sum())
         
         return {
             'total_validators': len(self.validators),
-            'honest_count': len(honest_validators),
-            'byzantine_count': len(byzantine_validators),
-            'byzantine_fraction': len(byzantine_validators) / len(self.validators),
-            'avg_honest_reputation': np.mean([v.reputation for v in honest_validators]),
-            'avg_byzantine_reputation': np.mean([v.reputation for v in byzantine_validators]) if byzantine_validators else 0,
-            'network_resilience': len(honest_validators) / len(self.validators) > 0.51
+            'honest_count': honest_count,
+            'byzantine_count': byzantine_count,
+            'byzantine_fraction': byzantine_count / len(self.validators),
+            'avg_honest_reputation': np.mean(reputation[~byzantine]),
+            'avg_byzantine_reputation': np.mean(reputation[byzantine]) if byzantine_count else 0,
+            'network_resilience': honest_count / len(self.validators) > 0.51
         }
 
+def check_batch_equivalence(seeds=(0, 1, 7, 42), num_transactions: int = 200) -> int:
+    """
+    Run the scalar and batch simulations side by side for each seed and require identical
+    per-transaction confidences, states and final rolling hash; returns the seeds checked
+    """
+    previous_level = logger.level
+    logger.setLevel(logging.WARNING)  # Per-transaction log lines would drown the check
+    try:
+        for seed in seeds:
+            scalar_sim = SBCPSimulator(num_validators=20, byzantine_fraction=0.2, seed=seed)
+            batch_sim = SBCPSimulator(num_validators=20, byzantine_fraction=0.2, seed=seed)
+            scalar = scalar_sim.run_confidence_simulation(num_transactions)['transactions']
+            batched = batch_sim.run_confidence_simulation_batch(num_transactions)['transactions']
+            for expected, actual in zip(scalar, batched):
+                if (expected['confidence'], expected['state']) != (actual['confidence'], actual['state']):
+                    raise AssertionError(f"seed {seed}: {actual['tx_id']} batch {actual['confidence']!r} "
+                                         f"!= scalar {expected['confidence']!r}")
+            if scalar_sim.rolling_hash != batch_sim.rolling_hash:
+                raise AssertionError(f"seed {seed}: rolling hash differs between scalar and batch paths")
+    finally:
+        logger.setLevel(previous_level)
+    return len(seeds)
+
 # Example usage and testing
 if __name__ == "__main__":
+    print(f"Batch path bit-identical to scalar path across {check_batch_equivalence()} seeds")
+    
     # Create simulator with 20 validators, 20% Byzantine
     simulator = SBCPSimulator(num_validators=20, byzantine_fraction=0.2)
     
@@ -8,6 +8,8 @@ from typing import Dict, List
 import random
 from pathlib import Path
 
+from sbcp_confidence import confidence_from_votes, preset
+
 @dataclass 
 class ValidatorNode:
     node_id: str
@@ -29,6 +31,7 @@ class SBCPValidationEngine:
     def __init__(self, num_validators: int = 10, byzantine_fraction: float = 0.2):
         self.validators = self._create_validators(num_validators, byzantine_fraction)
         self.lambda_base = 1.5  # Higher base rate for faster convergence
+        self.confidence_params = preset("basic", lambda_base=self.lambda_base)
         
     def _create_validators(self, num_validators: int, byzantine_fraction: float) -> Dict[str, ValidatorNode]:
         validators = {}
@@ -56,25 +59,17 @@ class SBCPValidationEngine:
         return random.random() < validator.reputation if base_validity else False
     
     def calculate_confidence(self, tx: Transaction, current_time: float) -> float:
-        """C(T,t) = 1 - e^(-λ(t)·V(T,t))"""
-        time_elapsed = max(current_time - tx.timestamp, 0.001)
-        
+        """C(T,t) = 1 - e^(-λ(t)·V(T,t)) (sbcp_confidence "basic" preset)"""
         # Validation weight V(T,t) = Σ(wi * vi * Ri)
-        validation_weight = 0.0
-        for validator_id, vote in tx.votes.items():
-            if validator_id in self.validators:
-                validator = self.validators[validator_id]
-                wi = validator.stake_weight
-                vi = 1.0 if vote else 0.0
-                ri = validator.reputation
-                validation_weight += wi * vi * ri
+        voters = [self.validators[validator_id] for validator_id in tx.votes if validator_id in self.validators]
+        votes = [tx.votes[validator.node_id] for validator in voters]
         
         # Network stability factor
-        lambda_t = self.lambda_base * (1 + 0.2 * len(tx.votes) / len(self.validators))
+        participation = len(tx.votes) / len(self.validators)
         
-        # Confidence calculation
-        confidence = 1.0 - np.exp(-lambda_t * validation_weight * time_elapsed)
-        return min(confidence, 1.0)
+        return confidence_from_votes(self.confidence_params, [validator.stake_weight for validator in voters], votes,
+                                     [validator.reputation for validator in voters],
+                                     current_time - tx.timestamp, participation=participation)
     
     def process_transaction(self, tx: Transaction) -> Dict:
         """Process single transaction through validator network"""
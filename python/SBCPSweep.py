@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+SBCP Byzantine Sweep Runner
+Fans (num_validators, byzantine_fraction, seed) configurations out over a process pool,
+streams each result to a JSON Lines file as it completes and resumes after a crash
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SWEEP_ENGINES = ("core", "evaluation")
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """Single point in a Byzantine resilience sweep"""
+    engine: str  # "core" (SBCPSimulator) or "evaluation" (ImprovedSBCPValidationEngine)
+    num_validators: int
+    byzantine_fraction: float
+    seed: int
+    num_transactions: int = 200
+
+    @property
+    def key(self) -> str:
+        """Stable identifier used to skip finished configurations on resume"""
+        return f"{self.engine}:{self.num_validators}:{self.byzantine_fraction}:{self.seed}:{self.num_transactions}"
+
+def build_sweep_grid(engines: Iterable[str], validator_counts: Iterable[int],
+                     byzantine_fractions: Iterable[float], seeds: Iterable[int],
+                     num_transactions: int = 200) -> List[SweepConfig]:
+    """Cartesian product of sweep dimensions"""
+    return [
+        SweepConfig(engine, num_validators, byzantine_fraction, seed, num_transactions)
+        for engine, num_validators, byzantine_fraction, seed
+        in itertools.product(engines, validator_counts, byzantine_fractions, seeds)
+    ]
+
+def run_sweep_configuration(config: SweepConfig) -> Dict:
+    """
+    Run one configuration in a worker process and return a compact summary
+    The configuration seed is injected into the engine, so results do not depend on the worker
+    """
+    logging.getLogger("SBCPCore").setLevel(logging.WARNING)
+
+    start_time = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if config.engine == "core":
+            from SBCPCore import SBCPSimulator
+
+            simulator = SBCPSimulator(config.num_validators, config.byzantine_fraction, seed=config.seed)
+            results = simulator.run_confidence_simulation_batch(config.num_transactions)
+            metrics = results["throughput_metrics"]
+            summary = {
+                "throughput_tps": metrics["tps"],
+                "average_confidence": float(metrics["avg_confidence"]),
+                "finality_rate": metrics["finality_rate"],
+                "average_finality_time": float(metrics["avg_finality_time"]),
+                "network_resilience": simulator.analyze_byzantine_impact()["network_resilience"],
+                "rolling_hash": simulator.rolling_hash
+            }
+        elif config.engine == "evaluation":
+            from SBCPEvaluationEngine2 import ImprovedSBCPValidationEngine
+
+            engine = ImprovedSBCPValidationEngine(config.num_validators, config.byzantine_fraction, seed=config.seed)
+            results = engine.run_comprehensive_validation(config.num_transactions)
+            performance = results["performance_metrics"]
+            summary = {
+                "throughput_tps": performance["throughput_tps"],
+                "average_confidence": float(performance["average_confidence"]),
+                "confidence_std": float(performance["confidence_std"]),
+                "finality_analysis": results["finality_analysis"],
+                "byzantine_resilience": performance["byzantine_resilience"]
+            }
+        else:
+            raise ValueError(f"Unknown sweep engine: {config.engine}")
+
+    return {
+        "key": config.key,
+        "config": asdict(config),
+        "summary": summary,
+        "worker_pid": os.getpid(),
+        "wall_clock_time": time.time() - start_time
+    }
+
+class ByzantineSweepRunner:
+    """Process-pool Monte Carlo runner with streaming, resumable output"""
+
+    def __init__(self, output_path: str = "./sweep_results/byzantine_sweep.jsonl",
+                 max_workers: Optional[int] = None):
+        self.output_path = Path(output_path)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def completed_keys(self) -> Set[str]:
+        """Keys already present in the output file (truncated trailing lines are ignored)"""
+        keys = set()
+        if not self.output_path.exists():
+            return keys
+
+        with open(self.output_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    keys.add(json.loads(line)["key"])
+                except (json.JSONDecodeError, KeyError):
+                    continue
+        return keys
+
+    def discard_partial_line(self):
+        """Truncate a trailing line cut short by a crash, so the next result starts on a fresh line"""
+        if not self.output_path.exists():
+            return
+
+        with open(self.output_path, "rb+") as f:
+            contents = f.read()
+            if contents and not contents.endswith(b"\n"):
+                f.truncate(contents.rfind(b"\n") + 1)
+
+    def run(self, configs: List[SweepConfig]) -> Dict:
+        """Run every configuration not already on disk, appending each result as it completes"""
+        self.discard_partial_line()
+        done = self.completed_keys()
+        pending = [config for config in configs if config.key not in done]
+        logger.info(f"Sweep: {len(configs)} configurations, {len(configs) - len(pending)} already done, "
+                    f"{len(pending)} to run on {self.max_workers} workers")
+
+        completed = 0
+        failed = []
+        start_time = time.time()
+
+        with open(self.output_path, "a", encoding="utf-8") as out, \
+                ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(run_sweep_configuration, config): config for config in pending}
+
+            for future in as_completed(futures):
+                config = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Configuration {config.key} failed: {e}")
+                    failed.append(config.key)
+                    continue
+
+                out.write(json.dumps(result, default=str) + "\n")
+                out.flush()
+                os.fsync(out.fileno())
+
+                completed += 1
+                if completed % 10 == 0 or completed == len(pending):
+                    logger.info(f"Completed {completed}/{len(pending)} configurations")
+
+        return {
+            "total_configurations": len(configs),
+            "skipped": len(configs) - len(pending),
+            "completed": completed,
+            "failed": failed,
+            "total_time": time.time() - start_time,
+            "output_path": str(self.output_path)
+        }
+
+def main():
+    """Command-line entry point for Byzantine sweeps"""
+    parser = argparse.ArgumentParser(description="SBCP Byzantine Sweep Runner")
+    parser.add_argument("--engines", nargs="+", default=["core"], choices=SWEEP_ENGINES, help="Engines to sweep")
+    parser.add_argument("--validators", nargs="+", type=int, default=[10, 20, 50], help="Validator counts")
+    parser.add_argument("--byzantine-fractions", nargs="+", type=float, default=[0.0, 0.1, 0.2, 0.33],
+                        help="Byzantine validator fractions")
+    parser.add_argument("--seeds", nargs="+", type=int, default=list(range(5)), help="Random seeds")
+    parser.add_argument("--transactions", type=int, default=200, help="Transactions per configuration")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--output", default="./sweep_results/byzantine_sweep.jsonl", help="JSON Lines output file")
+
+    args = parser.parse_args()
+
+    configs = build_sweep_grid(args.engines, args.validators, args.byzantine_fractions,
+                               args.seeds, args.transactions)
+    runner = ByzantineSweepRunner(args.output, args.workers)
+    summary = runner.run(configs)
+
+    print(f"\n{'='*60}")
+    print("SBCP BYZANTINE SWEEP COMPLETED")
+    print(f"{'='*60}")
+    print(f"Configurations: {summary['total_configurations']} (skipped {summary['skipped']})")
+    print(f"Completed: {summary['completed']}, Failed: {len(summary['failed'])}")
+    print(f"Total Time: {summary['total_time']:.1f}s")
+    print(f"Results streamed to: {summary['output_path']}")
+
+if __name__ == "__main__":
+    main()
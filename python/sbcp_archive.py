@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Transaction Lifecycle and Archive for SBCP Validators
+Moves transactions that reached absolute finality, outlived their TTL or overflowed the
+active budget out of the validator's in-memory dicts into compact summaries stored in
+an on-disk SQLite index, so lookups by tx_id keep working at a fixed memory budget
+"""
+
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, astuple, fields
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+ARCHIVE_REASONS = ("finality", "ttl", "capacity")
+
+@dataclass
+class ArchivedTransaction:
+    """Compact summary kept for a transaction after it leaves active memory"""
+    tx_id: str
+    final_confidence: float
+    finality_tier: str
+    votes_received: int
+    positive_votes: int
+    quorum_strength: float
+    first_seen: float
+    archived_at: float
+    reason: str  # One of ARCHIVE_REASONS
+
+class TransactionArchive:
+    """
+    Append-mostly SQLite store of ArchivedTransaction rows keyed by tx_id
+    Writes are staged and committed in batches; staged rows are visible to get()
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: int = 256):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self._pending: Dict[str, ArchivedTransaction] = {}
+
+        self._columns = [f.name for f in fields(ArchivedTransaction)]
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS archived_transactions ("
+            "tx_id TEXT PRIMARY KEY, final_confidence REAL, finality_tier TEXT, "
+            "votes_received INTEGER, positive_votes INTEGER, quorum_strength REAL, "
+            "first_seen REAL, archived_at REAL, reason TEXT)"
+        )
+        self._conn.commit()
+
+    def put(self, summary: ArchivedTransaction):
+        """Stage a summary (replaces any earlier summary for the same tx_id)"""
+        self._pending[summary.tx_id] = summary
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Commit staged summaries to disk"""
+        if not self._pending:
+            return
+        placeholders = ", ".join("?" for _ in self._columns)
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO archived_transactions ({', '.join(self._columns)}) VALUES ({placeholders})",
+            [astuple(summary) for summary in self._pending.values()]
+        )
+        self._conn.commit()
+        self._pending.clear()
+
+    def get(self, tx_id: str) -> Optional[ArchivedTransaction]:
+        """Look up an archived transaction by tx_id"""
+        if tx_id in self._pending:
+            return self._pending[tx_id]
+        row = self._conn.execute(
+            f"SELECT {', '.join(self._columns)} FROM archived_transactions WHERE tx_id = ?", (tx_id,)
+        ).fetchone()
+        return ArchivedTransaction(*row) if row else None
+
+    def __contains__(self, tx_id: str) -> bool:
+        return self.get(tx_id) is not None
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._conn.execute("SELECT COUNT(*) FROM archived_transactions").fetchone()[0]
+
+    def counts_by_reason(self) -> Dict[str, int]:
+        self.flush()
+        rows = self._conn.execute("SELECT reason, COUNT(*) FROM archived_transactions GROUP BY reason")
+        return {reason: count for reason, count in rows}
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+class TransactionLifecycleManager:
+    """
+    Tracks when each transaction was first seen and decides when it leaves memory
+    Entries are kept in first-seen order, so TTL and budget checks only touch the
+    oldest entries and cost O(1) when nothing is due
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_active: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_active = max_active
+        self._first_seen: "OrderedDict[str, float]" = OrderedDict()
+
+    def track(self, tx_id: str, now: Optional[float] = None):
+        """Start tracking a transaction (no-op if already tracked)"""
+        if tx_id not in self._first_seen:
+            self._first_seen[tx_id] = time.time() if now is None else now
+
+    def first_seen(self, tx_id: str) -> Optional[float]:
+        return self._first_seen.get(tx_id)
+
+    def forget(self, tx_id: str):
+        self._first_seen.pop(tx_id, None)
+
+    def __len__(self) -> int:
+        return len(self._first_seen)
+
+    def __contains__(self, tx_id: str) -> bool:
+        return tx_id in self._first_seen
+
+    def due(self, now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """(tx_id, reason) for transactions past their TTL or over the active budget, oldest first"""
+        now = time.time() if now is None else now
+        over_budget = len(self._first_seen) - self.max_active
+        due: List[Tuple[str, str]] = []
+
+        for tx_id, first_seen in self._first_seen.items():
+            if now - first_seen >= self.ttl_seconds:
+                due.append((tx_id, "ttl"))
+            elif len(due) < over_budget:
+                due.append((tx_id, "capacity"))
+            else:
+                break
+        return due
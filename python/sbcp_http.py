@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Client for SBCP Validator Gossip
+One long-lived aiohttp session per validator with keep-alive connections, per-peer
+connection limits and a bound on in-flight requests, plus pool health counters
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+class PeerSessionPool:
+    """
+    Long-lived aiohttp session shared by all gossip sends of one validator
+    The session is created lazily inside the running event loop and recreated if the
+    caller moves to a different loop (sessions cannot be shared across loops)
+    """
+
+    def __init__(self, total_limit: int = 100, per_peer_limit: int = 4, max_concurrency: int = 64,
+                 timeout: float = 5.0, keepalive_timeout: float = 30.0):
+        self.total_limit = total_limit
+        self.per_peer_limit = per_peer_limit
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Pool health counters
+        self.sessions_created = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.requests_sent = 0
+        self.requests_failed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_latency = 0.0
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, context, params):
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self.connections_reused += 1
+
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    async def session(self) -> aiohttp.ClientSession:
+        """Session bound to the running loop, created on first use"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and not self._session.closed and not self._loop.is_closed():
+                await self._session.close()
+            connector = aiohttp.TCPConnector(
+                limit=self.total_limit,
+                limit_per_host=self.per_peer_limit,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                trace_configs=[self._trace_config()]
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            self.sessions_created += 1
+        return self._session
+
+    async def post_json(self, url: str, payload: Dict, headers: Optional[Dict[str, str]] = None) -> Optional[Any]:
+        """POST a JSON payload; returns the decoded response body, or None for non-200 replies"""
+        return await self._request("POST", url, json=payload, headers=headers)
+
+    async def get_json(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[Any]:
+        """GET a JSON document; returns the decoded response body, or None for non-200 replies"""
+        return await self._request("GET", url, headers=headers)
+
+    async def _request(self, method: str, url: str, **kwargs) -> Optional[Any]:
+        session = await self.session()
+        async with self._semaphore:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            self.requests_sent += 1
+            start_time = time.perf_counter()
+            try:
+                async with session.request(method, url, **kwargs) as resp:
+                    if resp.status != 200:
+                        self.requests_failed += 1
+                        return None
+                    return await resp.json()
+            except Exception:
+                self.requests_failed += 1
+                raise
+            finally:
+                self.in_flight -= 1
+                self.total_latency += time.perf_counter() - start_time
+
+    def metrics(self) -> Dict:
+        """Pool health for /metrics endpoints"""
+        connections = self.connections_created + self.connections_reused
+        return {
+            "sessions_created": self.sessions_created,
+            "session_open": self._session is not None and not self._session.closed,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "connection_reuse_rate": self.connections_reused / connections if connections else 0.0,
+            "requests_sent": self.requests_sent,
+            "requests_failed": self.requests_failed,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "average_latency_ms": 1000 * self.total_latency / self.requests_sent if self.requests_sent else 0.0,
+            "limits": {
+                "total_connections": self.total_limit,
+                "per_peer_connections": self.per_peer_limit,
+                "max_concurrency": self.max_concurrency
+            }
+        }
+
+    async def close(self):
+        """Close the session and its keep-alive connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+class GossipBatcher:
+    """
+    Outbound coalescing buffer for gossip messages
+    Items are grouped per peer and per kind (e.g. "votes", "signals") and sent as one
+    batch POST when a peer's buffer reaches max_batch items or flush_interval seconds
+    after its first buffered item, whichever comes first. on_flush, if given, is called
+    as on_flush(peer_url, items, seconds, ok) after every batch send, header_factory,
+    if given, supplies extra request headers for each batch (e.g. trace context), and
+    flush_delay, if given, replaces flush_interval with a delay computed when a peer's
+    buffer starts (e.g. the time to the next shared phase slot)
+    """
+
+    def __init__(self, pool: PeerSessionPool, path: str, max_batch: int = 64, flush_interval: float = 0.005,
+                 on_flush: Optional[Callable[[str, int, float, bool], None]] = None,
+                 header_factory: Optional[Callable[[Dict[str, List[Dict]]], Dict[str, str]]] = None,
+                 flush_delay: Optional[Callable[[], float]] = None):
+        self.pool = pool
+        self.path = path
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self.header_factory = header_factory
+        self.flush_delay = flush_delay
+
+        self._buffers: Dict[str, Dict[str, List[Dict]]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Batching counters
+        self.items_enqueued = 0
+        self.batches_sent = 0
+        self.items_sent = 0
+        self.send_failures = 0
+
+    def enqueue(self, peer_url: str, kind: str, item: Dict):
+        """Buffer one gossip item for a peer (must be called from the running event loop)"""
+        buffer = self._buffers.setdefault(peer_url, {})
+        buffer.setdefault(kind, []).append(item)
+        self._sizes[peer_url] = self._sizes.get(peer_url, 0) + 1
+        self.items_enqueued += 1
+
+        if self._sizes[peer_url] >= self.max_batch:
+            self._start_flush(peer_url)
+        elif peer_url not in self._timers:
+            loop = asyncio.get_running_loop()
+            delay = self.flush_delay() if self.flush_delay is not None else self.flush_interval
+            self._timers[peer_url] = loop.call_later(delay, self._start_flush, peer_url)
+
+    def _start_flush(self, peer_url: str):
+        task = asyncio.get_running_loop().create_task(self.flush_peer(peer_url))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush_peer(self, peer_url: str):
+        """Send everything buffered for one peer as a single batch"""
+        timer = self._timers.pop(peer_url, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._buffers.pop(peer_url, None)
+        size = self._sizes.pop(peer_url, 0)
+        if not batch:
+            return
+
+        self.batches_sent += 1
+        self.items_sent += size
+        start_time = time.perf_counter()
+        result = None
+        try:
+            headers = self.header_factory(batch) if self.header_factory is not None else None
+            result = await self.pool.post_json(f"{peer_url}{self.path}", batch, headers)
+            return result
+        except Exception as e:
+            self.send_failures += 1
+            logger.warning(f"Failed to send gossip batch to {peer_url}: {e}")
+        finally:
+            if self.on_flush is not None:
+                self.on_flush(peer_url, size, time.perf_counter() - start_time, result is not None)
+
+    async def flush(self):
+        """Send every pending buffer and wait for in-progress sends"""
+        await asyncio.gather(*(self.flush_peer(peer_url) for peer_url in list(self._buffers)),
+                             *list(self._tasks), return_exceptions=True)
+
+    @property
+    def pending(self) -> int:
+        return sum(self._sizes.values())
+
+    def metrics(self) -> Dict:
+        """Batching health for /metrics endpoints"""
+        return {
+            "items_enqueued": self.items_enqueued,
+            "items_pending": self.pending,
+            "batches_sent": self.batches_sent,
+            "items_sent": self.items_sent,
+            "average_batch_size": self.items_sent / self.batches_sent if self.batches_sent else 0.0,
+            "send_failures": self.send_failures,
+            "max_batch": self.max_batch,
+            "flush_interval_ms": 1000 * self.flush_interval,
+            "computed_flush_delay": self.flush_delay is not None
+        }
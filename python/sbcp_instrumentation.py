@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Shared Instrumentation for SBCP Validators
+Counters, gauges and fixed-bucket latency histograms rendered in the Prometheus
+text exposition format (version 0.0.4), plus the standard metric set that every
+validator flavour records for propose, vote ingest, confidence compute and gossip
+fan-out. Recording is a lock, a bisect and a few additions, so scraping a local
+cluster at 1 Hz costs next to nothing.
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 50us .. 10s, roughly three buckets per decade
+DEFAULT_LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                           0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+class _Metric:
+    """A metric family: one child per combination of label values"""
+
+    metric_type = ""
+    suffix = ""  # Appended to the family name when exposed (e.g. counters as <name>_total)
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 const_labels: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.const_labels = tuple((const_labels or {}).items())
+        self._children: Dict[Tuple[str, ...], "_Metric"] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        """Child for one combination of label values (created on first use)"""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _default(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use labels() first")
+        return self._children[()]
+
+    def _label_pairs(self, values: Tuple[str, ...], extra: Sequence[Tuple[str, str]] = ()):
+        return list(self.const_labels) + list(zip(self.labelnames, values)) + list(extra)
+
+    def render(self) -> List[str]:
+        exposed_name = self.name + self.suffix
+        lines = [f"# HELP {exposed_name} {self.documentation}", f"# TYPE {exposed_name} {self.metric_type}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(child._samples(self, values))
+        return lines
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self.value += amount
+
+    def _samples(self, family: _Metric, values):
+        return [f"{family.name}{family.suffix}{_format_labels(family._label_pairs(values))} {_format_value(self.value)}"]
+
+class Counter(_Metric):
+    """Monotonically increasing count, exposed as <name>_total"""
+
+    metric_type = "counter"
+    suffix = "_total"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+class _GaugeChild:
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        self.value = float(value)
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value from function at scrape time instead of storing it"""
+        self.function = function
+
+    def _samples(self, family: _Metric, values):
+        value = self.function() if self.function is not None else self.value
+        return [f"{family.name}{_format_labels(family._label_pairs(values))} {_format_value(value)}"]
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be computed when scraped"""
+
+    metric_type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def set_function(self, function: Callable[[], float]):
+        self._default().set_function(function)
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        """Observe the wall-clock duration of a with-block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def _samples(self, family: _Metric, values):
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            labels = _format_labels(family._label_pairs(values, [("le", _format_value(bound))]))
+            lines.append(f"{family.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(family._label_pairs(values))
+        lines.append(f"{family.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{family.name}_count{labels} {cumulative}")
+        return lines
+
+class Histogram(_Metric):
+    """Cumulative fixed-bucket histogram (le = upper bound, inclusive)"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 const_labels: Optional[Dict[str, str]] = None,
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, const_labels)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+class MetricsRegistry:
+    """Named collection of metric families rendered together for one scrape"""
+
+    def __init__(self, namespace: str = "sbcp", const_labels: Optional[Dict[str, str]] = None):
+        self.namespace = namespace
+        self.const_labels = dict(const_labels or {})
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        full_name = f"{self.namespace}_{name}" if self.namespace else name
+        if full_name in self._metrics:
+            raise ValueError(f"Metric {full_name} is already registered")
+        metric = cls(full_name, documentation, labelnames, self.const_labels, **kwargs)
+        self._metrics[full_name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Every registered family in text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+class ValidatorInstrumentation:
+    """
+    Standard metric set shared by all validator flavours
+    Validators time their hot paths with the histograms below and bind the gauges
+    to their own state with bind_gauges(); render() produces the /metrics body
+    """
+
+    def __init__(self, node_id: str, flavour: str):
+        self.registry = MetricsRegistry("sbcp", {"node_id": node_id, "flavour": flavour})
+        registry = self.registry
+
+        self.propose_latency = registry.histogram(
+            "propose_latency_seconds", "Time to validate a proposed transaction")
+        self.proposals = registry.counter(
+            "proposals", "Proposed transactions by initial finality tier", ["finality_tier"])
+        self.vote_ingest_latency = registry.histogram(
+            "vote_ingest_latency_seconds", "Time to ingest one peer vote or gossip batch", ["source"])
+        self.votes_ingested = registry.counter(
+            "votes_ingested", "Peer votes by ingest outcome", ["status"])
+        self.confidence_compute_latency = registry.histogram(
+            "confidence_compute_seconds", "Time to compute one confidence score", ["kind"])
+        self.gossip_fanout_latency = registry.histogram(
+            "gossip_fanout_seconds", "Time to deliver one gossip batch to a peer")
+        self.gossip_batches = registry.counter(
+            "gossip_batches", "Gossip batches sent by outcome", ["outcome"])
+        self.gossip_items = registry.counter(
+            "gossip_items", "Gossip items sent to peers")
+        self.stage_latency = registry.histogram(
+            "stage_latency_seconds", "Time spent in one traced pipeline stage (only while tracing)", ["stage"])
+        self.time_to_finality = registry.histogram(
+            "time_to_finality_seconds", "Time from transaction arrival to reaching a finality tier", ["tier"])
+
+        self.active_transactions = registry.gauge("active_transactions", "Transactions held in memory")
+        self.peers = registry.gauge("peers", "Registered peer validators")
+        self.gossip_pending = registry.gauge("gossip_pending_items", "Gossip items buffered for sending")
+        self.processed = registry.gauge("processed_transactions", "Transactions processed since start")
+        self.uptime = registry.gauge("uptime_seconds", "Seconds since the validator started")
+
+    def bind_gauges(self, active_transactions: Callable[[], float], peers: Callable[[], float],
+                    gossip_pending: Callable[[], float], processed: Callable[[], float], start_time: float):
+        """Compute the gauges from validator state at scrape time"""
+        self.active_transactions.set_function(active_transactions)
+        self.peers.set_function(peers)
+        self.gossip_pending.set_function(gossip_pending)
+        self.processed.set_function(processed)
+        self.uptime.set_function(lambda: time.time() - start_time)
+
+    def observe_gossip_flush(self, peer_url: str, size: int, seconds: float, ok: bool):
+        """GossipBatcher on_flush hook"""
+        self.gossip_fanout_latency.observe(seconds)
+        self.gossip_batches.labels(outcome="ok" if ok else "failed").inc()
+        self.gossip_items.inc(size)
+
+    def observe_finality(self, tier: str, elapsed: float):
+        """One published tier transition (see sbcp_events)"""
+        self.time_to_finality.labels(tier=tier).observe(elapsed)
+
+    def render(self) -> str:
+        return self.registry.render()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Load Generation for SBCP Validator Clusters
+Open-loop Poisson arrivals at a target TPS (constant, ramp or step profiles) and
+closed-loop N-client load, optionally paced to a target TPS. Latency is measured
+from each request's intended start time, so time spent waiting behind a slow
+response is counted (coordinated-omission correction); the uncorrected service
+time is reported alongside it. Per-stage results of a step profile locate the
+saturation point of a cluster.
+"""
+
+import argparse
+import asyncio
+import bisect
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import aiohttp
+import numpy as np
+
+from sbcp_metrics import LatencyHistogram
+
+SendFn = Callable[[int], Awaitable[Any]]
+
+class LoadRequestError(Exception):
+    """A request the target answered with a non-200 status"""
+
+class LoadProfile:
+    """
+    Offered load over time as consecutive stages of (duration, start TPS, end TPS)
+    The rate is linear within a stage, so a constant load is one flat stage, a ramp
+    one sloped stage and a step profile several flat ones
+    """
+
+    def __init__(self, stages: Sequence[Tuple[float, float, float]]):
+        if not stages:
+            raise ValueError("A load profile needs at least one stage")
+        self.stages = [(float(duration), float(start), float(end)) for duration, start, end in stages]
+        self._starts = list(np.cumsum([0.0] + [duration for duration, _, _ in self.stages[:-1]]))
+        self.duration = float(sum(duration for duration, _, _ in self.stages))
+        self.peak_tps = max(max(start, end) for _, start, end in self.stages)
+
+    @classmethod
+    def constant(cls, tps: float, duration: float) -> "LoadProfile":
+        return cls([(duration, tps, tps)])
+
+    @classmethod
+    def ramp(cls, start_tps: float, end_tps: float, duration: float) -> "LoadProfile":
+        return cls([(duration, start_tps, end_tps)])
+
+    @classmethod
+    def steps(cls, levels: Sequence[float], step_duration: float) -> "LoadProfile":
+        return cls([(step_duration, tps, tps) for tps in levels])
+
+    def stage_at(self, t: float) -> int:
+        return min(max(bisect.bisect_right(self._starts, t) - 1, 0), len(self.stages) - 1)
+
+    def rate_at(self, t: float) -> float:
+        stage = self.stage_at(t)
+        duration, start_tps, end_tps = self.stages[stage]
+        fraction = (t - self._starts[stage]) / duration if duration > 0 else 0.0
+        return start_tps + (end_tps - start_tps) * min(max(fraction, 0.0), 1.0)
+
+    def stage_bounds(self, stage: int) -> Tuple[float, float]:
+        return self._starts[stage], self._starts[stage] + self.stages[stage][0]
+
+    def expected_requests(self) -> float:
+        return sum(duration * (start + end) / 2 for duration, start, end in self.stages)
+
+    def describe(self) -> List[Dict[str, float]]:
+        return [{"duration": duration, "start_tps": start, "end_tps": end} for duration, start, end in self.stages]
+
+class _StageStats:
+    __slots__ = ("offered", "completed", "errors", "completed_in_window", "response_time")
+
+    def __init__(self):
+        self.offered = 0
+        self.completed = 0
+        self.errors = 0
+        self.completed_in_window = 0  # Completions that landed inside the stage's own time window
+        self.response_time = LatencyHistogram()
+
+class LoadGenerator:
+    """
+    Drives send(index) coroutines against a target and records their latencies
+    send is any coroutine function taking the request index (see http_transaction_sender);
+    at most max_in_flight requests run concurrently, and open-loop requests that have to
+    wait for a free slot keep their intended start time, so the wait shows up as latency
+    """
+
+    def __init__(self, send: SendFn, max_in_flight: int = 1000,
+                 seed: Union[int, np.random.Generator, None] = None):
+        self.send = send
+        self.max_in_flight = max_in_flight
+        self.rng = np.random.default_rng(seed)
+
+    def _reset(self, stages: int):
+        self._service_time = LatencyHistogram()
+        self._response_time = LatencyHistogram()
+        self._stages = [_StageStats() for _ in range(stages)]
+        self._sent = 0
+        self._completed = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._error_samples: List[str] = []
+
+    async def _issue(self, index: int, intended: float, stage: int, start: float, profile: Optional[LoadProfile],
+                     semaphore: asyncio.Semaphore):
+        loop = asyncio.get_running_loop()
+        stats = self._stages[stage]
+        stats.offered += 1
+        self._sent += 1
+        async with semaphore:
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            actual = loop.time()
+            try:
+                await self.send(index)
+                ok = True
+            except Exception as e:
+                ok = False
+                if len(self._error_samples) < 10:
+                    self._error_samples.append(f"{type(e).__name__}: {e}")
+            finally:
+                self._in_flight -= 1
+            done = loop.time()
+
+        if not ok:
+            self._errors += 1
+            stats.errors += 1
+            return
+        self._completed += 1
+        stats.completed += 1
+        self._service_time.record(done - actual)
+        self._response_time.record(done - intended)
+        stats.response_time.record(done - intended)
+        if profile is not None:
+            window_start, window_end = profile.stage_bounds(stage)
+            if window_start <= done - start < window_end:
+                stats.completed_in_window += 1
+
+    def _arrival_times(self, profile: LoadProfile):
+        """Non-homogeneous Poisson arrival offsets by thinning a process at the peak rate"""
+        if profile.peak_tps <= 0:
+            return
+        t = 0.0
+        while True:
+            t += self.rng.exponential(1.0 / profile.peak_tps)
+            if t >= profile.duration:
+                return
+            if self.rng.random() * profile.peak_tps < profile.rate_at(t):
+                yield t
+
+    async def run_open_loop(self, profile: LoadProfile, max_requests: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Poisson arrivals following the profile, independent of how fast responses come back;
+        with max_requests the run ends after that many arrivals even if the profile has not
+        """
+        loop = asyncio.get_running_loop()
+        self._reset(len(profile.stages))
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+        window = profile.duration
+        start = loop.time()
+        for index, offset in enumerate(self._arrival_times(profile)):
+            if max_requests is not None and index >= max_requests:
+                window = offset
+                break
+            delay = start + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = loop.create_task(self._issue(index, start + offset, profile.stage_at(offset), start, profile, semaphore))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*list(tasks))
+        return self._result("open_loop", profile, loop.time() - start, corrected=True, window=window)
+
+    async def run_closed_loop(self, clients: int, duration: float, target_tps: Optional[float] = None,
+                              think_time: float = 0.0) -> Dict[str, Any]:
+        """
+        clients concurrent request loops for duration seconds
+        With target_tps each client is paced to target_tps / clients and latency is taken
+        from the paced (intended) start, so a stall inflates every request it delayed;
+        without it each client sends as soon as its previous response (plus think_time)
+        arrives, and only service time can be measured
+        """
+        loop = asyncio.get_running_loop()
+        profile = LoadProfile.constant(target_tps or 0.0, duration)
+        self._reset(1)
+        semaphore = asyncio.Semaphore(max(self.max_in_flight, clients))
+        start = loop.time()
+        interval = clients / target_tps if target_tps else None
+        counter = iter(range(1 << 62))
+
+        async def client(client_index: int):
+            intended = start + (client_index * interval / clients if interval else 0.0)
+            while True:
+                now = loop.time()
+                if interval is not None:
+                    if intended - start >= duration:
+                        return
+                    if intended > now:
+                        await asyncio.sleep(intended - now)
+                else:
+                    if now - start >= duration:
+                        return
+                    intended = now
+                await self._issue(next(counter), intended, 0, start, None, semaphore)
+                if interval is not None:
+                    intended += interval
+                elif think_time:
+                    await asyncio.sleep(think_time)
+
+        await asyncio.gather(*(client(client_index) for client_index in range(clients)))
+        result = self._result("closed_loop", profile, loop.time() - start, corrected=interval is not None)
+        result["clients"] = clients
+        return result
+
+    def _result(self, mode: str, profile: LoadProfile, elapsed: float, corrected: bool,
+                window: Optional[float] = None) -> Dict[str, Any]:
+        window = profile.duration if window is None else window  # Part of the profile actually offered
+        stages = []
+        for stage, stats in enumerate(self._stages):
+            _, start_tps, end_tps = profile.stages[stage]
+            stage_start, stage_end = profile.stage_bounds(stage)
+            duration = max(min(stage_end, window) - stage_start, 0.0)
+            stages.append({
+                "start_tps": start_tps,
+                "end_tps": end_tps,
+                "offered": stats.offered,
+                "completed": stats.completed,
+                "errors": stats.errors,
+                "offered_tps": stats.offered / duration if duration > 0 else 0.0,
+                "achieved_tps": (stats.completed_in_window if mode == "open_loop" else stats.completed) / duration
+                                if duration > 0 else 0.0,
+                "response_time": stats.response_time.summary()
+            })
+        return {
+            "mode": mode,
+            "profile": profile.describe(),
+            "elapsed": elapsed,
+            "requests_sent": self._sent,
+            "requests_completed": self._completed,
+            "errors": self._errors,
+            "error_samples": self._error_samples,
+            "offered_tps": self._sent / window if window > 0 else 0.0,
+            "achieved_tps": self._completed / elapsed if elapsed > 0 else 0.0,
+            "peak_in_flight": self._peak_in_flight,
+            "coordinated_omission_corrected": corrected,
+            "response_time": self._response_time.summary(),  # From intended start
+            "service_time": self._service_time.summary(),  # From actual send
+            "stages": stages
+        }
+
+def find_saturation(result: Dict[str, Any], max_p99: float, min_efficiency: float = 0.95) -> Optional[Dict[str, Any]]:
+    """
+    Highest stage of a load run that the target kept up with: achieved TPS within
+    min_efficiency of offered TPS and corrected p99 latency at most max_p99 seconds
+    """
+    sustained = None
+    for stage in result["stages"]:
+        keeps_up = stage["offered"] > 0 and stage["achieved_tps"] >= min_efficiency * stage["offered_tps"]
+        if keeps_up and stage["response_time"]["p99"] <= max_p99:
+            if sustained is None or stage["offered_tps"] > sustained["offered_tps"]:
+                sustained = stage
+    return sustained
+
+def default_transaction(prefix: str = "load_tx", seed: Union[int, np.random.Generator, None] = None) -> Callable[[int], Dict]:
+    """Transaction payload factory for /transaction/propose endpoints"""
+    rng = np.random.default_rng(seed)
+
+    def make(index: int) -> Dict:
+        return {
+            "tx_id": f"{prefix}_{index}",
+            "from_addr": f"addr_{rng.integers(0, 100)}",
+            "to_addr": f"addr_{rng.integers(0, 100)}",
+            "value": float(rng.uniform(10, 10000)),
+            "timestamp": time.time(),
+            "risk_score": float(rng.uniform(0, 1)),
+            "complexity_class": int(rng.integers(1, 4))
+        }
+    return make
+
+def http_transaction_sender(session: aiohttp.ClientSession, urls: Sequence[str],
+                            tx_factory: Callable[[int], Dict], path: str = "/transaction/propose") -> SendFn:
+    """send(index) that POSTs tx_factory(index) to the validators round-robin"""
+    urls = list(urls)
+
+    async def send(index: int):
+        async with session.post(f"{urls[index % len(urls)]}{path}", json=tx_factory(index)) as resp:
+            if resp.status != 200:
+                raise LoadRequestError(f"HTTP {resp.status}")
+            return await resp.json()
+    return send
+
+def simulated_server(service_time: float, workers: int = 1) -> SendFn:
+    """send(index) for a queue of `workers` servers with a fixed service time (for self-checks)"""
+    state = {"semaphore": None}
+
+    async def send(index: int):
+        if state["semaphore"] is None:
+            state["semaphore"] = asyncio.Semaphore(workers)
+        async with state["semaphore"]:
+            await asyncio.sleep(service_time)
+    return send
+
+async def _main(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.steps:
+        profile = LoadProfile.steps([float(level) for level in args.steps.split(",")], args.duration)
+    elif args.ramp_to is not None:
+        profile = LoadProfile.ramp(args.tps, args.ramp_to, args.duration)
+    else:
+        profile = LoadProfile.constant(args.tps, args.duration)
+
+    async def run(send: SendFn) -> Dict[str, Any]:
+        generator = LoadGenerator(send, max_in_flight=args.max_in_flight, seed=args.seed)
+        if args.mode == "closed":
+            return await generator.run_closed_loop(args.clients, profile.duration, args.tps if args.paced else None)
+        return await generator.run_open_loop(profile)
+
+    if args.simulate is not None:
+        return await run(simulated_server(args.simulate))
+    connector = aiohttp.TCPConnector(limit=args.max_in_flight)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=30)) as session:
+        return await run(http_transaction_sender(session, args.urls, default_transaction(seed=args.seed), args.path))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SBCP validator load generator")
+    parser.add_argument("urls", nargs="*", help="Validator base URLs (requests are spread round-robin)")
+    parser.add_argument("--mode", choices=["open", "closed"], default="open")
+    parser.add_argument("--tps", type=float, default=50.0, help="Target TPS (ramp start for --ramp-to)")
+    parser.add_argument("--ramp-to", type=float, help="Ramp linearly from --tps to this TPS")
+    parser.add_argument("--steps", help="Comma-separated TPS levels, each held for --duration seconds")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds (per step for --steps)")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent clients in closed-loop mode")
+    parser.add_argument("--paced", action="store_true", help="Pace closed-loop clients to --tps in total")
+    parser.add_argument("--path", default="/transaction/propose")
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--max-p99", type=float, default=0.5, help="p99 latency bound for the saturation point")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--simulate", type=float, metavar="SERVICE_TIME",
+                        help="Drive a simulated single-server queue instead of URLs")
+    args = parser.parse_args()
+    if not args.urls and args.simulate is None:
+        parser.error("give validator URLs or --simulate SERVICE_TIME")
+
+    result = asyncio.run(_main(args))
+    for stage in result["stages"]:
+        latency = stage["response_time"]
+        print(f"offered={stage['offered_tps']:8.1f} tps  achieved={stage['achieved_tps']:8.1f} tps  "
+              f"errors={stage['errors']:5d}  p50={latency['p50'] * 1000:8.2f}ms  p99={latency['p99'] * 1000:8.2f}ms  "
+              f"p99.9={latency['p99.9'] * 1000:8.2f}ms")
+    print(f"service time p99={result['service_time']['p99'] * 1000:.2f}ms  "
+          f"response time p99={result['response_time']['p99'] * 1000:.2f}ms  "
+          f"(coordinated omission corrected: {result['coordinated_omission_corrected']})")
+    saturation = find_saturation(result, args.max_p99)
+    print("saturation point:", f"{saturation['offered_tps']:.1f} tps sustained" if saturation else "not reached within bounds")
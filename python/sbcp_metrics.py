@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Bounded Streaming Metrics for SBCP Validators
+Constant-size aggregates that replace per-transaction metric lists: a log-linear
+latency histogram with bounded relative error (HDR-style), Welford running
+statistics, per-second windowed throughput counters, and a validation metrics
+collector that keeps only a bounded ring of raw samples for paginated export
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from sbcp_history import RingHistorySink
+
+class LatencyHistogram:
+    """
+    Log-linear histogram over [lowest, highest] seconds (HDR-style)
+    Values are counted in integer units of `lowest`; each power-of-two range is split
+    into 2^sub_bucket_bits linear sub-buckets, which bounds the relative error of any
+    reported percentile by 10^-significant_figures at a fixed memory cost
+    """
+
+    def __init__(self, lowest: float = 1e-6, highest: float = 60.0, significant_figures: int = 2):
+        self.lowest = lowest
+        self.highest = highest
+        self.significant_figures = significant_figures
+
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count // 2
+        self.max_units = max(math.ceil(highest / lowest), self.sub_bucket_count)
+        max_shift = max(self.max_units.bit_length() - self.sub_bucket_bits, 0)
+        self.counts = np.zeros(self.sub_bucket_count + max_shift * self.sub_bucket_half, dtype=np.int64)
+
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, units: int) -> int:
+        if units < self.sub_bucket_count:
+            return units
+        shift = units.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.sub_bucket_half + (units >> shift) - self.sub_bucket_half
+
+    def _bucket_bounds(self, index: int):
+        """[low, high) range of a bucket, in units"""
+        if index < self.sub_bucket_count:
+            return index, index + 1
+        shift = (index - self.sub_bucket_count) // self.sub_bucket_half + 1
+        sub_bucket = (index - self.sub_bucket_count) % self.sub_bucket_half + self.sub_bucket_half
+        return sub_bucket << shift, (sub_bucket + 1) << shift
+
+    def record(self, value: float, count: int = 1):
+        """Count a value in seconds (clamped to [0, highest])"""
+        value = min(max(value, 0.0), self.highest)
+        units = min(int(value / self.lowest), self.max_units)
+        self.counts[self._index(units)] += count
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, p: float) -> float:
+        """Value at percentile p (0-100), reported as its bucket midpoint"""
+        if self.count == 0:
+            return 0.0
+        rank = max(math.ceil(p / 100.0 * self.count), 1)
+        index = int(np.searchsorted(np.cumsum(self.counts), rank, side="left"))
+        low, high = self._bucket_bounds(index)
+        value = (low + high - 1) / 2 * self.lowest
+        return min(max(value, self.min), self.max)
+
+    def percentiles(self, ps: Sequence[float] = (50, 90, 99, 99.9)) -> Dict[str, float]:
+        return {f"p{p:g}": self.percentile(p) for p in ps}
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            **self.percentiles(),
+            "relative_error": 10.0 ** -self.significant_figures
+        }
+
+    def memory_bytes(self) -> int:
+        return self.counts.nbytes
+
+class RunningStats:
+    """Count, mean and variance in O(1) memory (Welford's online algorithm)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 for fewer than two values)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "std": self.std,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0
+        }
+
+class WindowedThroughput:
+    """
+    Event counts in one-second buckets over a sliding window
+    Each slot remembers which second it holds, so stale slots are reset lazily on reuse
+    """
+
+    def __init__(self, window_seconds: int = 60):
+        self.window_seconds = window_seconds
+        self._counts = np.zeros(window_seconds, dtype=np.int64)
+        self._seconds = np.full(window_seconds, -1, dtype=np.int64)
+        self.total = 0
+
+    def add(self, now: Optional[float] = None, count: int = 1):
+        second = int(time.time() if now is None else now)
+        slot = second % self.window_seconds
+        if self._seconds[slot] != second:
+            self._seconds[slot] = second
+            self._counts[slot] = 0
+        self._counts[slot] += count
+        self.total += count
+
+    def rate(self, seconds: Optional[int] = None, now: Optional[float] = None) -> float:
+        """Mean events per second over the last `seconds` complete and current seconds"""
+        seconds = min(seconds or self.window_seconds, self.window_seconds)
+        current = int(time.time() if now is None else now)
+        in_window = (self._seconds > current - seconds) & (self._seconds <= current)
+        return float(self._counts[in_window].sum()) / seconds
+
+    def summary(self, now: Optional[float] = None) -> Dict:
+        return {
+            "total": self.total,
+            "rate_1s": self.rate(1, now),
+            "rate_10s": self.rate(10, now),
+            f"rate_{self.window_seconds}s": self.rate(self.window_seconds, now)
+        }
+
+class ValidationMetrics:
+    """
+    Streaming validation metrics for one validator process
+    Every summary is O(1) in size regardless of uptime; raw samples are kept only in
+    bounded rings and served page by page through samples()
+    """
+
+    SAMPLE_SERIES = ("processing", "finality")
+
+    def __init__(self, sample_capacity: int = 10000, window_seconds: int = 60,
+                 tiers: Sequence[str] = ('provisional', 'economic', 'absolute', 'none')):
+        self._lock = threading.Lock()
+        self.processing_latency = LatencyHistogram()
+        self.processing_stats = RunningStats()
+        self.throughput = WindowedThroughput(window_seconds)
+        self.finality_confidence = RunningStats()
+        self.finality_validator_count = RunningStats()
+        self.finality_tiers = {tier: 0 for tier in tiers}
+        self._samples = {
+            "processing": RingHistorySink((("timestamp", "f8"), ("processing_time", "f8")), sample_capacity),
+            "finality": RingHistorySink((("timestamp", "f8"), ("confidence", "f8"), ("tier", "U11"),
+                                         ("validator_count", "i4")), sample_capacity)
+        }
+
+    def record_processing(self, tx_id: str, processing_time: float, now: Optional[float] = None):
+        """One processed transaction and its validation latency"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.processing_latency.record(processing_time)
+            self.processing_stats.add(processing_time)
+            self.throughput.add(now)
+            self._samples["processing"].append(tx_id, now, processing_time)
+
+    def record_finality(self, tx_id: str, confidence: float, tier: str, validator_count: int,
+                        now: Optional[float] = None):
+        """One consensus recalculation outcome"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.finality_confidence.add(confidence)
+            self.finality_validator_count.add(validator_count)
+            self.finality_tiers[tier] = self.finality_tiers.get(tier, 0) + 1
+            self._samples["finality"].append(tx_id, now, confidence, tier, validator_count)
+
+    def summary(self, now: Optional[float] = None) -> Dict:
+        with self._lock:
+            return {
+                "processing_latency": self.processing_latency.summary(),
+                "processing_time": self.processing_stats.summary(),
+                "throughput": self.throughput.summary(now),
+                "finality": {
+                    "tiers": dict(self.finality_tiers),
+                    "confidence": self.finality_confidence.summary(),
+                    "validator_count": self.finality_validator_count.summary()
+                },
+                "samples_retained": {series: len(sink) for series, sink in self._samples.items()}
+            }
+
+    def samples(self, series: str, offset: int = 0, limit: int = 1000) -> Dict:
+        """One page of raw samples; pass next_offset back to continue"""
+        if series not in self._samples:
+            raise ValueError(f"Unknown sample series: {series} (expected one of {self.SAMPLE_SERIES})")
+        sink = self._samples[series]
+        with self._lock:
+            page = sink.page(offset, limit)
+            total = sink.total_appended
+            retained = len(sink)
+        rows = [
+            {"seq": int(record["seq"]), "tx_id": record["key"].decode("utf-8"),
+             **{name: record[name].item() for name in sink.field_names}}
+            for record in page
+        ]
+        return {
+            "series": series,
+            "offset": offset,
+            "limit": limit,
+            "samples": rows,
+            "next_offset": rows[-1]["seq"] + 1 if rows else max(offset, total),
+            "oldest_retained_offset": total - retained,
+            "total_recorded": total
+        }
+
+    def memory_bytes(self) -> int:
+        return self.processing_latency.memory_bytes() + sum(sink.memory_bytes() for sink in self._samples.values())
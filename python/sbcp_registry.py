@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Columnar Validator Registry for SBCP Simulations
+Stores validator attributes as NumPy columns with a fixed-size ring buffer for the
+recent-validation window, so reputation updates run as vector operations
+"""
+
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_COLUMNS = ("reputation", "stake_weight", "quorum_participation")
+
+class ValidatorView:
+    """
+    Lightweight row proxy over a ValidatorRegistry
+    Attribute reads and writes go straight to the registry columns, so views are cheap
+    to create and never hold their own copy of validator state
+    """
+
+    __slots__ = ("_registry", "_index")
+
+    def __init__(self, registry: "ValidatorRegistry", index: int):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_index", index)
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def node_id(self) -> str:
+        return self._registry.node_ids[self._index]
+
+    @property
+    def is_byzantine(self) -> bool:
+        return bool(self._registry.is_byzantine[self._index])
+
+    @property
+    def recent_validations(self) -> List[bool]:
+        """Recent validation outcomes, oldest first"""
+        return self._registry.recent_validations(self._index)
+
+    def __getattr__(self, name: str):
+        columns = self._registry._columns
+        if name in columns:
+            return columns[name][self._index].item()
+        raise AttributeError(f"Validator has no attribute '{name}'")
+
+    def __setattr__(self, name: str, value):
+        columns = self._registry._columns
+        if name not in columns:
+            raise AttributeError(f"Cannot set unknown validator column '{name}'")
+        columns[name][self._index] = value
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._registry.column_names)
+        return f"ValidatorView(node_id={self.node_id!r}, is_byzantine={self.is_byzantine}, {fields})"
+
+class ValidatorRegistry(Mapping):
+    """
+    Array-backed validator table shared by the SBCP engines
+    Behaves as a read-only mapping of node_id -> ValidatorView; numeric attributes live in
+    float64 columns and the recent-validation window is a (validators x window) ring buffer
+    """
+
+    def __init__(self, columns: Sequence[str] = DEFAULT_COLUMNS, window: int = 20, capacity: int = 16):
+        self.column_names = tuple(columns)
+        self.window = window
+        self.node_ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._capacity = max(capacity, 1)
+
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.zeros(self._capacity) for name in self.column_names
+        }
+        self._is_byzantine = np.zeros(self._capacity, dtype=bool)
+        self._recent = np.zeros((self._capacity, window), dtype=bool)
+        self._recent_count = np.zeros(self._capacity, dtype=np.int32)
+        self._recent_pos = np.zeros(self._capacity, dtype=np.int32)
+
+    @classmethod
+    def from_columns(cls, node_ids: Sequence[str], is_byzantine: Sequence[bool],
+                     window: int = 20, **columns: Sequence[float]) -> "ValidatorRegistry":
+        """Build a registry in one shot from per-column arrays (fast path for large networks)"""
+        registry = cls(columns=tuple(columns) or DEFAULT_COLUMNS, window=window, capacity=len(node_ids))
+        registry._grow(len(node_ids))
+        count = len(node_ids)
+
+        registry.node_ids = list(node_ids)
+        registry._index = {node_id: i for i, node_id in enumerate(registry.node_ids)}
+        registry._is_byzantine[:count] = np.asarray(is_byzantine, dtype=bool)
+        for name, values in columns.items():
+            registry._columns[name][:count] = np.asarray(values, dtype=float)
+        return registry
+
+    def _grow(self, required: int):
+        if required <= self._capacity:
+            return
+        new_capacity = max(required, self._capacity * 2)
+        extra = new_capacity - self._capacity
+
+        for name, column in self._columns.items():
+            self._columns[name] = np.concatenate([column, np.zeros(extra)])
+        self._is_byzantine = np.concatenate([self._is_byzantine, np.zeros(extra, dtype=bool)])
+        self._recent = np.concatenate([self._recent, np.zeros((extra, self.window), dtype=bool)])
+        self._recent_count = np.concatenate([self._recent_count, np.zeros(extra, dtype=np.int32)])
+        self._recent_pos = np.concatenate([self._recent_pos, np.zeros(extra, dtype=np.int32)])
+        self._capacity = new_capacity
+
+    def add(self, node_id: str, is_byzantine: bool = False, **values: float) -> ValidatorView:
+        """Append a validator; unspecified columns default to 0.0"""
+        if node_id in self._index:
+            raise ValueError(f"Validator {node_id} already registered")
+        unknown = set(values) - set(self.column_names)
+        if unknown:
+            raise ValueError(f"Unknown validator columns: {sorted(unknown)}")
+
+        index = len(self.node_ids)
+        self._grow(index + 1)
+        self.node_ids.append(node_id)
+        self._index[node_id] = index
+        self._is_byzantine[index] = is_byzantine
+        for name, value in values.items():
+            self._columns[name][index] = value
+        return ValidatorView(self, index)
+
+    # Mapping interface
+    def __getitem__(self, node_id: str) -> ValidatorView:
+        return ValidatorView(self, self._index[node_id])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.node_ids)
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._index
+
+    # Column access
+    @property
+    def is_byzantine(self) -> np.ndarray:
+        return self._is_byzantine[:len(self.node_ids)]
+
+    def column(self, name: str) -> np.ndarray:
+        """Live view of a column (writes go through to the registry)"""
+        return self._columns[name][:len(self.node_ids)]
+
+    def index_of(self, node_id: str) -> int:
+        return self._index[node_id]
+
+    def indices(self, node_ids: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self._index[node_id] for node_id in node_ids), dtype=np.int64)
+
+    # Recent-validation ring buffer
+    def recent_validations(self, index: int) -> List[bool]:
+        count = int(self._recent_count[index])
+        row = self._recent[index]
+        if count < self.window:
+            return row[:count].tolist()
+        return np.roll(row, -int(self._recent_pos[index])).tolist()
+
+    def record_validations(self, indices: np.ndarray, correct: np.ndarray):
+        """Push one outcome per validator into the window (indices must be unique)"""
+        indices = np.asarray(indices, dtype=np.int64)
+        positions = self._recent_pos[indices]
+        self._recent[indices, positions] = np.asarray(correct, dtype=bool)
+        self._recent_pos[indices] = (positions + 1) % self.window
+        self._recent_count[indices] = np.minimum(self._recent_count[indices] + 1, self.window)
+
+    def recent_accuracy(self, indices: np.ndarray) -> np.ndarray:
+        """Fraction of correct validations in each validator's window (0 when empty)"""
+        indices = np.asarray(indices, dtype=np.int64)
+        counts = self._recent_count[indices]
+        correct = self._recent[indices].sum(axis=1)
+        return np.divide(correct, counts, out=np.zeros(len(indices)), where=counts > 0)
+
+    def update_reputation(self, indices: np.ndarray, correct: np.ndarray, momentum: float = 0.8,
+                          step: float = 0.2, min_history: int = 5, floor: float = 0.1, ceiling: float = 0.99):
+        """
+        Record outcomes and move reputation towards windowed accuracy:
+        reputation = momentum * reputation + step * accuracy, clipped to [floor, ceiling]
+        Validators with fewer than min_history outcomes keep their current reputation
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        self.record_validations(indices, correct)
+
+        eligible = indices[self._recent_count[indices] >= min_history]
+        if len(eligible) == 0:
+            return
+        reputation = self._columns["reputation"]
+        updated = momentum * reputation[eligible] + step * self.recent_accuracy(eligible)
+        reputation[eligible] = np.clip(updated, floor, ceiling)
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the numeric columns and ring buffer"""
+        arrays = list(self._columns.values()) + [self._is_byzantine, self._recent,
+                                                 self._recent_count, self._recent_pos]
+        return sum(array.nbytes for array in arrays)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Local Peer Reputation for SBCP Validators
+Scores each peer by how often its votes agreed with the eventual finality outcome
+of the transactions it voted on, with exponentially decayed evidence so old
+behaviour fades; scores live in flat arrays indexed by peer, so recording a vote
+or reading a score is O(1) and never trusts what a peer says about itself
+"""
+
+import math
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+class PeerReputationTracker:
+    """
+    Beta-style reputation per peer: (aligned + prior_aligned) / (settled + prior_weight)
+    Both sums decay with the given half-life, applied lazily when a peer is touched,
+    so a peer that turns dishonest loses its standing within a few half-lives
+    """
+
+    def __init__(self, half_life_seconds: float = 600.0, prior_mean: float = 0.75, prior_weight: float = 4.0,
+                 initial_capacity: int = 64):
+        self.half_life_seconds = half_life_seconds
+        self.prior_mean = prior_mean
+        self.prior_weight = prior_weight
+        self._decay_rate = math.log(2) / half_life_seconds
+
+        self._index: Dict[str, int] = {}
+        self._aligned = np.zeros(initial_capacity, dtype=np.float64)
+        self._settled = np.zeros(initial_capacity, dtype=np.float64)
+        self._updated_at = np.zeros(initial_capacity, dtype=np.float64)
+        self._votes_seen = np.zeros(initial_capacity, dtype=np.int64)
+        self._outcomes = np.zeros(initial_capacity, dtype=np.int64)
+
+    def _slot(self, peer_id: str, now: float) -> int:
+        slot = self._index.get(peer_id)
+        if slot is None:
+            slot = len(self._index)
+            if slot == len(self._aligned):
+                self._grow()
+            self._index[peer_id] = slot
+            self._updated_at[slot] = now
+        return slot
+
+    def _grow(self):
+        capacity = 2 * len(self._aligned)
+        for name in ("_aligned", "_settled", "_updated_at", "_votes_seen", "_outcomes"):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def _decay(self, slot: int, now: float):
+        elapsed = now - self._updated_at[slot]
+        if elapsed > 0:
+            factor = math.exp(-self._decay_rate * elapsed)
+            self._aligned[slot] *= factor
+            self._settled[slot] *= factor
+            self._updated_at[slot] = now
+
+    def observe_vote(self, peer_id: str, now: Optional[float] = None):
+        """Note that a peer voted (the vote is scored later, when its transaction settles)"""
+        self._votes_seen[self._slot(peer_id, time.time() if now is None else now)] += 1
+
+    def record_outcome(self, peer_id: str, aligned: bool, weight: float = 1.0, now: Optional[float] = None):
+        """Score one vote against its transaction's final outcome"""
+        now = time.time() if now is None else now
+        slot = self._slot(peer_id, now)
+        self._decay(slot, now)
+        self._settled[slot] += weight
+        if aligned:
+            self._aligned[slot] += weight
+        self._outcomes[slot] += 1
+
+    def settle(self, votes: Iterable[Tuple[str, bool]], accepted: bool, now: Optional[float] = None):
+        """Score every (peer_id, vote) cast on a transaction that finalized as accepted or rejected"""
+        now = time.time() if now is None else now
+        for peer_id, vote in votes:
+            self.record_outcome(peer_id, vote == accepted, now=now)
+
+    def score(self, peer_id: str, now: Optional[float] = None) -> float:
+        """Decayed alignment rate in [0, 1]; unknown peers get the prior mean"""
+        slot = self._index.get(peer_id)
+        if slot is None:
+            return self.prior_mean
+        factor = math.exp(-self._decay_rate * max((time.time() if now is None else now) - self._updated_at[slot], 0.0))
+        aligned = self._aligned[slot] * factor
+        settled = self._settled[slot] * factor
+        return float((aligned + self.prior_mean * self.prior_weight) / (settled + self.prior_weight))
+
+    def __contains__(self, peer_id: str) -> bool:
+        return peer_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Dict]:
+        """Per-peer score and evidence for /metrics endpoints"""
+        now = time.time() if now is None else now
+        return {
+            peer_id: {
+                "score": self.score(peer_id, now),
+                "evidence": float(self._settled[slot] * math.exp(-self._decay_rate * max(now - self._updated_at[slot], 0.0))),
+                "votes_seen": int(self._votes_seen[slot]),
+                "votes_scored": int(self._outcomes[slot])
+            }
+            for peer_id, slot in self._index.items()
+        }
+
+    def memory_bytes(self) -> int:
+        return sum(array.nbytes for array in (self._aligned, self._settled, self._updated_at,
+                                              self._votes_seen, self._outcomes))
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Transaction Sync for SBCP Validators
+Votes that arrive before the transaction they vote on are parked in a bounded,
+TTL-limited buffer instead of being rejected, while the validator pulls the
+transaction from a peer that voted on it; once the transaction arrives the
+buffered votes are replayed in arrival order and confidence is recomputed once
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, List, Optional, Set, TypeVar
+
+VoteT = TypeVar("VoteT")
+
+class _PendingEntry:
+    __slots__ = ("first_seen", "votes", "sources")
+
+    def __init__(self, first_seen: float):
+        self.first_seen = first_seen
+        self.votes: List = []
+        self.sources: List[str] = []  # Peers known to hold the transaction, first voter first
+
+class PendingVoteBuffer(Generic[VoteT]):
+    """
+    Votes for unknown tx_ids, kept in first-seen order
+    At most max_transactions tx_ids (oldest evicted first) and max_votes_per_tx votes
+    each are held, and an entry is dropped ttl_seconds after its first vote, so memory
+    stays bounded whatever peers send; expiry only touches the oldest entries
+    """
+
+    def __init__(self, max_transactions: int = 2048, max_votes_per_tx: int = 64, ttl_seconds: float = 30.0):
+        self.max_transactions = max_transactions
+        self.max_votes_per_tx = max_votes_per_tx
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _PendingEntry]" = OrderedDict()
+
+        # Buffer counters
+        self.votes_buffered = 0
+        self.votes_replayed = 0
+        self.votes_expired = 0
+        self.votes_evicted = 0
+        self.votes_rejected = 0
+
+    def add(self, tx_id: str, vote: VoteT, source: str, now: Optional[float] = None) -> bool:
+        """Buffer a vote; returns False if the transaction's vote budget is already used up"""
+        entry = self._entries.get(tx_id)
+        if entry is None:
+            if len(self._entries) >= self.max_transactions:
+                _, evicted = self._entries.popitem(last=False)
+                self.votes_evicted += len(evicted.votes)
+            entry = self._entries[tx_id] = _PendingEntry(time.time() if now is None else now)
+        if len(entry.votes) >= self.max_votes_per_tx:
+            self.votes_rejected += 1
+            return False
+        entry.votes.append(vote)
+        if source not in entry.sources:
+            entry.sources.append(source)
+        self.votes_buffered += 1
+        return True
+
+    def pop(self, tx_id: str) -> List[VoteT]:
+        """Remove and return the buffered votes for a transaction that has arrived"""
+        entry = self._entries.pop(tx_id, None)
+        if entry is None:
+            return []
+        self.votes_replayed += len(entry.votes)
+        return entry.votes
+
+    def discard(self, tx_id: str):
+        """Drop buffered votes that can no longer be replayed (e.g. transaction archived)"""
+        entry = self._entries.pop(tx_id, None)
+        if entry is not None:
+            self.votes_expired += len(entry.votes)
+
+    def sources(self, tx_id: str) -> List[str]:
+        """Peers that voted on a buffered transaction, in the order their votes arrived"""
+        entry = self._entries.get(tx_id)
+        return list(entry.sources) if entry is not None else []
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop entries older than the TTL; returns the number of votes dropped"""
+        now = time.time() if now is None else now
+        dropped = 0
+        while self._entries:
+            tx_id, entry = next(iter(self._entries.items()))
+            if now - entry.first_seen < self.ttl_seconds:
+                break
+            del self._entries[tx_id]
+            dropped += len(entry.votes)
+        self.votes_expired += dropped
+        return dropped
+
+    def __contains__(self, tx_id: str) -> bool:
+        return tx_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def buffered_votes(self) -> int:
+        return sum(len(entry.votes) for entry in self._entries.values())
+
+    def metrics(self) -> Dict:
+        """Buffer occupancy and counters for /metrics endpoints"""
+        return {
+            "pending_transactions": len(self._entries),
+            "pending_votes": self.buffered_votes(),
+            "votes_buffered": self.votes_buffered,
+            "votes_replayed": self.votes_replayed,
+            "votes_expired": self.votes_expired,
+            "votes_evicted": self.votes_evicted,
+            "votes_rejected": self.votes_rejected,
+            "limits": {
+                "max_transactions": self.max_transactions,
+                "max_votes_per_tx": self.max_votes_per_tx,
+                "ttl_seconds": self.ttl_seconds
+            }
+        }
+
+class FetchTracker:
+    """
+    In-flight transaction pulls, so a burst of votes for one unknown tx_id triggers
+    a single fetch rather than one per vote
+    """
+
+    def __init__(self):
+        self._in_flight: Set[str] = set()
+        self.fetches_started = 0
+        self.fetches_succeeded = 0
+        self.fetches_failed = 0
+        self.fetches_deduplicated = 0
+        self.peer_attempts = 0
+
+    def start(self, tx_id: str) -> bool:
+        """Claim a fetch for tx_id; False if one is already running"""
+        if tx_id in self._in_flight:
+            self.fetches_deduplicated += 1
+            return False
+        self._in_flight.add(tx_id)
+        self.fetches_started += 1
+        return True
+
+    def finish(self, tx_id: str, ok: bool):
+        self._in_flight.discard(tx_id)
+        if ok:
+            self.fetches_succeeded += 1
+        else:
+            self.fetches_failed += 1
+
+    def __contains__(self, tx_id: str) -> bool:
+        return tx_id in self._in_flight
+
+    def metrics(self) -> Dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "fetches_started": self.fetches_started,
+            "fetches_succeeded": self.fetches_succeeded,
+            "fetches_failed": self.fetches_failed,
+            "fetches_deduplicated": self.fetches_deduplicated,
+            "peer_attempts": self.peer_attempts
+        }
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Opt-in Span Tracing for SBCP Validator Hot Paths
+Records named spans with monotonic nanosecond timestamps into a bounded ring,
+feeds per-stage latency histograms, propagates tx_ids to peers in a gossip header
+and dumps everything as Chrome trace JSON (chrome://tracing, Perfetto). When
+disabled, span() hands back one shared no-op context manager.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from sbcp_instrumentation import Histogram
+
+TRACE_HEADER = "X-SBCP-Trace"
+
+_NOOP_SPAN = nullcontext()
+
+class _Span:
+    """One in-flight span; a slotted class is cheaper to enter and exit than a generator context manager"""
+
+    __slots__ = ("tracer", "name", "tx_id", "args", "start_ns")
+
+    def __init__(self, tracer: "SpanTracer", name: str, tx_id: Optional[str], args: Optional[Dict]):
+        self.tracer = tracer
+        self.name = name
+        self.tx_id = tx_id
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.monotonic_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.name, self.start_ns, time.monotonic_ns() - self.start_ns, self.tx_id, self.args)
+        return False
+
+def tracing_enabled_from_env(default: bool = False) -> bool:
+    """SBCP_TRACE=1 turns tracing on"""
+    value = os.environ.get("SBCP_TRACE")
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+class SpanTracer:
+    """
+    Bounded span recorder for one validator process
+    Each span is (name, tx_id, start_ns, duration_ns, thread id, args); spans of the
+    same tx_id on different validators can be joined through the gossip header
+    """
+
+    def __init__(self, node_id: str, enabled: bool = False, capacity: int = 50_000,
+                 stage_histogram: Optional[Histogram] = None):
+        self.node_id = node_id
+        self.enabled = enabled
+        self.capacity = capacity
+        self.stage_histogram = stage_histogram
+        self._spans: deque = deque(maxlen=capacity)
+        self._stage_children: Dict[str, object] = {}
+        self._origin_ns = time.monotonic_ns()
+        self._origin_wall = time.time()
+        self.spans_recorded = 0
+
+    def span(self, name: str, tx_id: Optional[str] = None, **args):
+        """Context manager timing one stage (no-op when tracing is disabled)"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name, tx_id, args or None)
+
+    def record(self, name: str, start_ns: int, duration_ns: int, tx_id: Optional[str] = None,
+               args: Optional[Dict] = None):
+        """Store a finished span and count it in the per-stage histogram"""
+        self._spans.append((name, tx_id, start_ns, duration_ns, threading.get_ident(), args or None))
+        self.spans_recorded += 1
+        if self.stage_histogram is not None:
+            child = self._stage_children.get(name)
+            if child is None:
+                child = self._stage_children[name] = self.stage_histogram.labels(stage=name)
+            child.observe(duration_ns / 1e9)
+
+    def gossip_headers(self, batch: Mapping[str, List[Dict]]) -> Dict[str, str]:
+        """Header naming this node and the tx_ids in an outbound gossip batch"""
+        if not self.enabled:
+            return {}
+        tx_ids = sorted({item["tx_id"] for items in batch.values() for item in items if "tx_id" in item})
+        return {TRACE_HEADER: f"origin={self.node_id};sent_ns={time.time_ns()};tx={','.join(tx_ids)}"}
+
+    @staticmethod
+    def parse_header(value: Optional[str]) -> Dict[str, Union[str, List[str]]]:
+        """origin, sent_ns and tx_ids from an inbound trace header ({} if absent)"""
+        if not value:
+            return {}
+        fields = dict(part.split("=", 1) for part in value.split(";") if "=" in part)
+        return {
+            "origin": fields.get("origin", ""),
+            "sent_ns": fields.get("sent_ns", ""),
+            "tx_ids": [tx_id for tx_id in fields.get("tx", "").split(",") if tx_id]
+        }
+
+    def spans(self) -> List[Tuple]:
+        return list(self._spans)
+
+    def clear(self):
+        self._spans.clear()
+
+    def chrome_trace(self) -> Dict:
+        """Retained spans as Chrome trace events (complete "X" events, microseconds)"""
+        pid = os.getpid()
+        origin_us = self._origin_wall * 1e6
+        events = [{
+            "name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+            "args": {"name": f"validator {self.node_id}"}
+        }]
+        for name, tx_id, start_ns, duration_ns, thread_id, args in list(self._spans):
+            event_args = {"tx_id": tx_id} if tx_id is not None else {}
+            if args:
+                event_args.update(args)
+            events.append({
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": origin_us + (start_ns - self._origin_ns) / 1e3,
+                "dur": duration_ns / 1e3,
+                "pid": pid,
+                "tid": thread_id,
+                "args": event_args
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"node_id": self.node_id, "spans_recorded": self.spans_recorded,
+                              "spans_retained": len(self._spans)}}
+
+    def dump(self, path: Union[str, Path]) -> Path:
+        """Write chrome_trace() to a JSON file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()))
+        return path
+
+def merge_chrome_traces(traces: Iterable[Dict]) -> Dict:
+    """Combine traces from several validators into one timeline"""
+    return {"traceEvents": [event for trace in traces for event in trace.get("traceEvents", [])],
+            "displayTimeUnit": "ms"}
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Shared Confidence Kernel for SBCP and Strebacom Validators
+Every engine evaluates C(T,t) = 1 - e^(-λ(t)·V(T,t)·τ) through this module; the
+variants differ only in constants, collected as ConfidenceParams presets. Entry
+points: confidence_from_votes() for per-vote lists, confidence_from_sums() for engines that
+keep running sums (O(1) per refresh) and confidence_batch() for NumPy arrays of
+transactions. finality_time() inverts C for fixed sums, so callers can schedule the
+moment a tier is crossed instead of polling for it. GOLDEN_CASES pins each preset to values captured from the engines'
+original implementations (python sbcp_confidence.py checks them).
+"""
+
+import math
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+FINALITY_THRESHOLDS = {
+    'provisional': 0.80,
+    'economic': 0.95,
+    'absolute': 0.99
+}
+
+@dataclass(frozen=True)
+class ConfidenceParams:
+    """
+    Constants of one confidence variant
+    τ = max(elapsed, min_elapsed) · time_scale
+    V = Σ wi·vi·ri·qi·g(τ), with g(τ) = log(1 + τ) when time_weighted and 1 otherwise;
+        stake_normalized divides by Σ wi and multiplies by the vote count
+    λ = max(lambda_base · (1 + participation_gain·p) · (1 + quorum_gain·q) · lambda_scale, lambda_floor)
+    C = min(1 - e^(-λ·V·τ), cap)
+    """
+    lambda_base: float
+    time_scale: float = 1.0
+    min_elapsed: float = 0.001  # Floor on elapsed seconds, so a fresh transaction is not stuck at 0
+    participation_gain: float = 0.0
+    quorum_gain: float = 0.0
+    lambda_scale: float = 1.0
+    lambda_floor: float = 0.0
+    time_weighted: bool = False
+    stake_normalized: bool = False
+    min_weight: Optional[float] = None  # V used when votes were counted but none carried weight
+    cap: float = 1.0
+
+PRESETS: Dict[str, ConfidenceParams] = {
+    # SBCPCore.SBCPSimulator: p is network stability (1 - load / 2)
+    "core": ConfidenceParams(lambda_base=0.5, participation_gain=0.1, lambda_floor=1.0, min_weight=0.1),
+    # SBCPEvaluationEngine.SBCPValidationEngine: p is votes / validators
+    "basic": ConfidenceParams(lambda_base=1.5, participation_gain=0.2),
+    # SBCPEvaluationEngine2, SBCPDist and StrebaCOMDistributedValidator: q is mean quorum signal strength
+    "enhanced": ConfidenceParams(lambda_base=8.0, time_scale=10.0, participation_gain=0.3, quorum_gain=0.2,
+                                 time_weighted=True, stake_normalized=True, cap=0.999),
+    # StrebaCOMCloudValidator's single-vote estimate at proposal time (p = 1)
+    "cloud_initial": ConfidenceParams(lambda_base=8.0, time_scale=10.0, participation_gain=0.3, quorum_gain=0.2,
+                                      time_weighted=True, cap=0.999),
+    # StrebaCOMCloudValidator across peer votes: fixed quorum weight per vote, no quorum term in λ
+    "cloud_distributed": ConfidenceParams(lambda_base=8.0, time_scale=10.0, participation_gain=0.5, lambda_scale=1.3,
+                                          time_weighted=True, stake_normalized=True, cap=0.999),
+    # LocalStrebaCOMNetwork: q is the share of positive votes
+    "local": ConfidenceParams(lambda_base=8.0, time_scale=10.0, participation_gain=0.5, quorum_gain=0.3,
+                              time_weighted=True, stake_normalized=True, cap=0.999),
+}
+
+def preset(name: str, **overrides) -> ConfidenceParams:
+    """A named preset, optionally with some constants replaced (e.g. an engine's own lambda_base)"""
+    return replace(PRESETS[name], **overrides) if overrides else PRESETS[name]
+
+def scaled_elapsed(params: ConfidenceParams, elapsed: float) -> float:
+    """τ: elapsed seconds, floored and scaled"""
+    return max(elapsed, params.min_elapsed) * params.time_scale
+
+def time_weight(params: ConfidenceParams, tau: float) -> float:
+    return math.log(1 + tau) if params.time_weighted else 1.0
+
+def lambda_rate(params: ConfidenceParams, participation: float = 0.0, quorum_strength: float = 0.0) -> float:
+    """λ(t) from participation and quorum strength"""
+    lambda_t = (params.lambda_base * (1 + params.participation_gain * participation)
+                * (1 + params.quorum_gain * quorum_strength) * params.lambda_scale)
+    return max(lambda_t, params.lambda_floor)
+
+def _finish(params: ConfidenceParams, validation_weight: float, stake_sum: float, vote_count: int, tau: float,
+            participation: float, quorum_strength: float) -> float:
+    if params.stake_normalized and stake_sum > 0 and vote_count > 0:
+        validation_weight = validation_weight / stake_sum * vote_count
+    if params.min_weight is not None and validation_weight == 0 and vote_count > 0:
+        validation_weight = params.min_weight
+    confidence = 1.0 - math.exp(-lambda_rate(params, participation, quorum_strength) * validation_weight * tau)
+    return min(confidence, params.cap)
+
+def confidence_from_votes(params: ConfidenceParams, stakes: Sequence[float], votes: Sequence[bool], reputations: Sequence[float],
+               elapsed: float, quorum: Optional[Sequence[float]] = None, participation: float = 0.0,
+               quorum_strength: float = 0.0) -> float:
+    """C(T,t) from one entry per vote: stake wi, vote vi, reputation ri and quorum weight qi (1 if omitted)"""
+    tau = scaled_elapsed(params, elapsed)
+    weight = time_weight(params, tau)
+    validation_weight = 0.0
+    stake_sum = 0.0
+    for i, (wi, vote, ri) in enumerate(zip(stakes, votes, reputations)):
+        vi = 1.0 if vote else 0.0
+        validation_weight += wi * vi * ri * weight * (quorum[i] if quorum is not None else 1.0)
+        stake_sum += wi
+    return _finish(params, validation_weight, stake_sum, len(votes), tau, participation, quorum_strength)
+
+def confidence_from_sums(params: ConfidenceParams, weighted_sum: float, stake_sum: float, vote_count: int,
+                         elapsed: float, participation: float = 0.0, quorum_strength: float = 0.0) -> float:
+    """
+    C(T,t) from running sums kept as votes arrive: weighted_sum = Σ wi·vi·ri·qi (no time
+    weight, which depends on the evaluation time) and stake_sum = Σ wi
+    """
+    tau = scaled_elapsed(params, elapsed)
+    return _finish(params, weighted_sum * time_weight(params, tau), stake_sum, vote_count, tau,
+                   participation, quorum_strength)
+
+def _per_element(fn: Callable[[float], float], values: np.ndarray) -> np.ndarray:
+    """Apply a math-module function element by element; NumPy's vectorized exp/log can differ by an ULP"""
+    return np.fromiter(map(fn, values.ravel().tolist()), dtype=np.float64, count=values.size).reshape(values.shape)
+
+def confidence_batch(params: ConfidenceParams, weighted_sums: ArrayLike, stake_sums: ArrayLike, vote_counts: ArrayLike,
+                     elapsed: ArrayLike, participation: ArrayLike = 0.0, quorum_strength: ArrayLike = 0.0) -> np.ndarray:
+    """
+    confidence_from_sums over arrays of transactions (arguments broadcast together),
+    bit-identical to it: arithmetic is vectorized in the scalar path's order, while
+    log and exp go through the same math functions
+    """
+    weighted_sums, stake_sums, vote_counts, elapsed, participation, quorum_strength = (
+        np.asarray(value, dtype=np.float64)
+        for value in (weighted_sums, stake_sums, vote_counts, elapsed, participation, quorum_strength)
+    )
+    tau = np.maximum(elapsed, params.min_elapsed) * params.time_scale
+    validation_weight = weighted_sums * (_per_element(math.log, 1 + tau) if params.time_weighted else 1.0)
+    if params.stake_normalized:
+        normalizable = (stake_sums > 0) & (vote_counts > 0)
+        validation_weight = np.where(normalizable, validation_weight / np.where(normalizable, stake_sums, 1.0) * vote_counts,
+                                     validation_weight)
+    if params.min_weight is not None:
+        validation_weight = np.where((validation_weight == 0) & (vote_counts > 0), params.min_weight, validation_weight)
+    lambda_t = np.maximum(params.lambda_base * (1 + params.participation_gain * participation)
+                          * (1 + params.quorum_gain * quorum_strength) * params.lambda_scale, params.lambda_floor)
+    exponent = np.asarray(-lambda_t * validation_weight * tau, dtype=np.float64)
+    return np.minimum(1.0 - _per_element(math.exp, exponent), params.cap)
+
+def classify_finality(confidence: float, thresholds: Dict[str, float] = FINALITY_THRESHOLDS) -> str:
+    """Highest finality tier whose threshold the confidence reaches ('none' below provisional)"""
+    if confidence >= thresholds['absolute']:
+        return 'absolute'
+    elif confidence >= thresholds['economic']:
+        return 'economic'
+    elif confidence >= thresholds['provisional']:
+        return 'provisional'
+    return 'none'
+
+def vote_sums(stakes: Sequence[float], votes: Sequence[bool], reputations: Sequence[float],
+              quorum: Optional[Sequence[float]] = None):
+    """(Σ wi·vi·ri·qi, Σ wi) for engines that keep per-vote lists rather than running sums"""
+    weighted_sum = sum(wi * ri * (quorum[i] if quorum is not None else 1.0)
+                       for i, (wi, vote, ri) in enumerate(zip(stakes, votes, reputations)) if vote)
+    return weighted_sum, float(sum(stakes))
+
+def _solve_time_weighted(product: float) -> float:
+    """τ > 0 with τ·log(1 + τ) = product; Newton from above converges monotonically since the left side is convex"""
+    tau = math.sqrt(product)  # τ·log(1 + τ) <= τ², so this starts at or below the root
+    while tau * math.log1p(tau) < product:
+        tau *= 2.0
+    for _ in range(100):
+        log_term = math.log1p(tau)
+        step = (tau * log_term - product) / (log_term + tau / (1 + tau))
+        tau -= step
+        if step <= tau * 1e-15:
+            break
+    return tau
+
+def finality_time(params: ConfidenceParams, weighted_sum: float, stake_sum: float, vote_count: int, target: float,
+                  origin: float = 0.0, participation: float = 0.0, quorum_strength: float = 0.0) -> float:
+    """
+    Earliest time at which confidence_from_sums(..., time - origin, ...) reaches target if
+    no further vote arrives: origin if it already has at the elapsed floor, math.inf if it
+    never will (target above the cap, or no positive weight). For fixed sums C grows
+    monotonically with τ, so λ·V(τ)·τ = -ln(1 - target) is solved directly: in closed form
+    when V does not depend on τ, by Newton's method on τ·log(1 + τ) when it does
+    """
+    if target > params.cap or target >= 1.0:
+        return math.inf
+    if confidence_from_sums(params, weighted_sum, stake_sum, vote_count, 0.0, participation, quorum_strength) >= target:
+        return origin
+    
+    weight = weighted_sum
+    time_weighted = params.time_weighted
+    if params.stake_normalized and stake_sum > 0 and vote_count > 0:
+        weight = weight / stake_sum * vote_count
+    if params.min_weight is not None and weight == 0 and vote_count > 0:
+        weight, time_weighted = params.min_weight, False  # _finish substitutes min_weight after time weighting
+    rate = lambda_rate(params, participation, quorum_strength) * weight
+    if rate <= 0:
+        return math.inf
+    
+    product = -math.log1p(-target) / rate
+    tau = _solve_time_weighted(product) if time_weighted else product
+    when = origin + tau / params.time_scale
+    
+    # Rounding in the forward formula can leave C a hair under target at the root; step up to the first time that reads as reached
+    step = max(abs(when), 1.0) * 2.0 ** -52
+    for _ in range(64):
+        if confidence_from_sums(params, weighted_sum, stake_sum, vote_count, when - origin,
+                                participation, quorum_strength) >= target:
+            break
+        when += step
+        step *= 2.0
+    return when
+
+def finality_schedule(params: ConfidenceParams, weighted_sum: float, stake_sum: float, vote_count: int,
+                      origin: float = 0.0, participation: float = 0.0, quorum_strength: float = 0.0,
+                      thresholds: Dict[str, float] = FINALITY_THRESHOLDS) -> Dict[str, float]:
+    """finality_time() for every tier: {tier: time it is reached with the current sums}"""
+    return {tier: finality_time(params, weighted_sum, stake_sum, vote_count, target, origin,
+                                participation, quorum_strength)
+            for tier, target in thresholds.items()}
+
+# (preset, original implementation, stakes, votes, reputations, quorum weights, elapsed,
+#  participation, quorum strength, confidence that implementation returned)
+GOLDEN_CASES = (
+    ('core', 'SBCPCore', (1.6303876722122035, 1.3474897353633186, 0.6891473918198386, 0.6537604529515594, 1.2401055451449468), (1, 1, 1, 1, 1),
+     (0.8209355426873325, 0.7369865180414659, 0.8477790257947866, 0.7334166375356017, 0.7465847104200695), None,
+     0.04999999999999716, 1.0, 0.0, 0.19430870189959037),
+    ('core', 'SBCPCore', (1.6303876722122035, 1.3474897353633186, 0.6891473918198386), (1, 0, 1),
+     (0.8209355426873325, 0.7369865180414659, 0.8477790257947866), None,
+     0.001999999999995339, 0.95, 0.0, 0.003837991796182938),
+    ('core', 'SBCPCore', (1.6303876722122035, 1.3474897353633186, 0.6891473918198386, 0.6537604529515594, 1.2401055451449468, 1.2382066155253884, 1.7475252158521637, 0.8802854831067988), (1, 0, 1, 1, 0, 1, 0, 1),
+     (0.8209355426873325, 0.7369865180414659, 0.8477790257947866, 0.7334166375356017, 0.7465847104200695, 0.8309685881014232, 0.8926553533718228, 0.9345883996529123), None,
+     0.29999999999999716, 0.85, 0.0, 0.7208859019075441),
+    ('basic', 'SBCPEvaluationEngine', (0.856946940637837, 1.0549327498221188, 0.5982932888597197, 0.8890310214920114, 1.2053952612836718), (1, 1, 1, 1, 1),
+     (0.3, 0.3, 0.9251440608216108, 0.967493816419292, 0.9991289671020925), None,
+     0.04999999999999716, 0.4166666666666667, 0.0, 0.228418777596185),
+    ('basic', 'SBCPEvaluationEngine', (0.856946940637837, 1.0549327498221188, 0.5982932888597197), (1, 0, 1),
+     (0.3, 0.3, 0.9251440608216108), None,
+     0.0020000000000024443, 0.25, 0.0, 0.002550106370122429),
+    ('basic', 'SBCPEvaluationEngine', (0.856946940637837, 1.0549327498221188, 0.5982932888597197, 0.8890310214920114, 1.2053952612836718, 1.4586022108162429, 1.802067960714945, 1.5071172130543888), (1, 0, 1, 1, 0, 1, 0, 1),
+     (0.3, 0.3, 0.9251440608216108, 0.967493816419292, 0.9991289671020925, 0.895270641739867, 0.9269721316570377, 0.9482503712402981), None,
+     0.29999999999999716, 0.6666666666666666, 0.0, 0.894273827464283),
+    ('enhanced', 'SBCPEvaluationEngine2', (2.8861122111447353, 2.952487411415408, 1.7529731687545451, 2.0878828015269963, 2.577893435088659), (1, 1, 1, 1, 1),
+     (0.2, 0.2, 0.9289562581593538, 0.9633125856443954, 0.9059645161048236), (0.005618150599019093, 0.0037072981944627492, 0.7674843125819651, 0.8395972677353484, 0.7750153802086335),
+     0.05000000000000071, 0.4166666666666667, 0.4782844818638857, 0.9792818017060095),
+    ('enhanced', 'SBCPEvaluationEngine2', (2.8861122111447353, 2.952487411415408, 1.7529731687545451), (1, 0, 1),
+     (0.2, 0.2, 0.9289562581593538), (0.004213516598557873, 0.011625074113263786, 0.7674843125819651),
+     0.0019999999999988916, 0.25, 0.2611076344312623, 0.0017719328068386275),
+    ('enhanced', 'SBCPDist', (1.0, 1.0, 1.0, 1.0, 1.0), (1, 1, 1, 1, 1),
+     (0.8840095774524112, 0.75, 0.6000069313516925, 0.7999976895494357, 0.75), (0.5, 0.6920462975335151, 0.5, 0.5, 0.5),
+     0.05, 0.625, 0.6920462975335151, 0.9884847437187234),
+    ('enhanced', 'SBCPDist', (1.0, 1.0, 1.0), (1, 0, 1),
+     (0.8840095774524112, 0.75, 0.60000027725868), (0.5, 0.5, 0.5842112000841806),
+     0.002, 0.375, 0.5842112000841806, 0.0031151140763771012),
+    ('enhanced', 'SBCPValid', (1.0,), (1,),
+     (0.85,), (0.4,),
+     0.05000000000000071, 1.0, 0.4, 0.5389327167691731),
+    ('enhanced', 'SBCPValid', (1.3,), (1,),
+     (0.87,), (0.5,),
+     0.002000000000000668, 1.0, 0.5, 0.0019689749101921006),
+    ('enhanced', 'strebacom_cloud_validator', (1.0, 1.2, 1.4, 1.6, 1.8), (1, 1, 1, 1, 1),
+     (0.8, 0.8150000000000001, 0.8300000000000001, 0.8450000000000001, 0.8600000000000001), (0.5, 0.54, 0.58, 0.62, 0.66),
+     0.05000000000000071, 1.0, 0.5800000000000001, 0.997028299045522),
+    ('enhanced', 'strebacom_cloud_validator', (1.0, 1.2, 1.4), (1, 0, 1),
+     (0.8, 0.8150000000000001, 0.8300000000000001), (0.5, 0.54, 0.58),
+     0.002000000000000668, 1.0, 0.54, 0.004076112347937033),
+    ('cloud_initial', 'strebacom_cloud_config', (2.1,), (1,),
+     (0.93,), (0.7,),
+     0.05000000000000071, 1.0, 0.7, 0.9625952537906101),
+    ('cloud_initial', 'strebacom_cloud_config', (2.1,), (1,),
+     (0.93,), (0.6000000000000001,),
+     0.0019999999999988916, 1.0, 0.6000000000000001, 0.005391186371579648),
+    ('cloud_distributed', 'strebacom_cloud_config', (2.1, 1.2883192254392675, 2.8972988942744875), (1, 0, 1),
+     (0.5, 0.55, 0.6), (0.8, 0.8, 0.8),
+     0.0019999999999988916, 0.6, 0.0, 0.005684696149836244),
+    ('local', 'strebacom_local_validator', (2.0763287029438864, 1.6865417396266769, 1.7489935311757647, 2.265512545214292, 1.6599269107709167), (1, 1, 1, 1, 1),
+     (0.2, 0.2, 0.8979787411733992, 0.9783678487242407, 0.9376621109655842), (0.8, 0.8, 0.8, 0.8, 0.8),
+     0.04999999999999982, 0.5, 1.0, 0.9988970140547716),
+    ('local', 'strebacom_local_validator', (2.0763287029438864, 1.6865417396266769, 1.7489935311757647), (1, 0, 1),
+     (0.2, 0.2, 0.8979787411733992), (0.8, 0.8, 0.8),
+     0.0019999999999997797, 0.3, 0.6666666666666666, 0.003773591076641769),
+)
+
+def check_golden(tolerance: float = 1e-12) -> float:
+    """Largest relative error of the scalar and batched entry points over GOLDEN_CASES"""
+    worst = 0.0
+    for name, source, stakes, votes, reputations, quorum, elapsed, participation, quorum_strength, expected in GOLDEN_CASES:
+        params = PRESETS[name]
+        scalar = confidence_from_votes(params, stakes, votes, reputations, elapsed, quorum, participation, quorum_strength)
+        weighted_sum = sum(wi * vi * ri * (quorum[i] if quorum else 1.0)
+                           for i, (wi, vi, ri) in enumerate(zip(stakes, votes, reputations)))
+        batched = float(confidence_batch(params, [weighted_sum], [sum(stakes)], [len(votes)], [elapsed],
+                                         [participation], [quorum_strength])[0])
+        for value in (scalar, batched):
+            error = abs(value - expected) / max(abs(expected), 1e-300)
+            if error > tolerance:
+                raise AssertionError(f"{name} ({source}): {value!r} != {expected!r}")
+            worst = max(worst, error)
+    return worst
+
+def check_finality_solver(samples: int = 2000, seed: int = 0) -> float:
+    """
+    Largest relative gap between finality_time() and the true crossing over random sums:
+    C must read as reached at the solved time and as not reached a relative 1e-9 earlier
+    """
+    rng = np.random.default_rng(seed)
+    worst = 0.0
+    for _ in range(samples):
+        params = PRESETS[rng.choice(list(PRESETS))]
+        count = int(rng.integers(1, 20))
+        weighted_sum = float(rng.uniform(0.0, 1.0) ** 2 * count * 2)
+        stake_sum = float(count * rng.uniform(1.0, 3.0))
+        participation, quorum_strength = float(rng.uniform(0, 1)), float(rng.uniform(0, 1))
+        origin = float(rng.uniform(0, 1000))
+        for tier, target in FINALITY_THRESHOLDS.items():
+            when = finality_time(params, weighted_sum, stake_sum, count, target, origin, participation, quorum_strength)
+            if math.isinf(when) or when == origin:
+                continue
+            elapsed = when - origin
+            before = confidence_from_sums(params, weighted_sum, stake_sum, count, elapsed * (1 - 1e-9),
+                                          participation, quorum_strength)
+            after = confidence_from_sums(params, weighted_sum, stake_sum, count, elapsed, participation, quorum_strength)
+            if after < target or (before >= target and elapsed * (1 - 1e-9) > params.min_elapsed):
+                raise AssertionError(f"{tier}: crossing of {target} misplaced at elapsed {elapsed!r}")
+            tau = scaled_elapsed(params, elapsed)
+            weight = weighted_sum / stake_sum * count if params.stake_normalized else weighted_sum
+            exact = -math.log1p(-target) / (lambda_rate(params, participation, quorum_strength) * weight)
+            solved = tau * (math.log1p(tau) if params.time_weighted else 1.0)
+            if weight > 0:
+                worst = max(worst, abs(solved - exact) / exact)
+    return worst
+
+if __name__ == "__main__":
+    print(f"{len(GOLDEN_CASES)} golden cases across {len({case[1] for case in GOLDEN_CASES})} original implementations, "
+          f"max relative error {check_golden():.2e}")
+    print(f"finality_time: max relative error of λ·V·τ at the solved crossing {check_finality_solver():.2e}")
+
+    rng = np.random.default_rng(0)
+    params = PRESETS["enhanced"]
+    n = 100_000
+    counts = rng.integers(1, 20, n)
+    weighted_sums = rng.uniform(0.5, 20, n)
+    stake_sums = counts * rng.uniform(1.0, 3.0, n)
+    elapsed = rng.uniform(0, 0.5, n)
+    participation = counts / 20
+    quorum_strength = rng.uniform(0.3, 0.95, n)
+
+    start = time.perf_counter()
+    scalar = [confidence_from_sums(params, weighted_sums[i], stake_sums[i], int(counts[i]), elapsed[i],
+                                   participation[i], quorum_strength[i]) for i in range(n)]
+    scalar_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    batched = confidence_batch(params, weighted_sums, stake_sums, counts, elapsed, participation, quorum_strength)
+    batch_seconds = time.perf_counter() - start
+    assert np.array_equal(scalar, batched), "batched confidence is not bit-identical to the scalar path"
+    print(f"{n} transactions: scalar {scalar_seconds / n * 1e6:.2f} us each, batched {batch_seconds / n * 1e9:.1f} ns each")
+
+    start = time.perf_counter()
+    schedules = [finality_schedule(params, weighted_sums[i], stake_sums[i], int(counts[i]), 0.0,
+                                   participation[i], quorum_strength[i]) for i in range(n)]
+    solve_seconds = time.perf_counter() - start
+    polls = sum(math.ceil(schedule['absolute'] / 0.001) for schedule in schedules if math.isfinite(schedule['absolute']))
+    print(f"finality_schedule: {solve_seconds / n * 1e6:.2f} us per transaction for all tiers, "
+          f"vs {polls / n:.0f} confidence evaluations per transaction polling every 1 ms until absolute")
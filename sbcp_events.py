@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Finality Event Streams for SBCP Validators
+Each validator records one event per finality tier a transaction reaches
+(provisional, economic, absolute) in a bounded log with increasing offsets, and
+serves it as Server-Sent Events: a client subscribes for one tx_id or for every
+transaction and, after a disconnect, resumes from the last offset it saw
+(Last-Event-ID) instead of polling consensus status
+"""
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+import aiohttp
+
+FINALITY_TIERS = ('provisional', 'economic', 'absolute')
+SSE_CONTENT_TYPE = "text/event-stream"
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}  # Keep proxies from buffering the stream
+
+@dataclass
+class FinalityEvent:
+    offset: int
+    tx_id: str
+    tier: str
+    confidence: float
+    timestamp: float  # Wall-clock time the tier was reached
+    elapsed: float  # Seconds from the transaction's arrival to timestamp
+
+def tiers_reached(tier: str) -> Tuple[str, ...]:
+    """Tiers implied by reaching tier, lowest first ('none' reaches nothing)"""
+    return FINALITY_TIERS[:FINALITY_TIERS.index(tier) + 1] if tier in FINALITY_TIERS else ()
+
+class FinalityEventLog:
+    """
+    In-process ring of the last capacity finality events
+    Each (tx_id, tier) is published once, remembered for the last tracked_transactions
+    transactions, so recomputing a tier already reached publishes nothing and jumping
+    several tiers at once publishes each of them in order. Readers blocked in wait()
+    or wait_async() are woken by every publish.
+    """
+
+    def __init__(self, capacity: int = 100000, tracked_transactions: int = 100000):
+        self.capacity = capacity
+        self.tracked_transactions = tracked_transactions
+        self._events: deque = deque(maxlen=capacity)
+        self._reached: "OrderedDict[str, int]" = OrderedDict()  # tx_id -> number of tiers published
+        self._next_offset = 1
+        self._condition = threading.Condition()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def latest_offset(self) -> int:
+        """Offset of the newest event (0 before the first)"""
+        return self._next_offset - 1
+
+    def observe(self, tx_id: str, tier: str, confidence: float, timestamp: float,
+                arrival: float) -> List[FinalityEvent]:
+        """Publish an event for every tier up to tier that tx_id has not reached before"""
+        with self._condition:
+            published = self._reached.get(tx_id, 0)
+            reached = len(tiers_reached(tier))
+            if reached <= published:
+                return []
+
+            events = []
+            for name in FINALITY_TIERS[published:reached]:
+                event = FinalityEvent(self._next_offset, tx_id, name, confidence, timestamp, timestamp - arrival)
+                self._next_offset += 1
+                self._events.append(event)
+                events.append(event)
+            self._reached[tx_id] = reached
+            self._reached.move_to_end(tx_id)
+            if len(self._reached) > self.tracked_transactions:
+                self._reached.popitem(last=False)
+
+            self._condition.notify_all()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+        return events
+
+    def read(self, after: int, tx_id: Optional[str] = None, limit: int = 1000) -> Tuple[List[FinalityEvent], int]:
+        """
+        Up to limit events with offset > after (only tx_id's if given), oldest first, and
+        the offset to read after next time; events evicted from the ring are skipped
+        """
+        with self._condition:
+            # Walk back from the newest event, so a caught-up reader costs O(new events)
+            newer = []
+            for event in reversed(self._events):
+                if event.offset <= after:
+                    break
+                newer.append(event)
+            newer.reverse()
+
+        events = []
+        for event in newer:
+            if tx_id is None or event.tx_id == tx_id:
+                if len(events) == limit:
+                    return events, events[-1].offset
+                events.append(event)
+        return events, newer[-1].offset if newer else max(after, 0)
+
+    def wait(self, after: int, timeout: float) -> bool:
+        """Block the calling thread until an event past after exists; False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.latest_offset > after, timeout)
+
+    async def wait_async(self, after: int, timeout: float) -> bool:
+        """Coroutine form of wait() that does not block the event loop"""
+        loop = asyncio.get_running_loop()
+        with self._condition:
+            if self.latest_offset > after:
+                return True
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            with self._condition:
+                if (loop, future) in self._waiters:
+                    self._waiters.remove((loop, future))
+            return False
+
+    def metrics(self) -> Dict:
+        with self._condition:
+            return {
+                "events_published": self.latest_offset,
+                "events_retained": len(self._events),
+                "first_retained_offset": self._events[0].offset if self._events else self._next_offset,
+                "tracked_transactions": len(self._reached),
+                "async_waiters": len(self._waiters)
+            }
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+def format_sse(event: Dict) -> str:
+    """One SSE frame: the offset is the event id, the tier the event name"""
+    return f"id: {event['offset']}\nevent: {event['tier']}\ndata: {json.dumps(event)}\n\n"
+
+def resume_offset(after: Optional[str], last_event_id: Optional[str], latest: int, tx_id: Optional[str] = None) -> int:
+    """
+    Offset a new subscription reads after: Last-Event-ID when reconnecting, else the
+    ?after= parameter (0 replays everything retained), else 0 for one transaction's
+    stream and latest (live events only) for the all-transactions stream. Offsets past
+    latest (a validator restarted since) fall back to latest
+    """
+    for value in (last_event_id, after):
+        if value not in (None, ""):
+            return min(max(int(value), 0), latest)
+    return 0 if tx_id is not None else latest
+
+ReadFn = Callable[[int, Optional[str]], Tuple[List[Dict], int]]
+
+def _frames(read: ReadFn, cursor: int, tx_id: Optional[str]) -> Tuple[List[str], int, bool]:
+    events, cursor = read(cursor, tx_id)
+    done = tx_id is not None and any(event["tier"] == FINALITY_TIERS[-1] for event in events)
+    return [format_sse(event) for event in events], cursor, done
+
+def sse_stream(read: ReadFn, wait: Callable[[int, float], bool], after: int, tx_id: Optional[str] = None,
+               heartbeat: float = 15.0) -> Iterator[str]:
+    """
+    SSE frames for events past after, as they are published (for WSGI servers)
+    read(after, tx_id) returns (event dicts, next offset); wait(after, timeout) blocks
+    until newer events may exist. A per-transaction stream ends after its absolute
+    event; idle streams carry a comment every heartbeat seconds.
+    """
+    cursor = after
+    yield ": stream open\n\n"
+    while True:
+        frames, cursor, done = _frames(read, cursor, tx_id)
+        yield from frames
+        if done:
+            return
+        if not frames and not wait(cursor, heartbeat):
+            yield ": keepalive\n\n"
+
+async def sse_stream_async(log: FinalityEventLog, after: int, tx_id: Optional[str] = None,
+                           heartbeat: float = 15.0) -> AsyncIterator[str]:
+    """sse_stream() for ASGI servers, waiting on the log without blocking the event loop"""
+    read = lambda cursor, tx: _as_dicts(log.read(cursor, tx))
+    cursor = after
+    yield ": stream open\n\n"
+    while True:
+        frames, cursor, done = _frames(read, cursor, tx_id)
+        for frame in frames:
+            yield frame
+        if done:
+            return
+        if not frames and not await log.wait_async(cursor, heartbeat):
+            yield ": keepalive\n\n"
+
+def _as_dicts(result: Tuple[List[FinalityEvent], int]) -> Tuple[List[Dict], int]:
+    events, cursor = result
+    return [asdict(event) for event in events], cursor
+
+async def _parse_sse(content: aiohttp.StreamReader) -> AsyncIterator[Dict]:
+    data = []
+    async for raw in content:
+        line = raw.decode().rstrip("\r\n")
+        if not line:
+            if data:
+                yield json.loads("\n".join(data))
+            data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip())
+
+async def subscribe_finality(session: aiohttp.ClientSession, stream_url: str, tx_id: Optional[str] = None,
+                             after: Optional[int] = None, reconnect_delay: float = 0.5) -> AsyncIterator[Dict]:
+    """
+    Finality events from a validator stream, reconnecting from the last offset seen
+    A per-transaction subscription finishes after the absolute event; otherwise it runs
+    until the caller stops iterating (run the consuming coroutine under asyncio.wait_for for a deadline)
+    """
+    last = after
+    while True:
+        params = {"tx_id": tx_id} if tx_id is not None else {}
+        headers = {"Last-Event-ID": str(last)} if last is not None else {}
+        try:
+            async with session.get(stream_url, params=params, headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=None, sock_connect=5.0)) as resp:
+                resp.raise_for_status()
+                async for event in _parse_sse(resp.content):
+                    last = event["offset"]
+                    yield event
+                    if tx_id is not None and event["tier"] == FINALITY_TIERS[-1]:
+                        return
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        await asyncio.sleep(reconnect_delay)
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Kuramoto Phase Synchronization for SBCP Validators
+Coupled phase oscillators following dθi/dt = ωi + (K/N) Σj sin(θj - θi), reported
+through the order parameter r = |mean(exp(iθ))| (0 = incoherent, 1 = phase-locked).
+KuramotoNetwork integrates a whole in-process validator set with vectorized NumPy;
+PhaseOscillator is the per-validator form used by deployed validators, coupled to
+peer phases that arrive piggybacked on vote gossip. Synchronized validators can
+align their gossip flushes to shared phase slots (see PhaseOscillator.flush_delay).
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+TWO_PI = 2 * math.pi
+MAX_INTEGRATION_STEPS = 2000  # Per advance(); long idle gaps are integrated with coarser steps
+
+def order_parameter(phases: Union[Sequence[float], np.ndarray]) -> Tuple[float, float]:
+    """(r, ψ) with r·e^(iψ) = mean(e^(iθ)); r is 0 for no phases"""
+    phases = np.asarray(phases, dtype=np.float64)
+    if phases.size == 0:
+        return 0.0, 0.0
+    mean = np.exp(1j * phases).mean()
+    return float(abs(mean)), float(np.angle(mean) % TWO_PI)
+
+class KuramotoNetwork:
+    """
+    N coupled oscillators integrated together with fourth-order Runge-Kutta
+    All-to-all coupling uses the mean-field form ωi + K·r·sin(ψ - θi), which is O(N)
+    per step; an adjacency matrix switches to Σj Aij sin(θj - θi) / degree(i)
+    """
+
+    def __init__(self, natural_frequencies: Sequence[float], coupling_strength: float = 1.5,
+                 phases: Optional[Sequence[float]] = None, adjacency: Optional[np.ndarray] = None,
+                 seed: Union[int, np.random.Generator, None] = None):
+        rng = np.random.default_rng(seed)
+        self.natural_frequencies = np.asarray(natural_frequencies, dtype=np.float64)
+        self.coupling_strength = coupling_strength
+        self.phases = (np.asarray(phases, dtype=np.float64) % TWO_PI if phases is not None
+                       else rng.uniform(0, TWO_PI, len(self.natural_frequencies)))
+        self.adjacency = None
+        if adjacency is not None:
+            self.adjacency = np.asarray(adjacency, dtype=np.float64)
+            self._degree = np.maximum(self.adjacency.sum(axis=1), 1.0)
+        self.time = 0.0
+
+    def __len__(self) -> int:
+        return len(self.phases)
+
+    def derivative(self, phases: np.ndarray) -> np.ndarray:
+        if self.adjacency is None:
+            mean = np.exp(1j * phases).mean()
+            return self.natural_frequencies + self.coupling_strength * abs(mean) * np.sin(np.angle(mean) - phases)
+        coupling = (self.adjacency * np.sin(phases[None, :] - phases[:, None])).sum(axis=1) / self._degree
+        return self.natural_frequencies + self.coupling_strength * coupling
+
+    def step(self, dt: float = 0.01) -> float:
+        """Advance every oscillator by dt; returns the new order parameter r"""
+        k1 = self.derivative(self.phases)
+        k2 = self.derivative(self.phases + 0.5 * dt * k1)
+        k3 = self.derivative(self.phases + 0.5 * dt * k2)
+        k4 = self.derivative(self.phases + dt * k3)
+        self.phases = (self.phases + dt / 6.0 * (k1 + 2 * k2 + 2 * k3 + k4)) % TWO_PI
+        self.time += dt
+        return self.order_parameter()
+
+    def run(self, duration: float, dt: float = 0.01, record_every: int = 10) -> Dict[str, np.ndarray]:
+        """Integrate for duration; returns r(t) sampled every record_every steps"""
+        steps = max(int(round(duration / dt)), 1)
+        times, r_values = [self.time], [self.order_parameter()]
+        for i in range(1, steps + 1):
+            r = self.step(dt)
+            if i % record_every == 0 or i == steps:
+                times.append(self.time)
+                r_values.append(r)
+        return {"time": np.asarray(times), "order_parameter": np.asarray(r_values)}
+
+    def order_parameter(self) -> float:
+        return order_parameter(self.phases)[0]
+
+class PhaseOscillator:
+    """
+    One validator's oscillator, coupled to the last phase heard from each peer
+    Peer phases are extrapolated at their own natural frequency between messages and
+    dropped after stale_after seconds of silence. time_scale converts wall-clock
+    seconds into model time, so one cycle lasts 2π / (ω · time_scale) seconds.
+    Safe to share between request threads.
+    """
+
+    def __init__(self, natural_frequency: float, coupling_strength: float = 1.5, phase: float = 0.0,
+                 time_scale: float = 1.0, stale_after: float = 30.0, max_step: float = 0.05,
+                 now: Optional[float] = None):
+        self.natural_frequency = natural_frequency
+        self.coupling_strength = coupling_strength
+        self.time_scale = time_scale
+        self.stale_after = stale_after
+        self.max_step = max_step
+        self._phase = phase % TWO_PI
+        self._updated_at = time.time() if now is None else now
+        # peer_id -> (phase, natural frequency, heard at)
+        self._peers: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.RLock()
+        self.messages_observed = 0
+
+    def _peer_arrays(self, now: float):
+        fresh = [(phase, frequency, heard_at) for phase, frequency, heard_at in self._peers.values()
+                 if now - heard_at <= self.stale_after]
+        if not fresh:
+            return None
+        phases, frequencies, heard_at = (np.array(column, dtype=np.float64) for column in zip(*fresh))
+        return phases, frequencies, heard_at
+
+    def advance(self, now: Optional[float] = None) -> float:
+        """Integrate the phase up to now (Euler steps of about max_step model time); returns it"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._advance(now)
+
+    def _advance(self, now: float) -> float:
+        elapsed = (now - self._updated_at) * self.time_scale
+        if elapsed <= 0:
+            return self._phase
+        peers = self._peer_arrays(now)
+        if peers is None:
+            self._phase = (self._phase + self.natural_frequency * elapsed) % TWO_PI
+        else:
+            peer_phases, peer_frequencies, heard_at = peers
+            # Peer phases at the start of the interval, in model time
+            peer_phases = peer_phases + peer_frequencies * (self._updated_at - heard_at) * self.time_scale
+            count = len(peer_phases) + 1
+            steps = min(max(math.ceil(elapsed / self.max_step), 1), MAX_INTEGRATION_STEPS)
+            dt = elapsed / steps
+            phase = self._phase
+            for _ in range(steps):
+                coupling = np.sin(peer_phases - phase).sum() / count
+                phase += dt * (self.natural_frequency + self.coupling_strength * coupling)
+                peer_phases = peer_phases + dt * peer_frequencies
+            self._phase = phase % TWO_PI
+        self._updated_at = now
+        return self._phase
+
+    @property
+    def phase(self) -> float:
+        return self.advance()
+
+    def observe(self, peer_id: str, phase: float, frequency: float, sent_at: Optional[float] = None,
+                now: Optional[float] = None):
+        """
+        Couple to a phase a peer sent at wall-clock time sent_at; the time it spent in
+        gossip buffers and in transit is added back at the peer's natural frequency
+        (without sent_at, or with an implausible one, the phase is taken as current)
+        """
+        now = time.time() if now is None else now
+        heard_at = sent_at if sent_at is not None and 0 <= now - sent_at <= self.stale_after else now
+        with self._lock:
+            self._advance(now)
+            self._peers[peer_id] = (float(phase) % TWO_PI, float(frequency), heard_at)
+            self.messages_observed += 1
+
+    def message(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Fields piggybacked on outgoing vote gossip"""
+        return {"phase": self.advance(now), "frequency": self.natural_frequency}
+
+    def order_parameter(self, now: Optional[float] = None) -> float:
+        """r over this validator and every fresh peer, peer phases extrapolated to now"""
+        now = time.time() if now is None else now
+        with self._lock:
+            phase = self._advance(now)
+            peers = self._peer_arrays(now)
+        if peers is None:
+            return 1.0
+        peer_phases, peer_frequencies, heard_at = peers
+        peer_phases = peer_phases + peer_frequencies * (now - heard_at) * self.time_scale
+        return order_parameter(np.append(peer_phases, phase))[0]
+
+    def peer_count(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        return sum(1 for _, _, heard_at in list(self._peers.values()) if now - heard_at <= self.stale_after)
+
+    def flush_delay(self, slots_per_cycle: int, max_delay: float, now: Optional[float] = None) -> float:
+        """
+        Seconds until the phase reaches the next of slots_per_cycle equally spaced slot
+        boundaries (capped at max_delay); phase-locked validators all reach a boundary
+        at the same moment, so their gossip flushes line up
+        """
+        phase = self.advance(now)
+        slot_width = TWO_PI / slots_per_cycle
+        remaining = slot_width - phase % slot_width
+        rate = self.natural_frequency * self.time_scale
+        return min(remaining / rate, max_delay) if rate > 0 else max_delay
+
+    def summary(self, now: Optional[float] = None) -> Dict:
+        now = time.time() if now is None else now
+        return {
+            "phase": self.advance(now),
+            "natural_frequency": self.natural_frequency,
+            "coupling_strength": self.coupling_strength,
+            "order_parameter": self.order_parameter(now),
+            "coupled_peers": self.peer_count(now),
+            "phase_messages_observed": self.messages_observed
+        }
+
+def simulate_gossip_flushes(num_validators: int = 16, votes_per_second: float = 200.0, duration: float = 10.0,
+                            flush_interval: float = 0.005, aligned: bool = False, slots_per_cycle: int = 16,
+                            coupling_strength: float = 4.0, receive_window: float = 0.001, dt: float = 0.0005,
+                            seed: Optional[int] = 7) -> Dict:
+    """
+    Discrete-time model of gossip batching across a validator set
+    Every validator proposes Poisson votes that must reach all its peers. Unaligned
+    validators flush flush_interval after the first buffered vote (the GossipBatcher
+    timer); aligned validators flush whenever their Kuramoto phase crosses one of
+    slots_per_cycle slot boundaries, with the slot width set to flush_interval so both
+    modes batch over the same nominal period. Each receiver handles batches arriving
+    within receive_window of each other in one wake-up. Returns batch messages sent,
+    receiver wake-ups and vote delivery latency percentiles.
+    """
+    rng = np.random.default_rng(seed)
+    steps = int(duration / dt)
+    network = KuramotoNetwork(rng.normal(1.0, 0.02, num_validators), coupling_strength, seed=rng)
+    slot_width = TWO_PI / slots_per_cycle
+    # Model time per wall-clock second so that one slot lasts flush_interval
+    time_scale = slot_width / flush_interval
+    if aligned:
+        network.run(20.0, dt=0.05)  # Let the validators phase-lock before measuring
+
+    first_buffered = np.full(num_validators, np.inf)
+    buffered: Dict[int, list] = {validator: [] for validator in range(num_validators)}
+    flushes: list = []  # (time, validator)
+    latencies: list = []
+    slots = np.floor(network.phases / slot_width)
+
+    for step in range(1, steps + 1):
+        now = step * dt
+        arrivals = rng.poisson(votes_per_second * dt, num_validators)
+        for validator in np.nonzero(arrivals)[0]:
+            buffered[validator].extend([now] * int(arrivals[validator]))
+            first_buffered[validator] = min(first_buffered[validator], now)
+
+        if aligned:
+            network.step(dt * time_scale)
+            new_slots = np.floor(network.phases / slot_width)
+            due = np.nonzero(new_slots != slots)[0]
+            slots = new_slots
+        else:
+            due = np.nonzero(now - first_buffered >= flush_interval - 1e-12)[0]
+
+        for validator in due:
+            if buffered[validator]:
+                flushes.append((now, validator))
+                latencies.extend(now - enqueued for enqueued in buffered[validator])
+                buffered[validator] = []
+            first_buffered[validator] = np.inf
+
+    flush_times = np.array([flush_time for flush_time, _ in flushes])
+    flush_sources = np.array([validator for _, validator in flushes])
+    wakeups = 0
+    for receiver in range(num_validators):
+        arrivals = np.sort(flush_times[flush_sources != receiver])
+        wakeups += int(np.count_nonzero(np.diff(arrivals) > receive_window)) + 1 if len(arrivals) else 0
+    latencies = np.asarray(latencies)
+    return {
+        "aligned": aligned,
+        "batch_messages": len(flushes) * (num_validators - 1),
+        "receiver_wakeups": wakeups,
+        "latency_p50_ms": float(np.percentile(latencies, 50) * 1000) if len(latencies) else 0.0,
+        "latency_p99_ms": float(np.percentile(latencies, 99) * 1000) if len(latencies) else 0.0,
+        "order_parameter": network.order_parameter() if aligned else order_parameter(network.phases)[0]
+    }
+
+if __name__ == "__main__":
+    network = KuramotoNetwork(np.random.default_rng(1).uniform(0.95, 1.05, 100), coupling_strength=1.5, seed=1)
+    trajectory = network.run(20.0, dt=0.01, record_every=200)
+    print("r(t):", "  ".join(f"t={t:4.1f} r={r:.3f}" for t, r in zip(trajectory["time"], trajectory["order_parameter"])))
+    assert trajectory["order_parameter"][-1] > 0.95
+
+    for validators_per_run in (8, 32):
+        for aligned in (False, True):
+            result = simulate_gossip_flushes(num_validators=validators_per_run, aligned=aligned)
+            print(f"validators={validators_per_run:3d}  aligned={str(aligned):5s}  "
+                  f"batches={result['batch_messages']:7d}  wakeups={result['receiver_wakeups']:7d}  "
+                  f"p50={result['latency_p50_ms']:.2f}ms  p99={result['latency_p99_ms']:.2f}ms  "
+                  f"r={result['order_parameter']:.3f}")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Discrete-Event Scheduler for SBCP Simulations
+Shared simulated clock with a heap-ordered event queue, so validator latencies and
+confidence timestamps come from virtual time instead of wall-clock sleeps
+"""
+
+import asyncio
+import heapq
+import itertools
+import selectors
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Coroutine, List, Optional, Tuple
+
+@dataclass(order=True)
+class ScheduledEvent:
+    """Event in the scheduler queue, ordered by time then insertion sequence"""
+    time: float
+    sequence: int
+    callback: Callable = field(compare=False)
+    args: Tuple = field(default=(), compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+class EventScheduler:
+    """
+    Heap-ordered discrete-event scheduler with a simulated clock
+    In realtime mode the same interface is backed by the wall clock and time.sleep
+    """
+
+    def __init__(self, start_time: float = 0.0, realtime: bool = False):
+        self.realtime = realtime
+        self._now = start_time
+        self._queue: List[ScheduledEvent] = []
+        self._sequence = itertools.count()
+        self.processed_events = 0
+
+    @property
+    def now(self) -> float:
+        """Current simulation time in seconds"""
+        return time.time() if self.realtime else self._now
+
+    @property
+    def pending(self) -> int:
+        """Number of events still waiting to fire"""
+        return sum(1 for event in self._queue if not event.cancelled)
+
+    def schedule(self, delay: float, callback: Callable, *args: Any) -> ScheduledEvent:
+        """Schedule callback(*args) to fire after delay seconds"""
+        return self.schedule_at(self.now + max(delay, 0.0), callback, *args)
+
+    def schedule_at(self, when: float, callback: Callable, *args: Any) -> ScheduledEvent:
+        """Schedule callback(*args) to fire at an absolute simulation time"""
+        event = ScheduledEvent(when, next(self._sequence), callback, args)
+        heapq.heappush(self._queue, event)
+        return event
+
+    def cancel(self, event: ScheduledEvent):
+        """Cancel a scheduled event (removed lazily when it reaches the queue head)"""
+        event.cancelled = True
+
+    def _advance_to(self, when: float):
+        if self.realtime:
+            remaining = when - time.time()
+            if remaining > 0:
+                time.sleep(remaining)
+        elif when > self._now:
+            self._now = when
+
+    def step(self, until: Optional[float] = None) -> bool:
+        """Fire the next event due at or before until; returns False if none fired"""
+        while self._queue:
+            event = self._queue[0]
+            if event.cancelled:
+                heapq.heappop(self._queue)
+                continue
+            if until is not None and event.time > until:
+                return False
+
+            heapq.heappop(self._queue)
+            self._advance_to(event.time)
+            event.callback(*event.args)
+            self.processed_events += 1
+            return True
+        return False
+
+    def run(self, until: Optional[float] = None) -> int:
+        """Fire events in time order until the queue is empty or until is reached"""
+        processed = 0
+        while self.step(until):
+            processed += 1
+
+        if until is not None:
+            self._advance_to(until)
+        return processed
+
+    def sleep(self, delay: float):
+        """Advance the clock by delay, firing any events that fall due in between"""
+        self.run(until=self.now + delay)
+
+class _VirtualTimeSelector(selectors.DefaultSelector):
+    """Selector that advances the scheduler clock instead of blocking on timeouts"""
+
+    def __init__(self, scheduler: EventScheduler):
+        super().__init__()
+        self.scheduler = scheduler
+
+    def select(self, timeout=None):
+        if timeout is None:
+            # Nothing scheduled, so only real I/O can make progress
+            return super().select(None)
+        if timeout > 0:
+            self.scheduler.sleep(timeout)
+        return super().select(0)
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """
+    asyncio event loop whose time() is the scheduler clock
+    asyncio.sleep and timers complete instantly in wall time while keeping their
+    virtual ordering; concurrent sleeps overlap exactly as they would in real time.
+    Only suitable for pure simulations, since real network timeouts also run in virtual time.
+    """
+
+    def __init__(self, scheduler: Optional[EventScheduler] = None):
+        self.scheduler = scheduler or EventScheduler()
+        super().__init__(selector=_VirtualTimeSelector(self.scheduler))
+
+    def time(self) -> float:
+        return self.scheduler.now
+
+def run_in_virtual_time(coro: Coroutine, scheduler: Optional[EventScheduler] = None):
+    """Run a coroutine to completion on a VirtualTimeEventLoop (asyncio.run equivalent)"""
+    loop = VirtualTimeEventLoop(scheduler)
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(coro)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
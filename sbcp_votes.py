@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Sharded Concurrent Vote Store for SBCP Validators
+Votes are partitioned by hash(tx_id) into independently locked shards, so threads
+ingesting votes for different transactions rarely wait on each other; appending a
+vote and recomputing from the updated vote list happen under one shard lock
+"""
+
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+VoteT = TypeVar("VoteT")
+ResultT = TypeVar("ResultT")
+
+class _Shard:
+    __slots__ = ("lock", "votes", "acquisitions", "contended")
+
+    def __init__(self):
+        # Re-entrant so a recompute callback may read back through the store
+        self.lock = threading.RLock()
+        self.votes: Dict[str, List] = {}
+        self.acquisitions = 0
+        self.contended = 0
+
+class ShardedVoteStore(Generic[VoteT]):
+    """
+    Per-transaction vote lists spread over num_shards lock-protected dicts
+    Reads return copies, so callers never iterate a list another thread is appending to
+    """
+
+    def __init__(self, num_shards: int = 64):
+        if num_shards < 1 or num_shards & (num_shards - 1):
+            raise ValueError("num_shards must be a power of two")
+        self.num_shards = num_shards
+        self._mask = num_shards - 1
+        self._shards = [_Shard() for _ in range(num_shards)]
+
+    def _shard(self, tx_id: str) -> _Shard:
+        return self._shards[hash(tx_id) & self._mask]
+
+    def _acquire(self, shard: _Shard):
+        # Try without blocking first so contention can be counted cheaply
+        if not shard.lock.acquire(blocking=False):
+            shard.lock.acquire()
+            shard.contended += 1
+        shard.acquisitions += 1
+
+    def append(self, tx_id: str, vote: VoteT) -> int:
+        """Add a vote; returns the transaction's vote count including it"""
+        shard = self._shard(tx_id)
+        self._acquire(shard)
+        try:
+            votes = shard.votes.setdefault(tx_id, [])
+            votes.append(vote)
+            return len(votes)
+        finally:
+            shard.lock.release()
+
+    def append_and_apply(self, tx_id: str, vote: VoteT, fn: Callable[[List[VoteT]], ResultT]) -> ResultT:
+        """
+        Add a vote and call fn with the transaction's updated vote list while still
+        holding the shard lock, so no concurrent vote for the same tx_id is missed
+        or applied out of order; fn must not keep a reference to the list
+        """
+        shard = self._shard(tx_id)
+        self._acquire(shard)
+        try:
+            votes = shard.votes.setdefault(tx_id, [])
+            votes.append(vote)
+            return fn(votes)
+        finally:
+            shard.lock.release()
+
+    def get(self, tx_id: str) -> List[VoteT]:
+        """Copy of the votes for a transaction (empty if none)"""
+        shard = self._shard(tx_id)
+        self._acquire(shard)
+        try:
+            return list(shard.votes.get(tx_id, ()))
+        finally:
+            shard.lock.release()
+
+    __getitem__ = get
+
+    def count(self, tx_id: str) -> int:
+        votes = self._shard(tx_id).votes.get(tx_id)
+        return len(votes) if votes is not None else 0
+
+    def pop(self, tx_id: str, default: Optional[List[VoteT]] = None) -> Optional[List[VoteT]]:
+        """Remove and return the votes for a transaction"""
+        shard = self._shard(tx_id)
+        self._acquire(shard)
+        try:
+            return shard.votes.pop(tx_id, default)
+        finally:
+            shard.lock.release()
+
+    def __contains__(self, tx_id: str) -> bool:
+        return tx_id in self._shard(tx_id).votes
+
+    def __len__(self) -> int:
+        """Number of transactions with at least one vote"""
+        return sum(len(shard.votes) for shard in self._shards)
+
+    def total_votes(self) -> int:
+        return sum(len(votes) for shard in self._shards for votes in list(shard.votes.values()))
+
+    def metrics(self) -> Dict[str, Any]:
+        """Shard occupancy and lock contention for /metrics endpoints"""
+        acquisitions = sum(shard.acquisitions for shard in self._shards)
+        contended = sum(shard.contended for shard in self._shards)
+        occupancy = [len(shard.votes) for shard in self._shards]
+        return {
+            "shards": self.num_shards,
+            "transactions": sum(occupancy),
+            "max_shard_transactions": max(occupancy),
+            "lock_acquisitions": acquisitions,
+            "contended_acquisitions": contended,
+            "contention_rate": contended / acquisitions if acquisitions else 0.0
+        }
+
+def stress_test(num_threads: int = 16, votes_per_thread: int = 20000, num_transactions: int = 500,
+                num_shards: int = 64, switch_interval: float = 1e-5) -> Dict[str, Any]:
+    """
+    Hammer one store from many threads with append_and_apply and check that no vote
+    was lost: every transaction must hold exactly the votes sent for it, and the
+    counts observed inside the callback must be exactly 1..n for each transaction.
+    The interpreter switch interval is shortened while it runs to force interleaving.
+    """
+    store: ShardedVoteStore[tuple] = ShardedVoteStore(num_shards)
+    observed: Dict[str, List[int]] = {f"tx_{i}": [] for i in range(num_transactions)}
+    start_barrier = threading.Barrier(num_threads)
+
+    def worker(worker_id: int):
+        start_barrier.wait()
+        for i in range(votes_per_thread):
+            tx_id = f"tx_{(worker_id * 7919 + i) % num_transactions}"
+            store.append_and_apply(tx_id, (worker_id, i), lambda votes, tx_id=tx_id: observed[tx_id].append(len(votes)))
+
+    threads = [threading.Thread(target=worker, args=(worker_id,)) for worker_id in range(num_threads)]
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(switch_interval)
+    try:
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start_time
+    finally:
+        sys.setswitchinterval(previous_interval)
+
+    expected = num_threads * votes_per_thread
+    lost = expected - store.total_votes()
+    out_of_order = sum(counts != list(range(1, len(counts) + 1)) for counts in observed.values())
+    duplicates = expected - len({vote for tx_id in observed for vote in store.get(tx_id)})
+
+    return {
+        "threads": num_threads,
+        "votes_sent": expected,
+        "votes_stored": store.total_votes(),
+        "lost_votes": lost,
+        "duplicate_votes": duplicates,
+        "out_of_order_transactions": out_of_order,
+        "votes_per_second": expected / elapsed if elapsed > 0 else 0.0,
+        **store.metrics()
+    }
+
+if __name__ == "__main__":
+    for shards in (1, 64):
+        result = stress_test(num_shards=shards)
+        print(f"shards={shards:3d}  stored={result['votes_stored']}/{result['votes_sent']}  "
+              f"lost={result['lost_votes']}  duplicates={result['duplicate_votes']}  "
+              f"out_of_order={result['out_of_order_transactions']}  "
+              f"contention={result['contention_rate']:.4f}  rate={result['votes_per_second']:,.0f} votes/s")
+        assert result["lost_votes"] == 0 and result["duplicate_votes"] == 0
+        assert result["out_of_order_transactions"] == 0
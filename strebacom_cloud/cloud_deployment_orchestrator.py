@@ -24,6 +24,8 @@ import shutil
 import platform
 from pathlib import Path
 
+from sbcp_events import FINALITY_TIERS, subscribe_finality
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -714,34 +716,43 @@ CMD ["python", "strebacom_cloud_config.py"]
         
         return None
     
-    async def verify_consensus_status(self, session: aiohttp.ClientSession, results: Dict):
-        """Verify consensus status for sample transactions"""
+    async def verify_consensus_status(self, session: aiohttp.ClientSession, results: Dict, deadline: float = 5.0):
+        """Verify consensus for sample transactions from their entry validators' finality streams"""
         if not results["transactions"]:
             return
         
         # Check consensus for multiple recent transactions
         sample_count = min(5, len(results["transactions"]))
         sample_txs = results["transactions"][-sample_count:]
+        validator_by_host = {url.split("/")[-1]: url for url in self.validator_urls.values()}
         
-        consensus_checks = []
-        for tx in sample_txs:
-            validator_url = random.choice(list(self.validator_urls.values()))
+        async def tier_events(tx: Dict) -> List[Dict]:
+            # Replays the tiers already reached, then waits for the rest until absolute or the deadline
+            validator_url = validator_by_host.get(tx["entry_validator"]) or random.choice(list(self.validator_urls.values()))
+            events = []
+            
+            async def collect():
+                async for event in subscribe_finality(session, f"{validator_url}/strebacom/finality/stream",
+                                                      tx_id=tx["tx_id"]):
+                    events.append(event)
+            
             try:
-                async with session.get(
-                    f"{validator_url}/strebacom/consensus/status/{tx['tx_id']}"
-                ) as resp:
-                    if resp.status == 200:
-                        consensus_status = await resp.json()
-                        consensus_checks.append(consensus_status)
-            except:
+                await asyncio.wait_for(collect(), deadline)
+            except asyncio.TimeoutError:
                 pass
-        
-        if consensus_checks:
-            results["network_analysis"]["consensus_verification"] = {
-                "checks_performed": len(consensus_checks),
-                "average_confidence": np.mean([c.get("confidence", 0) for c in consensus_checks]),
-                "consensus_achieved": sum(1 for c in consensus_checks if c.get("consensus_achieved", False)) / len(consensus_checks)
+            return events
+        
+        consensus_checks = await asyncio.gather(*(tier_events(tx) for tx in sample_txs))
+        finalized = [events for events in consensus_checks if events]
+        results["network_analysis"]["consensus_verification"] = {
+            "checks_performed": len(consensus_checks),
+            "average_confidence": np.mean([events[-1]["confidence"] for events in finalized]) if finalized else 0.0,
+            "consensus_achieved": len(finalized) / len(consensus_checks),
+            "time_to_finality": {
+                tier: [event["elapsed"] for events in consensus_checks for event in events if event["tier"] == tier]
+                for tier in FINALITY_TIERS
             }
+        }
     
     async def test_linear_scalability_enhanced(self, session: aiohttp.ClientSession) -> Dict:
         """Enhanced linear scalability test with better methodology"""
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Bounded History Sinks for SBCP Confidence Tracking
+Fixed-schema record stores that replace unbounded confidence_history lists: a ring
+buffer of the newest records, a uniform reservoir sample of everything seen, or an
+append-only record file on disk read back through np.memmap
+"""
+
+import os
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+HISTORY_MODES = ("ring", "reservoir", "memmap")
+
+FieldSpec = Sequence[Tuple[str, str]]
+
+# (elapsed time, confidence) points keyed by tx_id
+CONFIDENCE_FIELDS: FieldSpec = (("time", "f8"), ("confidence", "f8"))
+
+# (elapsed time, confidence, finality tier) points keyed by tx_id
+TIERED_CONFIDENCE_FIELDS: FieldSpec = (("time", "f8"), ("confidence", "f8"), ("finality_tier", "U11"))
+
+class HistorySink:
+    """
+    Base class for history sinks
+    Every record carries an arrival sequence number and a series key (usually a tx_id)
+    followed by the sink's own fields; reads always return records in arrival order
+    """
+
+    def __init__(self, fields: FieldSpec = CONFIDENCE_FIELDS, key_width: int = 48):
+        self.field_names = tuple(name for name, _ in fields)
+        self.key_width = key_width
+        self.dtype = np.dtype([("seq", "<u8"), ("key", f"S{key_width}")] +
+                              [(name, dtype) for name, dtype in fields])
+        self.total_appended = 0
+
+    def _encode_key(self, key: str) -> bytes:
+        return str(key).encode("utf-8")[:self.key_width]
+
+    def _make_records(self, keys: Sequence[str], columns: Sequence[Sequence]) -> np.ndarray:
+        records = np.zeros(len(keys), dtype=self.dtype)
+        records["seq"] = np.arange(self.total_appended, self.total_appended + len(keys), dtype=np.uint64)
+        records["key"] = [self._encode_key(key) for key in keys]
+        for name, values in zip(self.field_names, columns):
+            records[name] = values
+        return records
+
+    def append(self, key: str, *values):
+        """Append one record; values follow the field order given at construction"""
+        self.extend([key], *([value] for value in values))
+
+    def extend(self, keys: Sequence[str], *columns: Sequence):
+        """Append many records at once, one column per field"""
+        if len(keys) == 0:
+            return
+        self._store(self._make_records(keys, columns))
+        self.total_appended += len(keys)
+
+    def _store(self, records: np.ndarray):
+        raise NotImplementedError
+
+    def records(self) -> np.ndarray:
+        """Retained records in arrival order"""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def column(self, name: str) -> np.ndarray:
+        """One field across all retained records"""
+        return self.records()[name]
+
+    def series(self, key: str) -> np.ndarray:
+        """Retained records for one key, restricted to the sink's own fields"""
+        records = self.records()
+        selected = records[records["key"] == self._encode_key(key)]
+        return np.array(selected[list(self.field_names)])
+
+    def page(self, offset: int = 0, limit: int = 1000) -> np.ndarray:
+        """
+        Up to limit retained records with seq >= offset, in arrival order
+        Offsets are sequence numbers, so pages stay stable while old records are evicted;
+        pass the last returned seq + 1 to fetch the next page
+        """
+        records = self.records()
+        start = int(np.searchsorted(records["seq"], offset, side="left"))
+        return np.array(records[start:start + limit])
+
+    def keys(self, limit: Optional[int] = None) -> List[str]:
+        """Distinct retained keys in order of first appearance"""
+        keys = self.records()["key"]
+        if len(keys) == 0:
+            return []
+        unique, first_index = np.unique(keys, return_index=True)
+        ordered = unique[np.argsort(first_index)][:limit]
+        return [key.decode("utf-8") for key in ordered]
+
+    def __contains__(self, key) -> bool:
+        return bool(np.any(self.records()["key"] == self._encode_key(key)))
+
+    def memory_bytes(self) -> int:
+        """Bytes held in memory by the sink"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class RingHistorySink(HistorySink):
+    """Keeps the newest capacity records in a preallocated circular buffer"""
+
+    def __init__(self, fields: FieldSpec = CONFIDENCE_FIELDS, capacity: int = 100_000, key_width: int = 48):
+        super().__init__(fields, key_width)
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=self.dtype)
+
+    def _store(self, records: np.ndarray):
+        # Record with sequence number s always lives in slot s % capacity
+        start = (self.total_appended + max(len(records) - self.capacity, 0)) % self.capacity
+        records = records[-self.capacity:]
+
+        # At most two contiguous writes around the wrap point
+        head = min(len(records), self.capacity - start)
+        self._buffer[start:start + head] = records[:head]
+        self._buffer[:len(records) - head] = records[head:]
+
+    def records(self) -> np.ndarray:
+        if self.total_appended <= self.capacity:
+            return self._buffer[:self.total_appended]
+        position = self.total_appended % self.capacity
+        return np.concatenate([self._buffer[position:], self._buffer[:position]])
+
+    def __len__(self) -> int:
+        return min(self.total_appended, self.capacity)
+
+    def memory_bytes(self) -> int:
+        return self._buffer.nbytes
+
+class ReservoirHistorySink(HistorySink):
+    """
+    Uniform sample of capacity records over the whole stream (Algorithm R)
+    Long runs are downsampled evenly instead of losing everything but the tail
+    """
+
+    def __init__(self, fields: FieldSpec = CONFIDENCE_FIELDS, capacity: int = 100_000, key_width: int = 48,
+                 seed: Union[int, np.random.Generator, None] = None):
+        super().__init__(fields, key_width)
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self._buffer = np.zeros(capacity, dtype=self.dtype)
+
+    def _store(self, records: np.ndarray):
+        seen = self.total_appended
+        for record in records:
+            if seen < self.capacity:
+                self._buffer[seen] = record
+            else:
+                slot = self.rng.integers(0, seen + 1)
+                if slot < self.capacity:
+                    self._buffer[slot] = record
+            seen += 1
+
+    def records(self) -> np.ndarray:
+        retained = self._buffer[:len(self)]
+        return retained[np.argsort(retained["seq"], kind="stable")]
+
+    def __len__(self) -> int:
+        return min(self.total_appended, self.capacity)
+
+    def memory_bytes(self) -> int:
+        return self._buffer.nbytes
+
+class MemmapHistorySink(HistorySink):
+    """
+    Spills every record to an append-only fixed-width record file
+    Appends are staged in a small buffer; reads map the file with np.memmap, so the
+    history is paged in from disk on demand instead of living on the heap
+    """
+
+    def __init__(self, path: Union[str, Path], fields: FieldSpec = CONFIDENCE_FIELDS,
+                 key_width: int = 48, flush_every: int = 4096):
+        super().__init__(fields, key_width)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self._pending = np.zeros(flush_every, dtype=self.dtype)
+        self._pending_count = 0
+
+        # Resume an existing file, ignoring a partially written trailing record
+        if self.path.exists():
+            persisted = self.path.stat().st_size // self.dtype.itemsize
+            os.truncate(self.path, persisted * self.dtype.itemsize)
+            self.total_appended = persisted
+        self._file = open(self.path, "ab")
+
+    def _store(self, records: np.ndarray):
+        if self._pending_count + len(records) > self.flush_every:
+            self.flush()
+        if len(records) >= self.flush_every:
+            self._file.write(records.tobytes())
+            return
+        self._pending[self._pending_count:self._pending_count + len(records)] = records
+        self._pending_count += len(records)
+
+    def flush(self):
+        """Write staged records to disk"""
+        if self._pending_count:
+            self._file.write(self._pending[:self._pending_count].tobytes())
+            self._pending_count = 0
+        self._file.flush()
+
+    def records(self) -> np.ndarray:
+        self.flush()
+        if self.total_appended == 0:
+            return np.zeros(0, dtype=self.dtype)
+        return np.memmap(self.path, dtype=self.dtype, mode="r", shape=(self.total_appended,))
+
+    def __len__(self) -> int:
+        return self.total_appended
+
+    def memory_bytes(self) -> int:
+        return self._pending.nbytes
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+def create_history_sink(mode: str = "ring", fields: FieldSpec = CONFIDENCE_FIELDS, capacity: int = 100_000,
+                        path: Optional[Union[str, Path]] = None, key_width: int = 48,
+                        seed: Union[int, np.random.Generator, None] = None) -> HistorySink:
+    """Build a sink by mode name ("ring", "reservoir" or "memmap")"""
+    if mode == "ring":
+        return RingHistorySink(fields, capacity, key_width)
+    if mode == "reservoir":
+        return ReservoirHistorySink(fields, capacity, key_width, seed=seed)
+    if mode == "memmap":
+        if path is None:
+            raise ValueError("memmap history sink requires a path")
+        return MemmapHistorySink(path, fields, key_width)
+    raise ValueError(f"Unknown history mode: {mode} (expected one of {HISTORY_MODES})")
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+"""
+Validator State Stores for Strebacom Cloud Validators
+Per-validator mutable state (transactions, votes, quorum signals, counters, peers,
+finality events and the rolling hash) behind one interface: an in-process store for single-process
+serving, and a SQLite (WAL) store that several worker processes on the same
+container can share consistently
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from sbcp_events import FinalityEventLog, tiers_reached
+from sbcp_votes import ShardedVoteStore
+
+ResultT = TypeVar("ResultT")
+
+STATE_BACKENDS = ("memory", "sqlite")
+
+class ValidatorStateStore:
+    """Interface shared by the state backends"""
+
+    # Transactions
+    def put_transaction(self, tx_id: str, record: Dict):
+        raise NotImplementedError
+
+    def get_transaction(self, tx_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def has_transaction(self, tx_id: str) -> bool:
+        return self.get_transaction(tx_id) is not None
+
+    def transaction_count(self) -> int:
+        raise NotImplementedError
+
+    def set_confidence(self, tx_id: str, confidence: float):
+        raise NotImplementedError
+
+    def get_confidence(self, tx_id: str, default: float = 0.0) -> float:
+        raise NotImplementedError
+
+    # Votes and quorum signals
+    def append_vote(self, tx_id: str, vote: Dict) -> int:
+        """Store a vote and return the transaction's vote count"""
+        raise NotImplementedError
+
+    def append_vote_and_apply(self, tx_id: str, vote: Dict, fn: Callable[[List[Dict]], ResultT]) -> ResultT:
+        """
+        Store a vote and call fn with the transaction's updated votes atomically, so
+        concurrent votes for the same transaction are each applied exactly once, in order
+        """
+        raise NotImplementedError
+
+    def get_votes(self, tx_id: str) -> List[Dict]:
+        raise NotImplementedError
+
+    def set_quorum_signal(self, tx_id: str, validator_id: str, strength: float):
+        raise NotImplementedError
+
+    def get_quorum_signals(self, tx_id: str) -> Dict[str, float]:
+        raise NotImplementedError
+
+    def quorum_transaction_count(self) -> int:
+        raise NotImplementedError
+
+    def vote_store_metrics(self) -> Dict:
+        """Vote storage health for /metrics endpoints (empty when the backend has none)"""
+        return {}
+
+    # Counters
+    def increment(self, name: str, amount: int = 1):
+        raise NotImplementedError
+
+    def counters(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def counter(self, name: str) -> int:
+        return self.counters().get(name, 0)
+
+    # Peers
+    def register_peer(self, node_id: str, url: str):
+        raise NotImplementedError
+
+    def peers(self) -> Dict[str, str]:
+        raise NotImplementedError
+
+    def get_peer_stake(self, node_id: str) -> Optional[float]:
+        raise NotImplementedError
+
+    def set_peer_stake(self, node_id: str, stake_weight: float):
+        raise NotImplementedError
+
+    def setdefault_peer_stake(self, node_id: str, stake_weight: float) -> float:
+        """Stake already recorded for the peer, or store and return stake_weight"""
+        raise NotImplementedError
+
+    # Finality events (see sbcp_events)
+    def observe_finality(self, tx_id: str, tier: str, confidence: float, timestamp: float,
+                         arrival: float) -> List[Dict]:
+        """Record an event for every tier up to tier that tx_id has not reached before; returns them"""
+        raise NotImplementedError
+
+    def finality_events(self, after: int, tx_id: Optional[str] = None, limit: int = 1000) -> Tuple[List[Dict], int]:
+        """Events with offset > after (only tx_id's if given), oldest first, and the offset to read after next"""
+        raise NotImplementedError
+
+    def latest_finality_offset(self) -> int:
+        raise NotImplementedError
+
+    def wait_finality_events(self, after: int, timeout: float) -> bool:
+        """Block until an event past after may exist; False on timeout"""
+        raise NotImplementedError
+
+    # Rolling hash and metadata
+    def setdefault_meta(self, key: str, value: str) -> str:
+        """Value already stored under key, or store and return value"""
+        raise NotImplementedError
+
+    def claim_worker_index(self) -> int:
+        """Next unused worker index (0, 1, ...) for a process opening this store"""
+        raise NotImplementedError
+
+    def rolling_hash(self) -> str:
+        """Current rolling hash (seed it first with setdefault_meta("rolling_hash", ...))"""
+        raise NotImplementedError
+
+    def advance_rolling_hash(self, suffix: str) -> str:
+        """Atomically replace the rolling hash with sha256(rolling_hash + suffix)"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class InMemoryValidatorState(ValidatorStateStore):
+    """
+    Plain dictionaries private to the process; votes live in a sharded store with
+    per-shard locks and the remaining mutations share one lock
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._transactions: Dict[str, Dict] = {}
+        self._confidence: Dict[str, float] = {}
+        self._votes: ShardedVoteStore[Dict] = ShardedVoteStore()
+        self._quorum_signals: Dict[str, Dict[str, float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._peers: Dict[str, str] = {}
+        self._peer_stakes: Dict[str, float] = {}
+        self._meta: Dict[str, str] = {}
+        self._finality_events = FinalityEventLog()
+
+    def put_transaction(self, tx_id: str, record: Dict):
+        self._transactions[tx_id] = record
+
+    def get_transaction(self, tx_id: str) -> Optional[Dict]:
+        return self._transactions.get(tx_id)
+
+    def transaction_count(self) -> int:
+        return len(self._transactions)
+
+    def set_confidence(self, tx_id: str, confidence: float):
+        self._confidence[tx_id] = confidence
+
+    def get_confidence(self, tx_id: str, default: float = 0.0) -> float:
+        return self._confidence.get(tx_id, default)
+
+    def append_vote(self, tx_id: str, vote: Dict) -> int:
+        return self._votes.append(tx_id, vote)
+
+    def append_vote_and_apply(self, tx_id: str, vote: Dict, fn: Callable[[List[Dict]], ResultT]) -> ResultT:
+        return self._votes.append_and_apply(tx_id, vote, lambda votes: fn(list(votes)))
+
+    def get_votes(self, tx_id: str) -> List[Dict]:
+        return self._votes.get(tx_id)
+
+    def vote_store_metrics(self) -> Dict:
+        return self._votes.metrics()
+
+    def set_quorum_signal(self, tx_id: str, validator_id: str, strength: float):
+        with self._lock:
+            self._quorum_signals.setdefault(tx_id, {})[validator_id] = strength
+
+    def get_quorum_signals(self, tx_id: str) -> Dict[str, float]:
+        return dict(self._quorum_signals.get(tx_id, {}))
+
+    def quorum_transaction_count(self) -> int:
+        return len(self._quorum_signals)
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def counters(self) -> Dict[str, int]:
+        return dict(self._counters)
+
+    def register_peer(self, node_id: str, url: str):
+        self._peers[node_id] = url
+
+    def peers(self) -> Dict[str, str]:
+        return dict(self._peers)
+
+    def get_peer_stake(self, node_id: str) -> Optional[float]:
+        return self._peer_stakes.get(node_id)
+
+    def set_peer_stake(self, node_id: str, stake_weight: float):
+        self._peer_stakes[node_id] = stake_weight
+
+    def setdefault_peer_stake(self, node_id: str, stake_weight: float) -> float:
+        with self._lock:
+            return self._peer_stakes.setdefault(node_id, stake_weight)
+
+    def observe_finality(self, tx_id: str, tier: str, confidence: float, timestamp: float,
+                         arrival: float) -> List[Dict]:
+        return [asdict(event) for event in self._finality_events.observe(tx_id, tier, confidence, timestamp, arrival)]
+
+    def finality_events(self, after: int, tx_id: Optional[str] = None, limit: int = 1000) -> Tuple[List[Dict], int]:
+        events, cursor = self._finality_events.read(after, tx_id, limit)
+        return [asdict(event) for event in events], cursor
+
+    def latest_finality_offset(self) -> int:
+        return self._finality_events.latest_offset
+
+    def wait_finality_events(self, after: int, timeout: float) -> bool:
+        return self._finality_events.wait(after, timeout)
+
+    def setdefault_meta(self, key: str, value: str) -> str:
+        with self._lock:
+            return self._meta.setdefault(key, value)
+
+    def claim_worker_index(self) -> int:
+        with self._lock:
+            index = int(self._meta.get("workers_claimed", "0"))
+            self._meta["workers_claimed"] = str(index + 1)
+            return index
+
+    def rolling_hash(self) -> str:
+        return self._meta.get("rolling_hash", "")
+
+    def advance_rolling_hash(self, suffix: str) -> str:
+        with self._lock:
+            new_hash = hashlib.sha256(f"{self._meta.get('rolling_hash', '')}{suffix}".encode()).hexdigest()
+            self._meta["rolling_hash"] = new_hash
+            return new_hash
+
+class SqliteValidatorState(ValidatorStateStore):
+    """
+    SQLite store in WAL mode shared by every worker process on the container
+    Each process and thread gets its own connection; every write commits immediately,
+    so counters, votes and the rolling hash stay consistent across workers
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS transactions (tx_id TEXT PRIMARY KEY, record TEXT, confidence REAL)",
+        "CREATE TABLE IF NOT EXISTS votes (tx_id TEXT, validator_id TEXT, vote INTEGER, confidence REAL, timestamp REAL)",
+        "CREATE INDEX IF NOT EXISTS votes_tx ON votes (tx_id)",
+        "CREATE TABLE IF NOT EXISTS quorum_signals (tx_id TEXT, validator_id TEXT, strength REAL, "
+        "PRIMARY KEY (tx_id, validator_id))",
+        "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)",
+        "CREATE TABLE IF NOT EXISTS peers (node_id TEXT PRIMARY KEY, url TEXT)",
+        "CREATE TABLE IF NOT EXISTS peer_stakes (node_id TEXT PRIMARY KEY, stake_weight REAL)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+        "CREATE TABLE IF NOT EXISTS finality_events (seq INTEGER PRIMARY KEY AUTOINCREMENT, tx_id TEXT, tier TEXT, "
+        "confidence REAL, timestamp REAL, elapsed REAL, UNIQUE (tx_id, tier))",
+    )
+
+    def __init__(self, path: Union[str, Path], busy_timeout_ms: int = 5000, finality_event_capacity: int = 100000,
+                 finality_poll_interval: float = 0.05):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.finality_event_capacity = finality_event_capacity
+        self.finality_poll_interval = finality_poll_interval  # Workers cannot signal each other, so waits poll
+        self._local = threading.local()
+
+        conn = self._conn()
+        for statement in self.SCHEMA:
+            conn.execute(statement)
+
+    def _conn(self) -> sqlite3.Connection:
+        # Connections must not cross a fork, so they are keyed by process as well as thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(str(self.path), isolation_level=None, timeout=self.busy_timeout_ms / 1000)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _scalar(self, query: str, params=(), default=None):
+        row = self._conn().execute(query, params).fetchone()
+        return row[0] if row else default
+
+    def put_transaction(self, tx_id: str, record: Dict):
+        self._conn().execute(
+            "INSERT INTO transactions (tx_id, record) VALUES (?, ?) "
+            "ON CONFLICT(tx_id) DO UPDATE SET record = excluded.record",
+            (tx_id, json.dumps(record, default=str))
+        )
+
+    def get_transaction(self, tx_id: str) -> Optional[Dict]:
+        record = self._scalar("SELECT record FROM transactions WHERE tx_id = ?", (tx_id,))
+        return json.loads(record) if record is not None else None
+
+    def has_transaction(self, tx_id: str) -> bool:
+        return self._scalar("SELECT 1 FROM transactions WHERE tx_id = ?", (tx_id,)) is not None
+
+    def transaction_count(self) -> int:
+        return self._scalar("SELECT COUNT(*) FROM transactions", default=0)
+
+    def set_confidence(self, tx_id: str, confidence: float):
+        self._conn().execute("UPDATE transactions SET confidence = ? WHERE tx_id = ?", (confidence, tx_id))
+
+    def get_confidence(self, tx_id: str, default: float = 0.0) -> float:
+        confidence = self._scalar("SELECT confidence FROM transactions WHERE tx_id = ?", (tx_id,))
+        return confidence if confidence is not None else default
+
+    def _insert_vote(self, tx_id: str, vote: Dict):
+        self._conn().execute(
+            "INSERT INTO votes (tx_id, validator_id, vote, confidence, timestamp) VALUES (?, ?, ?, ?, ?)",
+            (tx_id, vote.get("validator_id"), int(bool(vote.get("vote"))), vote.get("confidence"), vote.get("timestamp"))
+        )
+
+    def append_vote(self, tx_id: str, vote: Dict) -> int:
+        self._insert_vote(tx_id, vote)
+        return self._scalar("SELECT COUNT(*) FROM votes WHERE tx_id = ?", (tx_id,), default=0)
+
+    def append_vote_and_apply(self, tx_id: str, vote: Dict, fn: Callable[[List[Dict]], ResultT]) -> ResultT:
+        conn = self._conn()
+        # The write lock is held from the insert until fn's own writes commit
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._insert_vote(tx_id, vote)
+            result = fn(self.get_votes(tx_id))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def get_votes(self, tx_id: str) -> List[Dict]:
+        rows = self._conn().execute(
+            "SELECT validator_id, vote, confidence, timestamp FROM votes WHERE tx_id = ? ORDER BY rowid", (tx_id,)
+        )
+        return [
+            {"validator_id": validator_id, "vote": bool(vote), "confidence": confidence, "timestamp": timestamp}
+            for validator_id, vote, confidence, timestamp in rows
+        ]
+
+    def set_quorum_signal(self, tx_id: str, validator_id: str, strength: float):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO quorum_signals (tx_id, validator_id, strength) VALUES (?, ?, ?)",
+            (tx_id, validator_id, strength)
+        )
+
+    def get_quorum_signals(self, tx_id: str) -> Dict[str, float]:
+        rows = self._conn().execute("SELECT validator_id, strength FROM quorum_signals WHERE tx_id = ?", (tx_id,))
+        return {validator_id: strength for validator_id, strength in rows}
+
+    def quorum_transaction_count(self) -> int:
+        return self._scalar("SELECT COUNT(DISTINCT tx_id) FROM quorum_signals", default=0)
+
+    def increment(self, name: str, amount: int = 1):
+        self._conn().execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount)
+        )
+
+    def counters(self) -> Dict[str, int]:
+        return {name: value for name, value in self._conn().execute("SELECT name, value FROM counters")}
+
+    def register_peer(self, node_id: str, url: str):
+        self._conn().execute("INSERT OR REPLACE INTO peers (node_id, url) VALUES (?, ?)", (node_id, url))
+
+    def peers(self) -> Dict[str, str]:
+        return {node_id: url for node_id, url in self._conn().execute("SELECT node_id, url FROM peers")}
+
+    def get_peer_stake(self, node_id: str) -> Optional[float]:
+        return self._scalar("SELECT stake_weight FROM peer_stakes WHERE node_id = ?", (node_id,))
+
+    def set_peer_stake(self, node_id: str, stake_weight: float):
+        self._conn().execute("INSERT OR REPLACE INTO peer_stakes (node_id, stake_weight) VALUES (?, ?)",
+                             (node_id, stake_weight))
+
+    def setdefault_peer_stake(self, node_id: str, stake_weight: float) -> float:
+        conn = self._conn()
+        conn.execute("INSERT OR IGNORE INTO peer_stakes (node_id, stake_weight) VALUES (?, ?)", (node_id, stake_weight))
+        return self._scalar("SELECT stake_weight FROM peer_stakes WHERE node_id = ?", (node_id,))
+
+    def observe_finality(self, tx_id: str, tier: str, confidence: float, timestamp: float,
+                         arrival: float) -> List[Dict]:
+        conn = self._conn()
+        events = []
+        recorded = {name for (name,) in conn.execute("SELECT tier FROM finality_events WHERE tx_id = ?", (tx_id,))}
+        # The (tx_id, tier) key still keeps each event unique when two workers race past the check
+        for name in tiers_reached(tier):
+            if name in recorded:
+                continue
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO finality_events (tx_id, tier, confidence, timestamp, elapsed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (tx_id, name, confidence, timestamp, timestamp - arrival)
+            )
+            if cursor.rowcount:
+                events.append({"offset": cursor.lastrowid, "tx_id": tx_id, "tier": name, "confidence": confidence,
+                               "timestamp": timestamp, "elapsed": timestamp - arrival})
+        # Trim whenever this call takes an offset on a 1024 boundary; one call can publish
+        # several tiers, so checking only the last offset would skip most boundaries
+        if any(event["offset"] % 1024 == 0 for event in events):
+            conn.execute("DELETE FROM finality_events WHERE seq <= ?",
+                         (events[-1]["offset"] - self.finality_event_capacity,))
+        return events
+
+    def finality_events(self, after: int, tx_id: Optional[str] = None, limit: int = 1000) -> Tuple[List[Dict], int]:
+        latest = self.latest_finality_offset()
+        query = "SELECT seq, tx_id, tier, confidence, timestamp, elapsed FROM finality_events WHERE seq > ? AND seq <= ?"
+        params = (after, latest)
+        if tx_id is not None:
+            query += " AND tx_id = ?"
+            params += (tx_id,)
+        rows = self._conn().execute(query + " ORDER BY seq LIMIT ?", params + (limit,)).fetchall()
+        events = [
+            {"offset": seq, "tx_id": tx, "tier": tier, "confidence": confidence, "timestamp": timestamp,
+             "elapsed": elapsed}
+            for seq, tx, tier, confidence, timestamp, elapsed in rows
+        ]
+        return events, events[-1]["offset"] if len(events) == limit else max(latest, after)
+
+    def latest_finality_offset(self) -> int:
+        return self._scalar("SELECT MAX(seq) FROM finality_events", default=None) or 0
+
+    def wait_finality_events(self, after: int, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while self.latest_finality_offset() <= after:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.finality_poll_interval, remaining))
+        return True
+
+    def setdefault_meta(self, key: str, value: str) -> str:
+        self._conn().execute("INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)", (key, value))
+        return self._scalar("SELECT value FROM meta WHERE key = ?", (key,))
+
+    def claim_worker_index(self) -> int:
+        conn = self._conn()
+        # BEGIN IMMEDIATE serializes workers starting at once, so no two claim the same index
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            index = int(self._scalar("SELECT value FROM meta WHERE key = 'workers_claimed'", default="0"))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('workers_claimed', ?)", (str(index + 1),))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return index
+
+    def rolling_hash(self) -> str:
+        return self._scalar("SELECT value FROM meta WHERE key = 'rolling_hash'", default="")
+
+    def advance_rolling_hash(self, suffix: str) -> str:
+        conn = self._conn()
+        # BEGIN IMMEDIATE takes the write lock up front, so concurrent workers chain in order
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = self._scalar("SELECT value FROM meta WHERE key = 'rolling_hash'", default="")
+            new_hash = hashlib.sha256(f"{current}{suffix}".encode()).hexdigest()
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rolling_hash', ?)", (new_hash,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return new_hash
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+def create_validator_state(backend: str = "memory", path: Optional[Union[str, Path]] = None) -> ValidatorStateStore:
+    """Build a state store by backend name ("memory" or "sqlite")"""
+    if backend == "memory":
+        return InMemoryValidatorState()
+    if backend == "sqlite":
+        if path is None:
+            raise ValueError("sqlite validator state requires a path")
+        return SqliteValidatorState(path)
+    raise ValueError(f"Unknown state backend: {backend} (expected one of {STATE_BACKENDS})")
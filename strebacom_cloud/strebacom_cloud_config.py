@@ -7,6 +7,7 @@ Includes full validation reporting and paper claims testing
 
 import os
 import json
+import atexit
 import asyncio
 import aiohttp
 import time
@@ -14,13 +15,24 @@ import random
 import hashlib
 import math
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
+from pathlib import Path
 import logging
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
+from sbcp_confidence import classify_finality, confidence_from_votes, finality_schedule, preset, vote_sums
+from sbcp_events import SSE_CONTENT_TYPE, SSE_HEADERS, resume_offset, sse_stream
+from sbcp_history import create_history_sink
+from sbcp_http import GossipBatcher, PeerSessionPool
+from sbcp_instrumentation import CONTENT_TYPE, ValidatorInstrumentation
+from sbcp_kuramoto import PhaseOscillator
+from sbcp_tracing import TRACE_HEADER, SpanTracer, tracing_enabled_from_env
+from sbcp_metrics import ValidationMetrics
+from sbcp_state import ValidatorStateStore, create_validator_state
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -35,6 +47,74 @@ class StrebaCOMCloudConfig:
     quorum_participation: float
     lambda_base: float = 8.0
     byzantine_behavior_intensity: float = 0.3
+    seed: Optional[int] = None  # Fixed seed makes vote streams reproducible
+    history_mode: str = "ring"  # "ring", "reservoir" or "memmap" (see sbcp_history)
+    history_capacity: int = 10000  # Records kept by ring/reservoir history
+    history_path: Optional[str] = None  # Record file for memmap history
+    state_backend: str = "memory"  # "memory" (one process) or "sqlite" (shared by workers, see sbcp_state)
+    state_path: Optional[str] = None  # Database file for sqlite state
+    tracing: bool = False  # Record hot-path spans (see sbcp_tracing)
+    coupling_strength: float = 1.5  # Kuramoto coupling K to peer phases (see sbcp_kuramoto)
+    phase_cycle_seconds: float = 0.08  # Wall-clock length of one phase cycle at natural frequency 1
+    phase_slots_per_cycle: int = 16  # Gossip flush slots per cycle when phase_aligned_gossip is set
+    phase_aligned_gossip: bool = False  # Flush gossip on shared phase slots instead of a fixed timer
+
+class BackgroundEventLoop:
+    """
+    Long-lived asyncio event loop on a daemon thread, shared by every Flask request
+    Handlers submit coroutines through run(); tasks those coroutines create (peer
+    broadcasts, gossip flush timers) keep running after the request has returned.
+    The thread starts lazily, so each pre-forked server worker gets its own loop.
+    """
+    
+    def __init__(self, name: str = "strebacom-event-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+    
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if not self.running:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                
+                def run_loop():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+                
+                self._thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+                self._thread.start()
+                started.wait()
+                self._loop = loop
+                self._pid = os.getpid()
+            return self._loop
+    
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the background loop and block the calling thread for its result"""
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+    
+    def call_soon(self, callback, *args):
+        """Schedule a plain callback on the background loop from any thread"""
+        self._ensure_started().call_soon_threadsafe(callback, *args)
+    
+    def stop(self, timeout: float = 5.0):
+        """Stop the loop and join its thread"""
+        with self._lock:
+            if not self.running:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            if not self._loop.is_running():
+                self._loop.close()
+            self._thread = None
 
 class StrebaCOMCloudValidator:
     """
@@ -42,10 +122,12 @@ class StrebaCOMCloudValidator:
     Designed for Google Cloud Run deployment with full validation capabilities
     """
     
-    def __init__(self, config: StrebaCOMCloudConfig):
+    def __init__(self, config: StrebaCOMCloudConfig, seed: Union[int, np.random.Generator, None] = None,
+                 state: Optional[ValidatorStateStore] = None):
         self.config = config
         self.node_id = config.node_id
         self.is_byzantine = config.validator_type == "byzantine"
+        self.rng = np.random.default_rng(seed if seed is not None else config.seed)
         
         # Strebacom parameters from your paper
         self.lambda_base = config.lambda_base
@@ -55,44 +137,103 @@ class StrebaCOMCloudValidator:
             'economic': 0.95,
             'absolute': 0.99
         }
-        
-        # Cloud validator state
-        self.peer_validators: Dict[str, str] = {}  # node_id -> service_url
-        self.active_transactions: Dict[str, Dict] = {}
-        self.validation_votes: Dict[str, List] = {}
-        self.confidence_scores: Dict[str, float] = {}
-        self.quorum_signals: Dict[str, Dict[str, float]] = {}
-        self.rolling_hash = hashlib.sha256(f"cloud_strebacom_{self.node_id}".encode()).hexdigest()
-        
-        # Performance tracking
-        self.processed_count = 0
+        self.initial_confidence_params = preset("cloud_initial", lambda_base=self.lambda_base,
+                                                time_scale=self.time_scaling_factor)
+        self.distributed_confidence_params = preset("cloud_distributed", lambda_base=self.lambda_base,
+                                                    time_scale=self.time_scaling_factor)
+        
+        # Cloud validator state: transactions, votes, quorum signals, peers, counters and
+        # the rolling hash live in the store so every worker process sees the same values
+        self.state = state if state is not None else create_validator_state(
+            config.state_backend,
+            config.state_path or f"./strebacom_state/{self.node_id}.sqlite"
+        )
+        self.state.setdefault_meta("rolling_hash", hashlib.sha256(f"cloud_strebacom_{self.node_id}".encode()).hexdigest())
+        self.peer_pool = PeerSessionPool(timeout=3.0)  # Keep-alive connections reused across broadcasts
+        self.instrumentation = ValidatorInstrumentation(self.node_id, "flask")  # Served at GET /metrics
+        self.tracer = SpanTracer(self.node_id, config.tracing,  # Dumped at GET /strebacom/trace
+                                 stage_histogram=self.instrumentation.stage_latency)
+        
+        # Kuramoto synchronization for temporal coordination: phases travel on vote gossip
+        self.phase_sync = PhaseOscillator(
+            phase=self.rng.uniform(0, 2 * math.pi),
+            natural_frequency=self.rng.uniform(0.95, 1.05),
+            coupling_strength=config.coupling_strength,
+            time_scale=2 * math.pi / config.phase_cycle_seconds,
+            stale_after=25 * config.phase_cycle_seconds  # Uncoupled extrapolation drifts within a few dozen cycles
+        )
+        self.instrumentation.registry.gauge(
+            "kuramoto_order_parameter", "Phase coherence r with fresh peers (1 = phase-locked)"
+        ).set_function(self.phase_sync.order_parameter)
+        phase_slot_seconds = config.phase_cycle_seconds / config.phase_slots_per_cycle
+        self.gossip = GossipBatcher(self.peer_pool, "/strebacom/gossip/batch",  # Coalesces votes per peer
+                                    flush_interval=phase_slot_seconds if config.phase_aligned_gossip else 0.005,
+                                    on_flush=self.instrumentation.observe_gossip_flush,
+                                    header_factory=self.tracer.gossip_headers,
+                                    flush_delay=(lambda: self.phase_sync.flush_delay(config.phase_slots_per_cycle,
+                                                                                     2 * phase_slot_seconds))
+                                    if config.phase_aligned_gossip else None)
+        
+        # One persistent loop serves every request, so background broadcasts complete
+        self.event_loop = BackgroundEventLoop(f"strebacom-loop-{self.node_id}")
+        self._background_tasks = set()
+        # Timers at each transaction's next predicted tier crossing, touched only on the loop thread
+        self._crossing_timers: Dict[str, asyncio.TimerHandle] = {}
+        
+        # Performance tracking (counters are kept in the state store)
         self.start_time = time.time()
-        self.consensus_achievements = {
-            'provisional': 0, 'economic': 0, 'absolute': 0
-        }
+        self.instrumentation.bind_gauges(
+            active_transactions=self.state.transaction_count,
+            peers=lambda: len(self.peer_validators),
+            gossip_pending=lambda: self.gossip.pending,
+            processed=lambda: self.processed_count,
+            start_time=self.start_time
+        )
         
         # Detailed metrics for paper validation
         self.transaction_history = []
-        self.confidence_history = []
-        self.processing_time_history = []
-        self.finality_distribution = {'provisional': 0, 'economic': 0, 'absolute': 0, 'none': 0}
-        
-        # Kuramoto synchronization for temporal coordination
-        self.phase = random.uniform(0, 2 * math.pi)
-        self.natural_frequency = random.uniform(0.95, 1.05)
-        
-        # Paper validation metrics
-        self.paper_validation_metrics = {
-            "continuous_validation_achieved": True,
-            "blockless_consensus": True,
-            "constant_time_operations": [],
-            "throughput_measurements": [],
-            "finality_achievements": [],
-            "byzantine_resilience_tests": []
-        }
+        # Bounded (confidence, processing_time) history; mode is set by the config
+        self.validation_history = create_history_sink(
+            config.history_mode,
+            fields=(("confidence", "f8"), ("processing_time", "f8")),
+            capacity=config.history_capacity,
+            path=config.history_path or f"./strebacom_history/{self.node_id}.bin",
+            seed=config.seed
+        )
+        
+        # Paper validation metrics: streaming aggregates plus bounded raw sample rings
+        self.paper_validation_metrics = ValidationMetrics(sample_capacity=config.history_capacity)
         
         logger.info(f"Initialized cloud validator {self.node_id} - Type: {config.validator_type}")
     
+    @property
+    def processed_count(self) -> int:
+        return self.state.counter("processed")
+    
+    @property
+    def consensus_achievements(self) -> Dict[str, int]:
+        counters = self.state.counters()
+        return {tier: counters.get(f"consensus.{tier}", 0) for tier in ('provisional', 'economic', 'absolute')}
+    
+    @property
+    def finality_distribution(self) -> Dict[str, int]:
+        counters = self.state.counters()
+        return {tier: counters.get(f"finality.{tier}", 0) for tier in ('provisional', 'economic', 'absolute', 'none')}
+    
+    @property
+    def peer_validators(self) -> Dict[str, str]:
+        """node_id -> service_url"""
+        return self.state.peers()
+    
+    @property
+    def rolling_hash(self) -> str:
+        return self.state.rolling_hash()
+    
+    @property
+    def phase(self) -> float:
+        """Current Kuramoto phase (per worker process)"""
+        return self.phase_sync.phase
+    
     def create_flask_app(self) -> Flask:
         """Create Flask app for Cloud Run deployment with full endpoints"""
         app = Flask(__name__)
@@ -115,6 +256,11 @@ class StrebaCOMCloudValidator:
             """Simple health check for Cloud Run"""
             return jsonify({"status": "ok"}), 200
         
+        @app.route('/metrics', methods=['GET'])
+        def prometheus_metrics():
+            """Counters, gauges and latency histograms in Prometheus text exposition format"""
+            return Response(self.instrumentation.render(), content_type=CONTENT_TYPE)
+        
         @app.route('/strebacom/transaction/propose', methods=['POST'])
         def propose_transaction():
             """Process transaction using your blockless Strebacom model"""
@@ -135,7 +281,7 @@ class StrebaCOMCloudValidator:
                 peer_url = peer_data.get("service_url")
                 
                 if peer_id and peer_url:
-                    self.peer_validators[peer_id] = peer_url
+                    self.state.register_peer(peer_id, peer_url)
                     logger.info(f"Registered peer {peer_id} at {peer_url}")
                     return jsonify({"status": "registered", "peer_id": peer_id})
                 
@@ -149,49 +295,45 @@ class StrebaCOMCloudValidator:
             """Receive validation vote from peer validator"""
             try:
                 vote_data = request.get_json()
-                tx_id = vote_data.get("tx_id")
-                validator_id = vote_data.get("validator_id")
-                vote = vote_data.get("vote")
-                confidence = vote_data.get("confidence")
+                with self.instrumentation.vote_ingest_latency.labels(source="vote").time():
+                    tx_id = self.record_peer_vote(vote_data, recalculate=True)
                 
-                if not self.validation_votes.get(tx_id):
-                    self.validation_votes[tx_id] = []
-                
-                self.validation_votes[tx_id].append({
-                    "validator_id": validator_id,
-                    "vote": vote,
-                    "confidence": confidence,
-                    "timestamp": time.time()
-                })
+                return jsonify({"status": "vote_received", "tx_id": tx_id})
                 
-                # Recalculate consensus confidence
-                if tx_id in self.active_transactions:
-                    new_confidence, new_tier = self.calculate_distributed_consensus(tx_id)
-                    self.confidence_scores[tx_id] = new_confidence
+            except Exception as e:
+                logger.error(f"Vote processing error: {e}")
+                return jsonify({"error": str(e)}), 500
+        
+        @app.route('/strebacom/gossip/batch', methods=['POST'])
+        def receive_gossip_batch():
+            """Receive a batch of validation votes covering many transactions"""
+            try:
+                batch = request.get_json()
+                trace_context = SpanTracer.parse_header(request.headers.get(TRACE_HEADER))
+                with self.instrumentation.vote_ingest_latency.labels(source="batch").time(), \
+                        self.tracer.span("gossip.receive", **trace_context):
+                    touched = {self.record_peer_vote(vote_data) for vote_data in batch.get("votes", [])}
                     
-                    # Update paper validation metrics
-                    self.paper_validation_metrics["finality_achievements"].append({
-                        "tx_id": tx_id,
-                        "confidence": new_confidence,
-                        "tier": new_tier,
-                        "validator_count": len(self.validation_votes[tx_id])
-                    })
+                    # Recalculate each transaction once, however many of its votes the batch carried
+                    for tx_id in touched:
+                        self.recalculate_consensus(tx_id)
                 
-                return jsonify({"status": "vote_received", "tx_id": tx_id})
+                return jsonify({"status": "batch_received", "votes": len(batch.get("votes", [])),
+                                "transactions": len(touched)})
                 
             except Exception as e:
-                logger.error(f"Vote processing error: {e}")
+                logger.error(f"Gossip batch processing error: {e}")
                 return jsonify({"error": str(e)}), 500
         
         @app.route('/strebacom/consensus/status/<tx_id>', methods=['GET'])
         def get_consensus_status(tx_id):
             """Get current consensus status for transaction"""
             try:
-                if tx_id not in self.active_transactions:
+                if not self.state.has_transaction(tx_id):
                     return jsonify({"error": "Transaction not found"}), 404
                 
-                confidence = self.confidence_scores.get(tx_id, 0.0)
-                votes = self.validation_votes.get(tx_id, [])
+                confidence = self.state.get_confidence(tx_id, 0.0)
+                votes = self.state.get_votes(tx_id)
                 
                 return jsonify({
                     "tx_id": tx_id,
@@ -199,6 +341,7 @@ class StrebaCOMCloudValidator:
                     "vote_count": len(votes),
                     "finality_tier": self.determine_finality_tier(confidence),
                     "consensus_achieved": confidence >= self.finality_thresholds['provisional'],
+                    "finality_eta": self.finality_eta(tx_id),
                     "rolling_hash": self.rolling_hash[:16],
                     "kuramoto_phase": self.phase
                 })
@@ -207,20 +350,42 @@ class StrebaCOMCloudValidator:
                 logger.error(f"Status query error: {e}")
                 return jsonify({"error": str(e)}), 500
         
+        @app.route('/strebacom/finality/stream', methods=['GET'])
+        def stream_finality_events():
+            """
+            Server-Sent Events for every tier a transaction reaches; ?tx_id= narrows the
+            stream to one transaction, Last-Event-ID or ?after= resumes after an offset
+            """
+            tx_id = request.args.get('tx_id')
+            try:
+                after = resume_offset(request.args.get('after'), request.headers.get('Last-Event-ID'),
+                                      self.state.latest_finality_offset(), tx_id)
+            except ValueError:
+                return jsonify({"error": "Offsets must be integers"}), 400
+            
+            # Each open stream holds one server thread while it waits for events
+            stream = sse_stream(lambda cursor, tx: self.state.finality_events(cursor, tx),
+                                self.state.wait_finality_events, after, tx_id)
+            return Response(stream, content_type=SSE_CONTENT_TYPE, headers=SSE_HEADERS)
+        
         @app.route('/strebacom/metrics', methods=['GET'])
         def get_detailed_metrics():
             """Get comprehensive validator metrics for paper validation"""
             try:
                 uptime = time.time() - self.start_time
-                total_finalized = sum(self.consensus_achievements.values())
+                processed_count = self.processed_count
+                consensus_achievements = self.consensus_achievements
+                total_finalized = sum(consensus_achievements.values())
                 
                 # Calculate advanced metrics for paper validation
-                avg_confidence = np.mean(self.confidence_history) if self.confidence_history else 0
-                avg_processing_time = np.mean(self.processing_time_history) if self.processing_time_history else 0
-                confidence_std = np.std(self.confidence_history) if len(self.confidence_history) > 1 else 0
+                confidence_history = self.validation_history.column("confidence")
+                processing_time_history = self.validation_history.column("processing_time")
+                avg_confidence = np.mean(confidence_history) if len(confidence_history) else 0
+                avg_processing_time = np.mean(processing_time_history) if len(processing_time_history) else 0
+                confidence_std = np.std(confidence_history) if len(confidence_history) > 1 else 0
                 
                 # Constant time validation
-                constant_time = np.std(self.processing_time_history) < 0.1 if len(self.processing_time_history) > 10 else False
+                constant_time = bool(np.std(processing_time_history) < 0.1) if len(processing_time_history) > 10 else False
                 
                 return jsonify({
                     "node_id": self.node_id,
@@ -231,30 +396,66 @@ class StrebaCOMCloudValidator:
                         "quorum_participation": self.config.quorum_participation
                     },
                     "performance_metrics": {
-                        "processed_transactions": self.processed_count,
+                        "processed_transactions": processed_count,
                         "uptime_seconds": uptime,
-                        "transactions_per_second": self.processed_count / uptime if uptime > 0 else 0,
+                        "transactions_per_second": processed_count / uptime if uptime > 0 else 0,
                         "total_finalized": total_finalized,
-                        "finality_rate": total_finalized / max(self.processed_count, 1),
+                        "finality_rate": total_finalized / max(processed_count, 1),
                         "average_confidence": avg_confidence,
                         "confidence_std": confidence_std,
                         "average_processing_time": avg_processing_time,
                         "constant_time_processing": constant_time
                     },
-                    "consensus_achievements": self.consensus_achievements,
+                    "consensus_achievements": consensus_achievements,
                     "finality_distribution": self.finality_distribution,
                     "network_state": {
                         "peer_count": len(self.peer_validators),
-                        "active_transactions": len(self.active_transactions),
+                        "active_transactions": self.state.transaction_count(),
+                        "state_backend": type(self.state).__name__,
+                        "worker_pid": os.getpid(),
                         "rolling_hash": self.rolling_hash[:16],
-                        "kuramoto_phase": self.phase
+                        "kuramoto_phase": self.phase,
+                        "event_loop_running": self.event_loop.running,
+                        "background_tasks": len(self._background_tasks)
                     },
-                    "paper_validation": self.paper_validation_metrics
+                    "connection_pool": self.peer_pool.metrics(),
+                    "gossip_batching": self.gossip.metrics(),
+                    "vote_store": self.state.vote_store_metrics(),
+                    "phase_synchronization": {
+                        **self.phase_sync.summary(),
+                        "phase_aligned_gossip": self.config.phase_aligned_gossip
+                    },
+                    "paper_validation": {
+                        "continuous_validation_achieved": True,
+                        "blockless_consensus": True,
+                        **self.paper_validation_metrics.summary()
+                    }
                 })
             except Exception as e:
                 logger.error(f"Metrics error: {e}")
                 return jsonify({"error": str(e)}), 500
         
+        @app.route('/strebacom/metrics/samples/<series>', methods=['GET'])
+        def get_metric_samples(series):
+            """Page through raw metric samples ("processing" or "finality") by offset"""
+            try:
+                offset = int(request.args.get('offset', 0))
+                limit = min(int(request.args.get('limit', 500)), 5000)
+                return jsonify(self.paper_validation_metrics.samples(series, offset, limit))
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            except Exception as e:
+                logger.error(f"Metric samples error: {e}")
+                return jsonify({"error": str(e)}), 500
+        
+        @app.route('/strebacom/trace', methods=['GET'])
+        def get_trace():
+            """Recorded spans as Chrome trace JSON (empty unless tracing is enabled)"""
+            trace = self.tracer.chrome_trace()
+            if request.args.get('clear', '').lower() in ('1', 'true'):
+                self.tracer.clear()
+            return jsonify(trace)
+        
         @app.route('/strebacom/validate/paper', methods=['GET'])
         def validate_paper_claims():
             """Validate published paper claims endpoint"""
@@ -279,19 +480,95 @@ class StrebaCOMCloudValidator:
         
         return app
     
+    def record_peer_vote(self, vote_data: Dict, recalculate: bool = False) -> str:
+        """
+        Store one peer vote; returns its tx_id
+        With recalculate, consensus is recomputed atomically with the append, so
+        concurrent votes for the same transaction cannot overwrite each other's result
+        """
+        tx_id = vote_data.get("tx_id")
+        validator_id = vote_data.get("validator_id")
+        self.instrumentation.votes_ingested.labels(
+            status="received" if self.state.has_transaction(tx_id) else "not_found").inc()
+        if "stake_weight" in vote_data:
+            self.state.set_peer_stake(validator_id, float(vote_data["stake_weight"]))
+        if "phase" in vote_data and validator_id != self.node_id:
+            self.phase_sync.observe(validator_id, vote_data["phase"], vote_data.get("frequency", 1.0),
+                                    sent_at=vote_data.get("timestamp"))
+        
+        vote = {
+            "validator_id": validator_id,
+            "vote": vote_data.get("vote"),
+            "confidence": vote_data.get("confidence"),
+            "timestamp": time.time()
+        }
+        if recalculate:
+            self.state.append_vote_and_apply(tx_id, vote, lambda votes: self.recalculate_consensus(tx_id, votes))
+        else:
+            self.state.append_vote(tx_id, vote)
+        return tx_id
+    
+    def recalculate_consensus(self, tx_id: str, votes: Optional[List[Dict]] = None):
+        """Recalculate consensus confidence for a transaction we are tracking"""
+        tx = self.state.get_transaction(tx_id)
+        if tx is None:
+            return
+        
+        now = time.time()
+        votes = self.state.get_votes(tx_id) if votes is None else votes
+        new_confidence, new_tier = self.calculate_distributed_consensus(tx_id, votes, now)
+        self.state.set_confidence(tx_id, new_confidence)
+        self.publish_finality(tx_id, new_confidence, new_tier, now, tx["arrival_time"])
+        
+        # Update paper validation metrics
+        self.paper_validation_metrics.record_finality(tx_id, new_confidence, new_tier, len(votes))
+    
+    def publish_finality(self, tx_id: str, confidence: float, finality_tier: str, now: float, arrival: float):
+        """Record new tier transitions for /strebacom/finality/stream and time the next predicted one"""
+        for event in self.state.observe_finality(tx_id, finality_tier, confidence, now, arrival):
+            self.instrumentation.observe_finality(event["tier"], event["elapsed"])
+        if finality_tier != 'absolute':
+            pending = [eta for eta in self.finality_eta(tx_id, now).values() if eta]  # 0 = reached, None = never
+            if pending:
+                self.event_loop.call_soon(self._arm_crossing_timer, tx_id, max(min(pending), 0.001))
+    
+    def _arm_crossing_timer(self, tx_id: str, delay: float):
+        timer = self._crossing_timers.pop(tx_id, None)
+        if timer is not None:
+            timer.cancel()
+        self._crossing_timers[tx_id] = asyncio.get_running_loop().call_later(delay, self._crossing_due, tx_id)
+    
+    def _crossing_due(self, tx_id: str):
+        """Timer callback: recompute at the predicted crossing, so its event carries the crossing time"""
+        self._crossing_timers.pop(tx_id, None)
+        tx = self.state.get_transaction(tx_id)
+        if tx is None:
+            return
+        now = time.time()
+        confidence, finality_tier = self.calculate_distributed_consensus(tx_id, current_time=now)
+        self.state.set_confidence(tx_id, confidence)
+        self.publish_finality(tx_id, confidence, finality_tier, now, tx["arrival_time"])
+    
     def calculate_finality_rate(self) -> float:
         """Calculate overall finality rate"""
         total_finalized = sum(self.consensus_achievements.values())
         return total_finalized / max(self.processed_count, 1)
     
     def process_strebacom_transaction_sync(self, tx_data: Dict) -> Dict:
-        """Synchronous wrapper for async transaction processing"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        """Synchronous bridge from a Flask request onto the persistent event loop"""
+        return self.event_loop.run(self.process_strebacom_transaction(tx_data))
+    
+    def shutdown(self):
+        """Send buffered gossip, close pooled connections and stop the event loop"""
+        if not self.event_loop.running:
+            return
         try:
-            return loop.run_until_complete(self.process_strebacom_transaction(tx_data))
-        finally:
-            loop.close()
+            self.event_loop.run(self.gossip.flush(), timeout=5.0)
+            self.event_loop.run(self.peer_pool.close(), timeout=5.0)
+        except Exception as e:
+            logger.warning(f"Validator shutdown error: {e}")
+        self.event_loop.stop()
+        self.state.close()
     
     async def process_strebacom_transaction(self, tx_data: Dict) -> Dict:
         """
@@ -299,55 +576,67 @@ class StrebaCOMCloudValidator:
         Implements continuous validation without blocks
         """
         tx_id = tx_data["tx_id"]
+        started = time.perf_counter()
+        started_ns = time.monotonic_ns()
         start_time = time.time()
+        span = self.tracer.span
         
         # Store transaction for continuous processing (no blocks)
-        self.active_transactions[tx_id] = {
-            **tx_data,
-            "arrival_time": start_time,
-            "validator_id": self.node_id
-        }
+        with span("state.store", tx_id):
+            self.state.put_transaction(tx_id, {
+                **tx_data,
+                "arrival_time": start_time,
+                "validator_id": self.node_id
+            })
         
         # Simulate Strebacom validation based on your Byzantine model
-        vote, vote_confidence = await self.simulate_strebacom_validation(tx_data)
+        with span("vote.simulate", tx_id):
+            vote, vote_confidence = await self.simulate_strebacom_validation(tx_data)
         
         # Generate quorum sensing signal
-        quorum_signal = self.generate_quorum_signal(vote_confidence)
-        self.quorum_signals[tx_id] = {self.node_id: quorum_signal}
+        with span("quorum.signal", tx_id):
+            quorum_signal = self.generate_quorum_signal(vote_confidence)
+            self.state.set_quorum_signal(tx_id, self.node_id, quorum_signal)
         
         # Calculate initial confidence using your formula
-        confidence, finality_tier = self.calculate_initial_confidence(tx_id, time.time())
-        self.confidence_scores[tx_id] = confidence
+        with span("confidence.compute", tx_id):
+            now = time.time()
+            confidence, finality_tier = self.calculate_initial_confidence(tx_id, now)
+            self.state.set_confidence(tx_id, confidence)
+        self.publish_finality(tx_id, confidence, finality_tier, now, start_time)
         
         # Update rolling hash continuously
-        self.update_rolling_hash_continuous(tx_data, confidence)
+        with span("rolling_hash.update", tx_id):
+            rolling_hash = self.update_rolling_hash_continuous(tx_data, confidence)
         
         # Update Kuramoto synchronization
         self.update_kuramoto_phase()
         
         # Record metrics for paper validation
         processing_time = time.time() - start_time
-        self.confidence_history.append(confidence)
-        self.processing_time_history.append(processing_time)
-        self.finality_distribution[finality_tier] = self.finality_distribution.get(finality_tier, 0) + 1
+        self.validation_history.append(tx_id, confidence, processing_time)
+        self.state.increment(f"finality.{finality_tier}")
         
         # Record consensus achievement
-        if finality_tier in self.consensus_achievements:
-            self.consensus_achievements[finality_tier] += 1
+        if finality_tier in self.finality_thresholds:
+            self.state.increment(f"consensus.{finality_tier}")
         
         # Update paper validation metrics
-        self.paper_validation_metrics["constant_time_operations"].append(processing_time)
-        self.paper_validation_metrics["throughput_measurements"].append({
-            "timestamp": time.time(),
-            "tx_id": tx_id,
-            "processing_time": processing_time
-        })
+        self.paper_validation_metrics.record_processing(tx_id, processing_time)
         
-        self.processed_count += 1
+        self.state.increment("processed")
         
         # Broadcast to peer validators (distributed consensus)
-        asyncio.create_task(self.broadcast_validation_to_peers(tx_id, vote, vote_confidence))
-        
+        # Keep a reference so the task is not garbage-collected before it finishes
+        task = asyncio.create_task(self.broadcast_validation_to_peers(tx_id, vote, vote_confidence))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        
+        self.instrumentation.proposals.labels(finality_tier=finality_tier).inc()
+        self.instrumentation.propose_latency.observe(time.perf_counter() - started)
+        if self.tracer.enabled:
+            self.tracer.record("propose", started_ns, time.monotonic_ns() - started_ns, tx_id,
+                               {"finality_tier": finality_tier})
         return {
             "tx_id": tx_id,
             "validator_id": self.node_id,
@@ -356,7 +645,7 @@ class StrebaCOMCloudValidator:
             "finality_tier": finality_tier,
             "processing_time": processing_time,
             "quorum_strength": quorum_signal,
-            "rolling_hash": self.rolling_hash[:16],
+            "rolling_hash": rolling_hash[:16],
             "kuramoto_phase": self.phase,
             "consensus_type": "strebacom_distributed",
             "peer_count": len(self.peer_validators),
@@ -371,18 +660,18 @@ class StrebaCOMCloudValidator:
     async def simulate_strebacom_validation(self, tx_data: Dict) -> tuple:
         """Simulate validation decision based on your Byzantine model"""
         # Simulate realistic network processing delay
-        await asyncio.sleep(random.uniform(0.01, 0.05))
+        await asyncio.sleep(self.rng.uniform(0.01, 0.05))
         
         if self.is_byzantine:
             # Byzantine behavior with configurable intensity
-            vote = random.random() < self.config.byzantine_behavior_intensity
-            confidence = random.uniform(0.1, 0.4)
+            vote = self.rng.random() < self.config.byzantine_behavior_intensity
+            confidence = self.rng.uniform(0.1, 0.4)
         else:
             # Honest validator behavior from your model
             risk_score = tx_data.get("risk_score", 0.5)
             base_validity = risk_score < 0.65
             vote_probability = self.config.reputation * (1.2 if base_validity else 0.3)
-            vote = random.random() < vote_probability
+            vote = self.rng.random() < vote_probability
             confidence = self.config.reputation * (0.9 if vote == base_validity else 0.4)
         
         return vote, confidence
@@ -393,99 +682,97 @@ class StrebaCOMCloudValidator:
         
         if self.is_byzantine:
             # Byzantine validators send inconsistent signals
-            signal_strength *= random.uniform(0.1, 0.6)
+            signal_strength *= self.rng.uniform(0.1, 0.6)
         
         return signal_strength
     
     def calculate_initial_confidence(self, tx_id: str, current_time: float) -> tuple:
         """Calculate initial confidence using your published formula"""
-        if tx_id not in self.active_transactions:
+        with self.instrumentation.confidence_compute_latency.labels(kind="initial").time():
+            return self._compute_initial_confidence(tx_id, current_time)
+    
+    def _compute_initial_confidence(self, tx_id: str, current_time: float) -> tuple:
+        tx = self.state.get_transaction(tx_id)
+        if tx is None:
             return 0.0, 'none'
         
-        tx = self.active_transactions[tx_id]
-        time_elapsed = max(current_time - tx["arrival_time"], 0.001) * self.time_scaling_factor
-        
-        # Initial validation weight (single validator)
-        wi = self.config.stake_weight
-        vi = 1.0  # Assuming validation passed
-        ri = self.config.reputation
-        time_weight = math.log(1 + time_elapsed)
-        quorum_weight = self.quorum_signals.get(tx_id, {}).get(self.node_id, 0.7)
-        
-        validation_weight = wi * vi * ri * time_weight * quorum_weight
-        
-        # Enhanced lambda for cloud environment
-        lambda_t = self.lambda_base * (1 + 0.3) * (1 + 0.2 * quorum_weight)
+        # Initial validation weight (single validator, validation assumed passed)
+        quorum_weight = self.state.get_quorum_signals(tx_id).get(self.node_id, 0.7)
         
         # Your published confidence formula: C(T,t) = 1 - e^(-λ(t)·V(T,t))
-        confidence = 1.0 - math.exp(-lambda_t * validation_weight * time_elapsed)
-        confidence = min(confidence, 0.999)
-        
+        confidence = confidence_from_votes(self.initial_confidence_params, [self.config.stake_weight], [True],
+                                           [self.config.reputation], current_time - tx["arrival_time"],
+                                           quorum=[quorum_weight], participation=1.0, quorum_strength=quorum_weight)
         return confidence, self.determine_finality_tier(confidence)
     
-    def calculate_distributed_consensus(self, tx_id: str) -> tuple:
+    def calculate_distributed_consensus(self, tx_id: str, votes: Optional[List[Dict]] = None,
+                                        current_time: Optional[float] = None) -> tuple:
         """Calculate consensus confidence across distributed validators"""
-        if tx_id not in self.active_transactions:
+        with self.instrumentation.confidence_compute_latency.labels(kind="distributed").time():
+            return self._compute_distributed_consensus(tx_id, votes, current_time)
+    
+    def _compute_distributed_consensus(self, tx_id: str, votes: Optional[List[Dict]] = None,
+                                       current_time: Optional[float] = None) -> tuple:
+        tx = self.state.get_transaction(tx_id)
+        if tx is None:
             return 0.0, 'none'
         
-        tx = self.active_transactions[tx_id]
-        current_time = time.time()
-        time_elapsed = max(current_time - tx["arrival_time"], 0.001) * self.time_scaling_factor
-        
-        # Accumulate validation weight from all votes
-        validation_weight = 0.0
-        total_stake = 0.0
-        votes = self.validation_votes.get(tx_id, [])
-        
-        for vote_data in votes:
-            wi = random.uniform(1.0, 3.0)  # Simulated stake weight
-            vi = 1.0 if vote_data["vote"] else 0.0
-            ri = vote_data["confidence"]  # Use reported confidence as reputation proxy
-            time_weight = math.log(1 + time_elapsed)
-            quorum_weight = 0.8  # Strong quorum in cloud environment
-            
-            validation_weight += wi * vi * ri * time_weight * quorum_weight
-            total_stake += wi
-        
-        # Normalize and scale by validator participation
-        if total_stake > 0 and len(votes) > 0:
-            validation_weight = (validation_weight / total_stake) * len(votes)
+        current_time = time.time() if current_time is None else current_time
+        votes = self.state.get_votes(tx_id) if votes is None else votes
         
-        # Enhanced lambda for distributed consensus
+        # Stake-weighted votes, with reported confidence as reputation proxy and a strong
+        # fixed quorum weight (0.8) in the cloud environment
         participation_ratio = len(votes) / max(len(self.peer_validators), 1)
-        lambda_t = self.lambda_base * (1 + 0.5 * participation_ratio) * 1.3
-        
-        # Distributed confidence calculation
-        confidence = 1.0 - math.exp(-lambda_t * validation_weight * time_elapsed)
-        confidence = min(confidence, 0.999)
-        
+        confidence = confidence_from_votes(self.distributed_confidence_params,
+                                           [self.get_peer_stake_weight(vote_data["validator_id"]) for vote_data in votes],
+                                           [vote_data["vote"] for vote_data in votes],
+                                           [vote_data["confidence"] for vote_data in votes],
+                                           current_time - tx["arrival_time"], quorum=[0.8] * len(votes),
+                                           participation=participation_ratio)
         return confidence, self.determine_finality_tier(confidence)
     
+    def finality_eta(self, tx_id: str, current_time: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """Seconds until each tier is reached with the distributed votes so far (0 reached, None never)"""
+        tx = self.state.get_transaction(tx_id)
+        if tx is None:
+            return {tier: None for tier in self.finality_thresholds}
+        
+        current_time = time.time() if current_time is None else current_time
+        votes = self.state.get_votes(tx_id)
+        weighted_sum, stake_sum = vote_sums([self.get_peer_stake_weight(vote_data["validator_id"]) for vote_data in votes],
+                                            [vote_data["vote"] for vote_data in votes],
+                                            [vote_data["confidence"] for vote_data in votes], [0.8] * len(votes))
+        schedule = finality_schedule(self.distributed_confidence_params, weighted_sum, stake_sum, len(votes),
+                                     tx["arrival_time"], len(votes) / max(len(self.peer_validators), 1),
+                                     thresholds=self.finality_thresholds)
+        return {tier: max(when - current_time, 0.0) if math.isfinite(when) else None
+                for tier, when in schedule.items()}
+    
+    def get_peer_stake_weight(self, validator_id: str) -> float:
+        """Stake weight reported by a peer, or a simulated one drawn once per peer"""
+        if validator_id == self.node_id:
+            return self.config.stake_weight
+        stake_weight = self.state.get_peer_stake(validator_id)
+        if stake_weight is None:
+            stake_weight = self.state.setdefault_peer_stake(validator_id, self.rng.uniform(1.0, 3.0))
+        return stake_weight
+    
     def determine_finality_tier(self, confidence: float) -> str:
         """Determine finality tier based on confidence score"""
-        if confidence >= self.finality_thresholds['absolute']:
-            return 'absolute'
-        elif confidence >= self.finality_thresholds['economic']:
-            return 'economic'
-        elif confidence >= self.finality_thresholds['provisional']:
-            return 'provisional'
-        return 'none'
-    
-    def update_rolling_hash_continuous(self, tx_data: Dict, confidence: float):
-        """Update rolling hash continuously (blockless)"""
-        hash_input = f"{self.rolling_hash}{tx_data['tx_id']}{confidence}{time.time()}"
-        self.rolling_hash = hashlib.sha256(hash_input.encode()).hexdigest()
-    
-    def update_kuramoto_phase(self):
-        """Update Kuramoto synchronization phase from your paper"""
-        dt = 0.01
-        coupling_strength = 1.5
-        self.phase += self.natural_frequency * dt
-        self.phase = self.phase % (2 * math.pi)
+        return classify_finality(confidence, self.finality_thresholds)
+    
+    def update_rolling_hash_continuous(self, tx_data: Dict, confidence: float) -> str:
+        """Update rolling hash continuously (blockless); atomic across workers sharing the store"""
+        return self.state.advance_rolling_hash(f"{tx_data['tx_id']}{confidence}{time.time()}")
+    
+    def update_kuramoto_phase(self) -> float:
+        """Integrate the Kuramoto phase, coupled to the latest peer phases, up to now"""
+        return self.phase_sync.advance()
     
     async def broadcast_validation_to_peers(self, tx_id: str, vote: bool, confidence: float):
         """Broadcast validation vote to peer validators"""
-        if not self.peer_validators:
+        peer_validators = self.peer_validators
+        if not peer_validators:
             return
         
         vote_data = {
@@ -493,47 +780,47 @@ class StrebaCOMCloudValidator:
             "validator_id": self.node_id,
             "vote": vote,
             "confidence": confidence,
-            "timestamp": time.time()
+            "stake_weight": self.config.stake_weight,
+            "timestamp": time.time(),
+            **self.phase_sync.message()  # Piggybacked phase couples the receiver to this validator
         }
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=3)) as session:
-            tasks = []
-            for peer_id, peer_url in self.peer_validators.items():
-                task = self.send_vote_to_peer(session, peer_url, vote_data)
-                tasks.append(task)
-            
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+        # Coalesced into /strebacom/gossip/batch requests by the gossip batcher
+        with self.tracer.span("broadcast.enqueue", tx_id):
+            for peer_id, peer_url in peer_validators.items():
+                self.gossip.enqueue(peer_url, "votes", vote_data)
     
-    async def send_vote_to_peer(self, session: aiohttp.ClientSession, peer_url: str, vote_data: Dict):
-        """Send validation vote to specific peer"""
+    async def send_vote_to_peer(self, peer_url: str, vote_data: Dict):
+        """Send validation vote to specific peer over the pooled session"""
         try:
-            async with session.post(f"{peer_url}/strebacom/validation/vote", json=vote_data) as resp:
-                if resp.status == 200:
-                    return await resp.json()
+            return await self.peer_pool.post_json(f"{peer_url}/strebacom/validation/vote", vote_data)
         except Exception as e:
             logger.warning(f"Failed to send vote to {peer_url}: {e}")
     
     def generate_paper_validation_report(self) -> Dict:
         """Generate comprehensive validation report for paper claims"""
         uptime = time.time() - self.start_time
-        total_finalized = sum(self.consensus_achievements.values())
+        processed_count = self.processed_count
+        consensus_achievements = self.consensus_achievements
+        total_finalized = sum(consensus_achievements.values())
         
         # Calculate advanced metrics
-        avg_confidence = np.mean(self.confidence_history) if self.confidence_history else 0
-        avg_processing_time = np.mean(self.processing_time_history) if self.processing_time_history else 0
-        constant_time = np.std(self.processing_time_history) < 0.1 if len(self.processing_time_history) > 10 else False
+        confidence_history = self.validation_history.column("confidence")
+        processing_time_history = self.validation_history.column("processing_time")
+        avg_confidence = np.mean(confidence_history) if len(confidence_history) else 0
+        avg_processing_time = np.mean(processing_time_history) if len(processing_time_history) else 0
+        constant_time = bool(np.std(processing_time_history) < 0.1) if len(processing_time_history) > 10 else False
         
         # Validate paper claims
         claims_validated = {
             "continuous_validation_streams": True,  # No blocks used
             "blockless_consensus": True,
             "constant_time_processing": constant_time,
-            "high_throughput": self.processed_count / uptime > 1.0 if uptime > 0 else False,
-            "near_instantaneous_finality": avg_processing_time < 1.0,
+            "high_throughput": processed_count / uptime > 1.0 if uptime > 0 else False,
+            "near_instantaneous_finality": bool(avg_processing_time < 1.0),
             "byzantine_fault_tolerance": self.config.validator_type in ["honest", "byzantine"],
             "multi_tier_finality": total_finalized > 0,
-            "quorum_sensing_consensus": len(self.quorum_signals) > 0,
+            "quorum_sensing_consensus": self.state.quorum_transaction_count() > 0,
             "linear_scalability": "requires_multi_node_test"
         }
         
@@ -543,14 +830,14 @@ class StrebaCOMCloudValidator:
             "validator_type": self.config.validator_type,
             "paper_claims_validated": claims_validated,
             "performance_summary": {
-                "total_transactions": self.processed_count,
+                "total_transactions": processed_count,
                 "uptime_seconds": uptime,
-                "throughput_tps": self.processed_count / uptime if uptime > 0 else 0,
+                "throughput_tps": processed_count / uptime if uptime > 0 else 0,
                 "average_confidence": avg_confidence,
                 "average_processing_time": avg_processing_time,
-                "finality_rate": total_finalized / max(self.processed_count, 1)
+                "finality_rate": total_finalized / max(processed_count, 1)
             },
-            "consensus_achievements": self.consensus_achievements,
+            "consensus_achievements": consensus_achievements,
             "finality_distribution": self.finality_distribution,
             "validation_success": sum(1 for v in claims_validated.values() if v == True) / len(claims_validated),
             "recommendation": self.generate_recommendation(claims_validated)
@@ -570,13 +857,8 @@ class StrebaCOMCloudValidator:
             return "NEEDS IMPROVEMENT: Further development required to match paper claims."
     
     def test_linear_scalability_sync(self, num_transactions: int) -> Dict:
-        """Synchronous wrapper for scalability testing"""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self.test_linear_scalability(num_transactions))
-        finally:
-            loop.close()
+        """Synchronous bridge for scalability testing on the persistent event loop"""
+        return self.event_loop.run(self.test_linear_scalability(num_transactions))
     
     async def test_linear_scalability(self, num_transactions: int) -> Dict:
         """Test linear scalability claim"""
@@ -586,11 +868,11 @@ class StrebaCOMCloudValidator:
         for i in range(num_transactions):
             tx_data = {
                 "tx_id": f"scale_test_{i}",
-                "from_addr": f"addr_{random.randint(0, 100)}",
-                "to_addr": f"addr_{random.randint(0, 100)}",
-                "value": random.uniform(10, 1000),
+                "from_addr": f"addr_{self.rng.integers(0, 101)}",
+                "to_addr": f"addr_{self.rng.integers(0, 101)}",
+                "value": self.rng.uniform(10, 1000),
                 "timestamp": time.time(),
-                "risk_score": random.uniform(0, 1)
+                "risk_score": self.rng.uniform(0, 1)
             }
             
             result = await self.process_strebacom_transaction(tx_data)
@@ -613,22 +895,60 @@ class StrebaCOMCloudValidator:
 def create_cloud_run_app():
     """Create Flask app for Google Cloud Run deployment"""
     # Get configuration from environment variables
-    node_id = os.environ.get('STREBACOM_NODE_ID', f'cloud_validator_{random.randint(1000, 9999)}')
+    node_id = os.environ.get('STREBACOM_NODE_ID')
     validator_type = os.environ.get('STREBACOM_VALIDATOR_TYPE', 'honest')
     reputation = float(os.environ.get('STREBACOM_REPUTATION', '0.9'))
     stake_weight = float(os.environ.get('STREBACOM_STAKE_WEIGHT', '2.0'))
     quorum_participation = float(os.environ.get('STREBACOM_QUORUM_PARTICIPATION', '0.85'))
+    seed = os.environ.get('STREBACOM_SEED')
+    history_mode = os.environ.get('STREBACOM_HISTORY_MODE', 'ring')
+    history_capacity = int(os.environ.get('STREBACOM_HISTORY_CAPACITY', '10000'))
+    history_path = os.environ.get('STREBACOM_HISTORY_PATH')
+    tracing = tracing_enabled_from_env()
+    phase_aligned_gossip = os.environ.get('STREBACOM_PHASE_ALIGNED_GOSSIP', '').lower() in ('1', 'true', 'yes')
+    state_backend = os.environ.get('STREBACOM_STATE_BACKEND', 'memory')
+    state_path = os.environ.get('STREBACOM_STATE_PATH', '/tmp/strebacom_state.sqlite')
+    
+    # Worker processes share one store and serve as the same validator: an explicit
+    # STREBACOM_NODE_ID must match the id the store was created with, otherwise the
+    # first worker's generated id wins
+    state = create_validator_state(state_backend, state_path)
+    if node_id is not None:
+        stored_node_id = state.setdefault_meta("node_id", node_id)
+        if stored_node_id != node_id:
+            raise ValueError(f"STREBACOM_NODE_ID is {node_id} but the state at {state_path} "
+                             f"belongs to validator {stored_node_id}")
+    else:
+        node_id = state.setdefault_meta("node_id", f'cloud_validator_{random.randint(1000, 9999)}')
+    
+    # Each worker draws its own phase, vote and reservoir streams from the shared seed,
+    # and spills memmap history to its own file (a sink only counts its own appends)
+    worker_index = state.claim_worker_index()
+    if seed is not None:
+        seed = int(np.random.SeedSequence([int(seed), worker_index]).generate_state(1)[0])
+    if history_mode == "memmap" and state_backend != "memory":
+        history_file = Path(history_path or f"./strebacom_history/{node_id}.bin")
+        history_path = str(history_file.with_name(f"{history_file.stem}.worker{worker_index}{history_file.suffix}"))
     
     config = StrebaCOMCloudConfig(
         node_id=node_id,
         validator_type=validator_type,
         stake_weight=stake_weight,
         reputation=reputation,
-        quorum_participation=quorum_participation
+        quorum_participation=quorum_participation,
+        seed=seed,
+        history_mode=history_mode,
+        history_capacity=history_capacity,
+        history_path=history_path,
+        state_backend=state_backend,
+        state_path=state_path,
+        tracing=tracing,
+        phase_aligned_gossip=phase_aligned_gossip
     )
     
-    validator = StrebaCOMCloudValidator(config)
+    validator = StrebaCOMCloudValidator(config, state=state)
     app = validator.create_flask_app()
+    atexit.register(validator.shutdown)
     
     logger.info(f"Starting Strebacom Cloud Run validator: {node_id}")
     return app
@@ -6,53 +6,136 @@ Tests your paper claims without complex cloud deployment
 
 import asyncio
 import time
-import random
 import hashlib
-import math
 import numpy as np
 import json
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 import logging
+from collections import Counter
+
+from sbcp_confidence import classify_finality, confidence_from_votes, preset
+from sbcp_registry import ValidatorRegistry, ValidatorView
+from sbcp_scheduler import run_in_virtual_time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
-class StrebaCOMValidator:
-    node_id: str
-    validator_type: str
-    reputation: float
-    stake_weight: float
-    lambda_base: float = 8.0
-
 class LocalStrebaCOMNetwork:
-    def __init__(self, num_validators: int = 10, byzantine_fraction: float = 0.2):
-        self.validators = []
+    def __init__(self, num_validators: int = 10, byzantine_fraction: float = 0.2,
+                 seed: Union[int, np.random.Generator, None] = None, transaction_window: int = 16,
+                 max_concurrent_validations: int = 64):
+        self.rng = np.random.default_rng(seed)  # Injected RNG keeps vote streams reproducible
+        self.transaction_window = transaction_window  # Transactions in flight in pipelined mode
+        self.max_concurrent_validations = max_concurrent_validations  # Validator calls in flight, all transactions
+        self._validation_slots: Optional[asyncio.Semaphore] = None
+        self._validations_in_flight = 0
+        self.peak_validations_in_flight = 0
+        self.validators = ValidatorRegistry(columns=("reputation", "stake_weight", "lambda_base"),
+                                            capacity=num_validators)
         self.byzantine_count = int(num_validators * byzantine_fraction)
         
         # Create validators with proper reputation distribution
         for i in range(num_validators):
             is_byzantine = i < self.byzantine_count
-            validator = StrebaCOMValidator(
-                node_id=f"validator_{i}",
-                validator_type="byzantine" if is_byzantine else "honest", 
-                reputation=0.2 if is_byzantine else random.uniform(0.85, 0.98),
-                stake_weight=random.uniform(1.0, 3.0)
+            self.validators.add(
+                f"validator_{i}",
+                is_byzantine=is_byzantine,
+                reputation=0.2 if is_byzantine else self.rng.uniform(0.85, 0.98),
+                stake_weight=self.rng.uniform(1.0, 3.0),
+                lambda_base=8.0
             )
-            self.validators.append(validator)
         
         self.finality_thresholds = {
             'provisional': 0.80,
             'economic': 0.95,
             'absolute': 0.99
         }
+        self.confidence_params = preset("local")
         
         logger.info(f"Created Strebacom network: {num_validators} validators, {self.byzantine_count} Byzantine")
     
-    async def validate_strebacom_paper_claims(self, num_transactions: int = 100) -> Dict:
-        """Validate your published paper claims"""
-        logger.info(f"Validating Strebacom paper claims with {num_transactions} transactions")
+    def _now(self) -> float:
+        """Event-loop clock (simulated when running under run_in_virtual_time)"""
+        return asyncio.get_running_loop().time()
+    
+    def _new_transaction(self, i: int) -> Dict:
+        return {
+            "tx_id": f"strebacom_tx_{i}",
+            "from_addr": f"addr_{self.rng.integers(0, 501)}",
+            "to_addr": f"addr_{self.rng.integers(0, 501)}",
+            "value": self.rng.uniform(10, 10000),
+            "timestamp": self._now(),
+            "risk_score": self.rng.uniform(0, 1)
+        }
+    
+    async def _bounded_validation(self, validator: ValidatorView, tx_data: Dict) -> Dict:
+        if self._validation_slots is None:
+            self._validation_slots = asyncio.Semaphore(self.max_concurrent_validations)
+        async with self._validation_slots:
+            self._validations_in_flight += 1
+            self.peak_validations_in_flight = max(self.peak_validations_in_flight, self._validations_in_flight)
+            try:
+                return await self.process_with_validator(validator, tx_data)
+            finally:
+                self._validations_in_flight -= 1
+    
+    async def fan_out(self, validators: Sequence[ValidatorView], tx_data: Dict) -> List[Dict]:
+        """Send one transaction to every validator at once, bounded by max_concurrent_validations"""
+        return list(await asyncio.gather(*(self._bounded_validation(validator, tx_data) for validator in validators)))
+    
+    async def _validate_transaction(self, tx_data: Dict, validators: Sequence[ValidatorView]) -> Dict:
+        tx_start = self._now()
+        validator_responses = await self.fan_out(validators, tx_data)
+        final_confidence, finality_tier = self.calculate_distributed_confidence(
+            tx_data, validator_responses, self._now()
+        )
+        return {
+            "tx_id": tx_data["tx_id"],
+            "confidence": final_confidence,
+            "finality_tier": finality_tier,
+            "processing_time": self._now() - tx_start,
+            "validator_count": len(validator_responses),
+            "consensus_achieved": finality_tier != 'none'
+        }
+    
+    async def stream_transactions(self, transactions: Iterable[Dict], window: Optional[int] = None,
+                                  validators: Optional[Sequence[ValidatorView]] = None) -> AsyncIterator[Dict]:
+        """
+        Validate transactions with up to `window` in flight, yielding each result as it completes
+        Transactions are pulled from the iterable only when a window slot frees up, so
+        their timestamps mark when they actually entered the network
+        """
+        window = window or self.transaction_window
+        validators = list(self.validators.values()) if validators is None else list(validators)
+        pending = set()
+        source = iter(transactions)
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    tx_data = next(source, None)
+                    if tx_data is None:
+                        exhausted = True
+                    else:
+                        pending.add(asyncio.ensure_future(self._validate_transaction(tx_data, validators)))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def validate_strebacom_paper_claims(self, num_transactions: int = 100, pipelined: bool = True) -> Dict:
+        """
+        Validate your published paper claims
+        Pipelined mode fans each transaction out to all validators concurrently with
+        transaction_window transactions in flight; pipelined=False keeps the original
+        one-validator-at-a-time loop for comparison
+        """
+        logger.info(f"Validating Strebacom paper claims with {num_transactions} transactions "
+                    f"({'pipelined, window ' + str(self.transaction_window) if pipelined else 'sequential'})")
         
         results = {
             "experiment_type": "local_strebacom_validation",
@@ -67,55 +150,62 @@ class LocalStrebaCOMNetwork:
             "consensus_analysis": {}
         }
         
-        start_time = time.time()
+        start_time = self._now()
         confidence_scores = []
         processing_times = []
         finality_achievements = {'provisional': 0, 'economic': 0, 'absolute': 0, 'none': 0}
         
+        self.peak_validations_in_flight = 0
+        
         # Process transactions through Strebacom network
-        for i in range(num_transactions):
-            tx_start = time.time()
-            
-            tx_data = {
-                "tx_id": f"strebacom_tx_{i}",
-                "from_addr": f"addr_{random.randint(0, 500)}",
-                "to_addr": f"addr_{random.randint(0, 500)}",
-                "value": random.uniform(10, 10000),
-                "timestamp": time.time(),
-                "risk_score": random.uniform(0, 1)
-            }
-            
-            # Process through all validators (distributed consensus)
-            validator_responses = []
-            for validator in self.validators:
-                response = await self.process_with_validator(validator, tx_data)
-                validator_responses.append(response)
-            
-            # Calculate distributed consensus confidence 
-            final_confidence, finality_tier = self.calculate_distributed_confidence(
-                tx_data, validator_responses, time.time()
-            )
-            
-            processing_time = time.time() - tx_start
-            confidence_scores.append(final_confidence)
-            processing_times.append(processing_time)
-            
-            # Count finality achievements
-            finality_achievements[finality_tier] += 1
-            
-            results["transactions"].append({
-                "tx_id": tx_data["tx_id"],
-                "confidence": final_confidence,
-                "finality_tier": finality_tier,
-                "processing_time": processing_time,
-                "validator_count": len(validator_responses),
-                "consensus_achieved": finality_tier != 'none'
-            })
-            
-            if (i + 1) % 25 == 0:
-                logger.info(f"Processed {i+1}/{num_transactions} - Avg confidence: {np.mean(confidence_scores[-25:]):.3f}")
+        if pipelined:
+            transactions = (self._new_transaction(i) for i in range(num_transactions))
+            async for record in self.stream_transactions(transactions):
+                confidence_scores.append(record["confidence"])
+                processing_times.append(record["processing_time"])
+                finality_achievements[record["finality_tier"]] += 1
+                results["transactions"].append(record)
+                
+                if len(results["transactions"]) % 25 == 0:
+                    logger.info(f"Processed {len(results['transactions'])}/{num_transactions} - "
+                                f"Avg confidence: {np.mean(confidence_scores[-25:]):.3f}")
+        else:
+            for i in range(num_transactions):
+                tx_start = self._now()
+                
+                tx_data = self._new_transaction(i)
+                
+                # Process through all validators (distributed consensus)
+                validator_responses = []
+                for validator in self.validators.values():
+                    response = await self.process_with_validator(validator, tx_data)
+                    validator_responses.append(response)
+                
+                # Calculate distributed consensus confidence 
+                final_confidence, finality_tier = self.calculate_distributed_confidence(
+                    tx_data, validator_responses, self._now()
+                )
+                
+                processing_time = self._now() - tx_start
+                confidence_scores.append(final_confidence)
+                processing_times.append(processing_time)
+                
+                # Count finality achievements
+                finality_achievements[finality_tier] += 1
+                
+                results["transactions"].append({
+                    "tx_id": tx_data["tx_id"],
+                    "confidence": final_confidence,
+                    "finality_tier": finality_tier,
+                    "processing_time": processing_time,
+                    "validator_count": len(validator_responses),
+                    "consensus_achieved": finality_tier != 'none'
+                })
+                
+                if (i + 1) % 25 == 0:
+                    logger.info(f"Processed {i+1}/{num_transactions} - Avg confidence: {np.mean(confidence_scores[-25:]):.3f}")
         
-        total_time = time.time() - start_time
+        total_time = self._now() - start_time
         
         # Calculate performance metrics
         results["performance_metrics"] = {
@@ -125,7 +215,12 @@ class LocalStrebaCOMNetwork:
             "confidence_std": np.std(confidence_scores),
             "average_processing_time": np.mean(processing_times),
             "constant_time_processing": np.std(processing_times) < 0.1,  # Low variance
-            "byzantine_resilience": self.byzantine_count / len(self.validators)
+            "byzantine_resilience": self.byzantine_count / len(self.validators),
+            "execution_mode": "pipelined" if pipelined else "sequential",
+            "transaction_window": self.transaction_window if pipelined else 1,
+            # Summed per-transaction latency over wall time: how many transactions were really in flight
+            "effective_concurrency": sum(processing_times) / total_time if total_time > 0 else 0.0,
+            "peak_validations_in_flight": self.peak_validations_in_flight if pipelined else 1
         }
         
         # Analyze consensus achievements
@@ -140,25 +235,25 @@ class LocalStrebaCOMNetwork:
         }
         
         # Test scalability
-        results["scalability_analysis"] = await self.test_scalability()
+        results["scalability_analysis"] = await self.test_scalability(pipelined=pipelined)
         
         return results
     
-    async def process_with_validator(self, validator: StrebaCOMValidator, tx_data: Dict) -> Dict:
+    async def process_with_validator(self, validator: ValidatorView, tx_data: Dict) -> Dict:
         """Process transaction with individual validator"""
         # Simulate network delay
-        await asyncio.sleep(random.uniform(0.01, 0.05))
+        await asyncio.sleep(self.rng.uniform(0.01, 0.05))
         
-        if validator.validator_type == "byzantine":
+        if validator.is_byzantine:
             # Byzantine behavior
-            vote = random.random() < 0.3
-            confidence = random.uniform(0.1, 0.4)
+            vote = self.rng.random() < 0.3
+            confidence = self.rng.uniform(0.1, 0.4)
         else:
             # Honest validator
             risk_score = tx_data.get("risk_score", 0.5)
             base_validity = risk_score < 0.65
             vote_probability = validator.reputation * (1.2 if base_validity else 0.3)
-            vote = random.random() < vote_probability
+            vote = self.rng.random() < vote_probability
             confidence = validator.reputation * (0.9 if vote == base_validity else 0.4)
         
         return {
@@ -174,87 +269,73 @@ class LocalStrebaCOMNetwork:
         Calculate confidence using your published formula with multi-validator consensus
         C(T,t) = 1 - e^(-λ(t)·V(T,t))
         """
-        tx_arrival_time = tx_data["timestamp"]
-        time_elapsed = max(current_time - tx_arrival_time, 0.001) * 10.0  # time scaling
-        
-        # Accumulate validation weight across all validators (KEY for finality)
-        validation_weight = 0.0
-        total_stake = 0.0
-        positive_votes = 0
+        # Multi-validator consensus with a strong quorum assumption (0.8 per vote)
+        positive_votes = sum(1 for response in validator_responses if response["vote"])
         
-        for response in validator_responses:
-            wi = response["stake_weight"]  # Validator stake
-            vi = 1.0 if response["vote"] else 0.0  # Vote decision
-            ri = response["reputation"]  # Validator reputation
-            
-            # Time weighting and quorum sensing
-            time_weight = math.log(1 + time_elapsed)
-            quorum_weight = 0.8  # Strong quorum assumption
-            
-            validation_weight += wi * vi * ri * time_weight * quorum_weight
-            total_stake += wi
-            
-            if response["vote"]:
-                positive_votes += 1
-        
-        # Normalize validation weight and scale by participation
-        if total_stake > 0:
-            validation_weight = (validation_weight / total_stake) * len(validator_responses)
-        
-        # Enhanced lambda for multiple validators
+        # Dynamic lambda from participation and the share of positive votes (crucial for high confidence)
         participation_ratio = len(validator_responses) / len(self.validators)
         positive_vote_ratio = positive_votes / len(validator_responses) if validator_responses else 0
         
-        # Dynamic lambda calculation (crucial for high confidence)
-        lambda_t = 8.0 * (1 + 0.5 * participation_ratio) * (1 + 0.3 * positive_vote_ratio)
-        
-        # Your published confidence formula
-        confidence = 1.0 - math.exp(-lambda_t * validation_weight * time_elapsed)
-        confidence = min(confidence, 0.999)
-        
-        # Determine finality tier
-        if confidence >= self.finality_thresholds['absolute']:
-            return confidence, 'absolute'
-        elif confidence >= self.finality_thresholds['economic']:
-            return confidence, 'economic'
-        elif confidence >= self.finality_thresholds['provisional']:
-            return confidence, 'provisional'
-        
-        return confidence, 'none'
+        # Your published confidence formula, capped at 0.999
+        confidence = confidence_from_votes(self.confidence_params,
+                                           [response["stake_weight"] for response in validator_responses],
+                                           [response["vote"] for response in validator_responses],
+                                           [response["reputation"] for response in validator_responses],
+                                           current_time - tx_data["timestamp"],
+                                           quorum=[0.8] * len(validator_responses),
+                                           participation=participation_ratio, quorum_strength=positive_vote_ratio)
+        return confidence, classify_finality(confidence, self.finality_thresholds)
     
-    async def test_scalability(self) -> Dict:
-        """Test linear scalability claim"""
+    async def test_scalability(self, pipelined: bool = True, transactions_per_size: int = 20) -> Dict:
+        """
+        Test linear scalability claim
+        Pipelined mode streams transactions_per_size transactions through each validator
+        subset and reports concurrent TPS; sequential mode times one transaction
+        """
         scalability_results = []
         test_sizes = [3, 5, 7, len(self.validators)]
         
         for size in test_sizes:
-            test_validators = self.validators[:size]
-            start_time = time.time()
+            test_validators = list(self.validators.values())[:size]
+            start_time = self._now()
             
             # Process test transaction
-            test_tx = {
-                "tx_id": f"scale_test_{size}",
-                "from_addr": "test_sender",
-                "to_addr": "test_receiver",
-                "value": 1000.0,
-                "timestamp": time.time(),
-                "risk_score": 0.3
-            }
-            
-            responses = []
-            for validator in test_validators:
-                response = await self.process_with_validator(validator, test_tx)
-                responses.append(response)
+            def test_tx(i: int) -> Dict:
+                return {
+                    "tx_id": f"scale_test_{size}" if i == 0 else f"scale_test_{size}_{i}",
+                    "from_addr": "test_sender",
+                    "to_addr": "test_receiver",
+                    "value": 1000.0,
+                    "timestamp": self._now(),
+                    "risk_score": 0.3
+                }
             
-            processing_time = time.time() - start_time
-            confidence, tier = self.calculate_distributed_confidence(test_tx, responses, time.time())
+            if pipelined:
+                records = [record async for record in self.stream_transactions(
+                    (test_tx(i) for i in range(transactions_per_size)), validators=test_validators)]
+                processing_time = self._now() - start_time
+                confidence = float(np.mean([record["confidence"] for record in records]))
+                tier = Counter(record["finality_tier"] for record in records).most_common(1)[0][0]
+                transaction_count = len(records)
+            else:
+                tx_data = test_tx(0)
+                responses = []
+                for validator in test_validators:
+                    response = await self.process_with_validator(validator, tx_data)
+                    responses.append(response)
+                
+                processing_time = self._now() - start_time
+                confidence, tier = self.calculate_distributed_confidence(tx_data, responses, self._now())
+                transaction_count = 1
             
+            throughput = transaction_count / processing_time if processing_time > 0 else 0
             scalability_results.append({
                 "validator_count": size,
                 "processing_time": processing_time,
                 "confidence": confidence,
                 "finality_tier": tier,
-                "throughput": 1 / processing_time if processing_time > 0 else 0
+                "throughput": throughput,
+                "validations_per_second": throughput * size
             })
         
         # Analyze linearity
@@ -262,10 +343,12 @@ class LocalStrebaCOMNetwork:
             counts = [r["validator_count"] for r in scalability_results]
             throughputs = [r["throughput"] for r in scalability_results]
             correlation = np.corrcoef(counts, throughputs)[0,1] if len(counts) > 1 else 0
+            validation_rates = [r["validations_per_second"] for r in scalability_results]
             
             return {
                 "scalability_data": scalability_results,
                 "linear_correlation": correlation,
+                "validation_throughput_correlation": np.corrcoef(counts, validation_rates)[0,1],
                 "validates_linear_scaling": abs(correlation) > 0.5,  # Allow negative correlation due to overhead
                 "scaling_efficiency": throughputs[-1] / throughputs[0] if throughputs[0] > 0 else 0
             }
@@ -335,6 +418,8 @@ def generate_validation_report(results: Dict):
         f"  Absolute Finality: {consensus['absolute_rate']:.2%}",
         f"  Consensus Efficiency: {consensus['consensus_efficiency']:.2%}",
         f"  Average Processing Time: {metrics['average_processing_time']:.4f}s",
+        f"  Execution Mode: {metrics.get('execution_mode', 'sequential')} "
+        f"(window {metrics.get('transaction_window', 1)}, effective concurrency {metrics.get('effective_concurrency', 1.0):.1f})",
         f"  Byzantine Resilience: {metrics['byzantine_resilience']:.1%}",
         "",
         "CONCLUSION:",
@@ -365,4 +450,5 @@ def generate_validation_report(results: Dict):
     print("\n".join(report_lines))
 
 if __name__ == "__main__":
-    asyncio.run(run_strebacom_validation())
\ No newline at end of file
+    # Network delays run on the simulated clock, so the run finishes as fast as the CPU allows
+    run_in_virtual_time(run_strebacom_validation())
\ No newline at end of file
@@ -10,13 +10,15 @@ import time
 import json
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import Dict, List, Any, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Union
 import logging
 import hashlib
 import math
 from dataclasses import dataclass
 from pathlib import Path
-import random
+
+from sbcp_confidence import classify_finality, confidence_from_votes, preset
+from sbcp_kuramoto import KuramotoNetwork
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,14 +40,16 @@ class StrebaCOMDistributedValidator:
     Based on your paper's theoretical framework
     """
     
-    def __init__(self, config: StrebaCOMValidatorConfig):
+    def __init__(self, config: StrebaCOMValidatorConfig, seed: Union[int, np.random.Generator, None] = None):
         self.config = config
         self.node_id = config.node_id
         self.is_byzantine = config.validator_type == "byzantine"
+        self.rng = np.random.default_rng(seed)  # Injected RNG keeps phases, votes and delays reproducible
         
         # Core Strebacom parameters from your paper
         self.lambda_base = config.lambda_base
         self.time_scaling_factor = 10.0  # From your working simulation
+        self.confidence_params = preset("enhanced", lambda_base=self.lambda_base, time_scale=self.time_scaling_factor)
         
         # Multi-tier finality thresholds from your paper
         self.finality_thresholds = {
@@ -70,8 +74,10 @@ class StrebaCOMDistributedValidator:
         }
         
         # Kuramoto synchronization state (from your paper)
-        self.phase = random.uniform(0, 2 * math.pi)
-        self.natural_frequency = random.uniform(0.95, 1.05)
+        self.phase = self.rng.uniform(0, 2 * math.pi)
+        self.natural_frequency = self.rng.uniform(0.95, 1.05)
+        self.phase_network: Optional[KuramotoNetwork] = None  # Set when coupled into a StrebaCOMCloudNetwork
+        self.phase_index = 0
         
     async def process_strebacom_transaction(self, tx_data: Dict) -> Dict:
         """
@@ -88,11 +94,15 @@ class StrebaCOMDistributedValidator:
             "processing_start": start_time
         }
         
+        # Split this transaction's stream off before the first await, so transactions the
+        # validator handles concurrently draw in admission order rather than wake-up order
+        tx_rng = np.random.default_rng(int(self.rng.integers(0, 2**32)))
+        
         # Simulate validator decision based on your model
-        vote, vote_confidence = await self.simulate_strebacom_validation(tx_data)
+        vote, vote_confidence = await self.simulate_strebacom_validation(tx_data, tx_rng)
         
         # Generate quorum signal (from your quorum-sensing mechanism)
-        quorum_signal = self.generate_quorum_signal(tx_id, vote_confidence)
+        quorum_signal = self.generate_quorum_signal(tx_id, vote_confidence, tx_rng)
         self.quorum_signals[tx_id] = {self.node_id: quorum_signal}
         
         # Calculate confidence using your published formula: C(T,t) = 1 - e^(-λ(t)·V(T,t))
@@ -124,82 +134,65 @@ class StrebaCOMDistributedValidator:
             "consensus_type": "strebacom_continuous"
         }
     
-    async def simulate_strebacom_validation(self, tx_data: Dict) -> tuple:
+    async def simulate_strebacom_validation(self, tx_data: Dict, rng: Optional[np.random.Generator] = None) -> tuple:
         """Simulate validation decision based on your Byzantine model"""
+        rng = self.rng if rng is None else rng
         # Simulate processing delay (constant-time processing claim)
-        await asyncio.sleep(random.uniform(0.01, 0.03))  # Realistic network delays
+        await asyncio.sleep(rng.uniform(0.01, 0.03))  # Realistic network delays
         
         if self.is_byzantine:
             # Byzantine behavior from your model
-            vote = random.random() < 0.3
-            confidence = random.uniform(0.1, 0.4)
+            vote = bool(rng.random() < 0.3)
+            confidence = rng.uniform(0.1, 0.4)
         else:
             # Honest validator behavior
             base_validity = tx_data.get("risk_score", 0.5) < 0.65
             vote_probability = self.config.reputation * (1.2 if base_validity else 0.3)
-            vote = random.random() < vote_probability
+            vote = bool(rng.random() < vote_probability)
             confidence = self.config.reputation * (0.9 if vote == base_validity else 0.4)
         
         return vote, confidence
     
-    def generate_quorum_signal(self, tx_id: str, confidence: float) -> float:
+    def generate_quorum_signal(self, tx_id: str, confidence: float, rng: Optional[np.random.Generator] = None) -> float:
         """Generate quorum sensing signal from your paper"""
+        rng = self.rng if rng is None else rng
         signal_strength = self.config.quorum_participation * confidence
         
         if self.is_byzantine:
             # Byzantine nodes send weak/inconsistent signals
-            signal_strength *= random.uniform(0.1, 0.6)
+            signal_strength *= rng.uniform(0.1, 0.6)
         
         return signal_strength
     
-    def calculate_strebacom_confidence(self, tx_id: str, current_time: float) -> tuple:
+    def calculate_strebacom_confidence(self, tx_id: str, current_time: float,
+                                      validator_responses: Optional[List[Dict]] = None) -> tuple:
         """
         Calculate confidence using your published formula: C(T,t) = 1 - e^(-λ(t)·V(T,t))
+        With validator_responses the weight V(T,t) accumulates every validator's vote
+        (stake, reputation and quorum strength) instead of this validator's alone
         """
         if tx_id not in self.active_transactions:
             return 0.0, 'none'
         
         tx = self.active_transactions[tx_id]
-        time_elapsed = max(current_time - tx["arrival_time"], 0.001) * self.time_scaling_factor
-        
-        # Validation weight V(T,t) from your model
-        validation_weight = 0.0
-        total_stake = 0.0
-        
-        # For single validator, use self-validation + simulated network effect
-        wi = self.config.stake_weight
-        vi = 1.0  # Assuming validation passed
-        ri = self.config.reputation
-        
-        # Time weighting and quorum sensing from your model
-        time_weight = math.log(1 + time_elapsed)
         quorum_weight = self.quorum_signals.get(tx_id, {}).get(self.node_id, 0.5)
         
-        validation_weight = wi * vi * ri * time_weight * quorum_weight
-        total_stake = wi
-        
-        # Normalize
-        if total_stake > 0:
-            validation_weight = validation_weight / total_stake
+        if validator_responses:
+            stakes = [response["stake_weight"] for response in validator_responses]
+            votes = [response["vote"] for response in validator_responses]
+            reputations = [response["reputation"] for response in validator_responses]
+            quorum = [response.get("quorum_strength", quorum_weight) for response in validator_responses]
+            quorum_weight = float(np.mean(quorum))
+        else:
+            # For single validator, use self-validation + simulated network effect
+            stakes, votes, reputations, quorum = [self.config.stake_weight], [True], [self.config.reputation], [quorum_weight]
         
-        # Dynamic lambda from your model
+        # Time and quorum weighted V(T,t), normalized by stake and scaled by the number of votes
         participation_ratio = 1.0  # Single validator for now
-        lambda_t = self.lambda_base * (1 + 0.3 * participation_ratio) * (1 + 0.2 * quorum_weight)
-        
-        # Your published confidence formula
-        confidence = 1.0 - math.exp(-lambda_t * validation_weight * time_elapsed)
-        confidence = min(confidence, 0.999)
-        
-        # Determine finality tier
-        finality_tier = 'none'
-        if confidence >= self.finality_thresholds['absolute']:
-            finality_tier = 'absolute'
-        elif confidence >= self.finality_thresholds['economic']:
-            finality_tier = 'economic'
-        elif confidence >= self.finality_thresholds['provisional']:
-            finality_tier = 'provisional'
-        
-        return confidence, finality_tier
+        confidence = confidence_from_votes(self.confidence_params, stakes, votes, reputations,
+                                           current_time - tx["arrival_time"], quorum=quorum,
+                                           participation=participation_ratio, quorum_strength=quorum_weight)
+        return confidence, classify_finality(confidence, self.finality_thresholds)
     
     def update_rolling_hash_continuous(self, tx_data: Dict, confidence: float):
         """Update rolling hash continuously (not in blocks)"""
@@ -208,20 +201,41 @@ class StrebaCOMDistributedValidator:
     
     def update_kuramoto_phase(self):
         """Update Kuramoto synchronization phase from your paper"""
-        # Simplified single-node Kuramoto update
+        if self.phase_network is not None:
+            # Coupled phase, integrated for all validators at once by the network
+            self.phase = float(self.phase_network.phases[self.phase_index])
+            return
+        
+        # Uncoupled drift for a standalone validator
         dt = 0.01
-        coupling_strength = 1.5
         self.phase += self.natural_frequency * dt
         self.phase = self.phase % (2 * math.pi)
 
+def summarize_delays(delays: List[float]) -> Dict[str, float]:
+    """Mean, p50, p99 and max of a list of delays in seconds"""
+    if not delays:
+        return {"mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "mean": float(np.mean(delays)),
+        "p50": float(np.percentile(delays, 50)),
+        "p99": float(np.percentile(delays, 99)),
+        "max": float(np.max(delays))
+    }
+
 class StrebaCOMCloudNetwork:
     """
     Cloud-based Strebacom network for validating your published claims
+    Transactions flow through a sliding window: up to transaction_window of them are
+    being validated at once, and a bounded admission queue holds submitters back
+    (backpressure) when all window slots are busy
     """
     
-    def __init__(self, num_validators: int = 10, byzantine_fraction: float = 0.2):
+    def __init__(self, num_validators: int = 10, byzantine_fraction: float = 0.2, transaction_window: int = 16,
+                 seed: Union[int, np.random.Generator, None] = None):
         self.validators = []
+        self.rng = np.random.default_rng(seed)  # Injected RNG keeps validators, transactions and arrivals reproducible
         self.num_validators = num_validators
+        self.transaction_window = transaction_window
         self.byzantine_count = int(num_validators * byzantine_fraction)
         
         # Create validator configurations based on your model
@@ -230,22 +244,137 @@ class StrebaCOMCloudNetwork:
             config = StrebaCOMValidatorConfig(
                 node_id=f"strebacom_validator_{i}",
                 validator_type="byzantine" if is_byzantine else "honest",
-                stake_weight=random.uniform(1.0, 3.0),
-                reputation=0.2 if is_byzantine else random.uniform(0.85, 0.98),
-                quorum_participation=0.1 if is_byzantine else random.uniform(0.8, 0.95),
-                processing_capacity=random.uniform(10, 50),
+                stake_weight=self.rng.uniform(1.0, 3.0),
+                reputation=0.2 if is_byzantine else self.rng.uniform(0.85, 0.98),
+                quorum_participation=0.1 if is_byzantine else self.rng.uniform(0.8, 0.95),
+                processing_capacity=self.rng.uniform(10, 50),
                 lambda_base=8.0
             )
-            validator = StrebaCOMDistributedValidator(config)
+            # Each validator draws from its own stream, so concurrent validation stays reproducible
+            validator = StrebaCOMDistributedValidator(config, seed=int(self.rng.integers(0, 2**32)))
             self.validators.append(validator)
         
+        # Kuramoto coupling across all validators (K = 1.5), integrated with vectorized RK4
+        self.phase_network = KuramotoNetwork(
+            [validator.natural_frequency for validator in self.validators],
+            coupling_strength=1.5,
+            phases=[validator.phase for validator in self.validators]
+        )
+        for index, validator in enumerate(self.validators):
+            validator.phase_network = self.phase_network
+            validator.phase_index = index
+        self.phase_dt = 0.01
+        self.phase_steps_per_round = 10  # Model time advanced per transaction round = 0.1
+        
         logger.info(f"Created Strebacom network: {num_validators} validators, {self.byzantine_count} Byzantine")
     
-    async def validate_strebacom_claims(self, num_transactions: int = 100) -> Dict:
+    def advance_phase_sync(self) -> float:
+        """Integrate the coupled validator phases by one transaction round; returns r(t)"""
+        for _ in range(self.phase_steps_per_round):
+            order_parameter = self.phase_network.step(self.phase_dt)
+        return order_parameter
+    
+    def new_transaction(self, i: int) -> Dict:
+        return {
+            "tx_id": f"strebacom_tx_{i}",
+            "from_addr": f"addr_{self.rng.integers(0, 101)}",
+            "to_addr": f"addr_{self.rng.integers(0, 101)}",
+            "value": self.rng.uniform(10, 10000),
+            "timestamp": time.time(),
+            "risk_score": self.rng.uniform(0, 1),
+            "complexity_class": int(self.rng.integers(1, 4))
+        }
+    
+    async def stream_transactions(self, transactions: Iterable[Dict],
+                                  validators: Optional[List[StrebaCOMDistributedValidator]] = None,
+                                  window: Optional[int] = None, arrival_rate: Optional[float] = None,
+                                  on_admit: Optional[Callable[[Dict], None]] = None) -> AsyncIterator[Dict]:
+        """
+        Validate transactions through a window of `window` workers, yielding each result as it completes
+        Every validator sees an admitted transaction at once. Submissions wait in a queue
+        of the same size, so at most 2·window transactions are outstanding. With
+        arrival_rate, submissions follow a Poisson schedule and queueing delay is taken
+        from the scheduled arrival; otherwise the whole backlog is offered at once and
+        queueing delay is taken from the start of the run.
+        Each result separates queueing delay (submitted → admitted) from validation
+        delay (admitted → all validators answered). If the transaction source or
+        on_admit raises, the exception is re-raised here and the remaining work cancelled.
+        """
+        window = window or self.transaction_window
+        validators = self.validators if validators is None else validators
+        admission: asyncio.Queue = asyncio.Queue(maxsize=window)
+        completed: asyncio.Queue = asyncio.Queue()
+        
+        # A failing submitter or worker puts its exception on the completed queue, so the
+        # consumer never waits on sentinels that will not come
+        async def submit():
+            run_start = next_arrival = time.time()
+            try:
+                for tx_data in transactions:
+                    if arrival_rate:
+                        next_arrival += self.rng.exponential(1.0 / arrival_rate)
+                        delay = next_arrival - time.time()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        submitted_at = next_arrival
+                    else:
+                        submitted_at = run_start  # Offered with the rest of the backlog
+                    await admission.put((tx_data, submitted_at))  # Blocks while the window is full
+            except Exception as error:
+                await completed.put(error)
+                return
+            for _ in range(window):
+                await admission.put(None)
+        
+        async def validate_worker():
+            try:
+                while True:
+                    item = await admission.get()
+                    if item is None:
+                        break
+                    tx_data, submitted_at = item
+                    admitted_at = time.time()
+                    if on_admit is not None:
+                        on_admit(tx_data)
+                    responses = await asyncio.gather(*(validator.process_strebacom_transaction(tx_data)
+                                                       for validator in validators), return_exceptions=True)
+                    completed_at = time.time()
+                    await completed.put({
+                        "tx_data": tx_data,
+                        "responses": responses,
+                        "queueing_delay": admitted_at - submitted_at,
+                        "validation_delay": completed_at - admitted_at,
+                        "completed_at": completed_at
+                    })
+            except Exception as error:
+                await completed.put(error)
+            else:
+                await completed.put(None)
+        
+        tasks = [asyncio.ensure_future(submit())] + [asyncio.ensure_future(validate_worker()) for _ in range(window)]
+        try:
+            finished_workers = 0
+            while finished_workers < window:
+                record = await completed.get()
+                if record is None:
+                    finished_workers += 1
+                elif isinstance(record, Exception):
+                    raise record
+                else:
+                    yield record
+            await tasks[0]
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def validate_strebacom_claims(self, num_transactions: int = 100, window: Optional[int] = None,
+                                        arrival_rate: Optional[float] = None) -> Dict:
         """
         Validate the key claims from your published paper
+        Transactions run through stream_transactions; window=1 validates them one at a time
         """
-        logger.info(f"Validating Strebacom claims with {num_transactions} transactions")
+        window = window or self.transaction_window
+        logger.info(f"Validating Strebacom claims with {num_transactions} transactions (window {window})")
         
         results = {
             "experiment_type": "strebacom_validation",
@@ -267,37 +396,33 @@ class StrebaCOMCloudNetwork:
         total_processing_time = 0
         confidence_scores = []
         finality_achievements = {'provisional': 0, 'economic': 0, 'absolute': 0}
-        
-        # Test continuous validation (no blocks)
-        for i in range(num_transactions):
-            tx_data = {
-                "tx_id": f"strebacom_tx_{i}",
-                "from_addr": f"addr_{random.randint(0, 100)}",
-                "to_addr": f"addr_{random.randint(0, 100)}",
-                "value": random.uniform(10, 10000),
-                "timestamp": time.time(),
-                "risk_score": random.uniform(0, 1),
-                "complexity_class": random.choice([1, 2, 3])
-            }
-            
-            # Process with multiple validators simultaneously (distributed)
-            validator_results = []
-            tasks = []
-            
-            for validator in self.validators:
-                task = validator.process_strebacom_transaction(tx_data)
-                tasks.append(task)
-            
-            # Execute distributed processing
-            validator_responses = await asyncio.gather(*tasks, return_exceptions=True)
+        processing_times = []
+        phase_times = [self.phase_network.time]
+        order_parameters = [self.phase_network.order_parameter()]
+        queueing_delays = []
+        validation_delays = []
+        
+        def couple_phases(tx_data: Dict):
+            # Couple validator phases before they process the round
+            order_parameters.append(self.advance_phase_sync())
+            phase_times.append(self.phase_network.time)
+        
+        # Test continuous validation (no blocks), with every validator processing each admitted transaction
+        transactions = (self.new_transaction(i) for i in range(num_transactions))
+        async for record in self.stream_transactions(transactions, window=window, arrival_rate=arrival_rate,
+                                                     on_admit=couple_phases):
+            tx_data = record["tx_data"]
+            validator_responses = record["responses"]
+            queueing_delays.append(record["queueing_delay"])
+            validation_delays.append(record["validation_delay"])
             
             # Analyze results and calculate multi-validator consensus
             successful_validations = []
             for response in validator_responses:
                 if not isinstance(response, Exception):
                     # Add validator metadata for confidence calculation
-                    response["stake_weight"] = random.uniform(1.0, 3.0)
-                    response["reputation"] = 0.2 if "byzantine" in response.get("validator_id", "") else random.uniform(0.85, 0.98)
+                    response["stake_weight"] = self.rng.uniform(1.0, 3.0)
+                    response["reputation"] = 0.2 if "byzantine" in response.get("validator_id", "") else self.rng.uniform(0.85, 0.98)
                     successful_validations.append(response)
                     confidence_scores.append(response["confidence"])
                     total_processing_time += response["processing_time"]
@@ -316,17 +441,21 @@ class StrebaCOMCloudNetwork:
             else:
                 final_confidence, final_finality_tier = 0.0, 'none'
             
+            processing_times.extend(response["processing_time"] for response in successful_validations)
             results["transactions"].append({
                 "tx_id": tx_data["tx_id"],
                 "validator_responses": len(successful_validations),
+                "finality_tier": final_finality_tier,
+                "queueing_delay": record["queueing_delay"],
+                "validation_delay": record["validation_delay"],
                 "avg_confidence": np.mean([r["confidence"] for r in successful_validations]) if successful_validations else 0,
                 "consensus_achieved": len(successful_validations) > 0,
                 "finality_distribution": {}
             })
             
             # No artificial delays - continuous processing
-            if i % 25 == 0:
-                logger.info(f"Processed {i+1}/{num_transactions} transactions")
+            if len(results["transactions"]) % 25 == 1:
+                logger.info(f"Processed {len(results['transactions'])}/{num_transactions} transactions")
         
         total_time = time.time() - start_time
         
@@ -336,24 +465,43 @@ class StrebaCOMCloudNetwork:
             "throughput_tps": num_transactions / total_time,
             "average_confidence": np.mean(confidence_scores) if confidence_scores else 0,
             "average_processing_time": total_processing_time / max(len(confidence_scores), 1),
-            "constant_time_validation": np.std([r["processing_time"] for tx in results["transactions"] for r in tx.get("validator_responses", [])]) < 0.01 if any(tx.get("validator_responses", []) for tx in results["transactions"]) else False,  # Low variance = constant time
-            "continuous_validation": True  # No blocks used
+            "constant_time_validation": np.std(processing_times) < 0.01 if processing_times else False,  # Low variance = constant time
+            "continuous_validation": True,  # No blocks used
+            "transaction_window": window,
+            "offered_tps": arrival_rate,  # None: whole backlog offered at once
+            "queueing_delay": summarize_delays(queueing_delays),  # Waiting for a window slot
+            "validation_delay": summarize_delays(validation_delays),  # Admission to the slowest validator's answer
+            "end_to_end_latency": summarize_delays([queued + validating for queued, validating
+                                                    in zip(queueing_delays, validation_delays)])
         }
         
         results["consensus_analysis"] = {
-            "total_finality_rate": sum(finality_achievements.values()) / (num_transactions * self.num_validators),
+            "total_finality_rate": sum(finality_achievements.values()) / num_transactions,  # One consensus tier per transaction
             "finality_distribution": finality_achievements,
             "byzantine_resilience": self.byzantine_count / self.num_validators,
             "consensus_efficiency": len([tx for tx in results["transactions"] if tx["consensus_achieved"]]) / num_transactions
         }
         
+        results["phase_synchronization"] = {
+            "coupling_strength": self.phase_network.coupling_strength,
+            "time": phase_times,
+            "order_parameter": order_parameters,
+            "final_order_parameter": order_parameters[-1],
+            "phase_locked": order_parameters[-1] > 0.95
+        }
+        
         # Test linear scalability claim
         results["scalability_validation"] = await self.test_linear_scalability()
         
         return results
     
-    async def test_linear_scalability(self) -> Dict:
-        """Test your paper's linear scalability claim"""
+    async def test_linear_scalability(self, transactions_per_size: int = 20) -> Dict:
+        """
+        Test your paper's linear scalability claim
+        Each validator subset validates a stream of transactions_per_size transactions
+        through the transaction window, so the rates measure the protocol rather than one
+        gather of the slowest validator's delay
+        """
         logger.info("Testing linear scalability claim")
         
         scalability_results = []
@@ -368,27 +516,30 @@ class StrebaCOMCloudNetwork:
             start_time = time.time()
             
             # Process test transactions
-            test_tx = {
-                "tx_id": f"scalability_test_{size}",
+            test_transactions = ({
+                "tx_id": f"scalability_test_{size}_{i}",
                 "from_addr": "test_addr_1",
                 "to_addr": "test_addr_2", 
                 "value": 1000.0,
                 "timestamp": time.time(),
                 "risk_score": 0.3,
                 "complexity_class": 1
-            }
-            
-            tasks = [validator.process_strebacom_transaction(test_tx) for validator in test_validators]
-            responses = await asyncio.gather(*tasks, return_exceptions=True)
+            } for i in range(transactions_per_size))
             
-            successful_responses = [r for r in responses if not isinstance(r, Exception)]
+            successful_responses = 0
+            validation_delays = []
+            async for record in self.stream_transactions(test_transactions, validators=test_validators):
+                successful_responses += sum(1 for r in record["responses"] if not isinstance(r, Exception))
+                validation_delays.append(record["validation_delay"])
             processing_time = time.time() - start_time
             
             scalability_results.append({
                 "validator_count": size,
                 "processing_time": processing_time,
-                "successful_validations": len(successful_responses),
-                "throughput_per_validator": len(successful_responses) / processing_time if processing_time > 0 else 0
+                "successful_validations": successful_responses,
+                "throughput_per_validator": successful_responses / processing_time if processing_time > 0 else 0,
+                "throughput_tps": transactions_per_size / processing_time if processing_time > 0 else 0,
+                "validation_delay": summarize_delays(validation_delays)
             })
         
         # Analyze linearity
@@ -448,6 +599,7 @@ async def create_validation_report(results: Dict):
     metrics = results["performance_metrics"]
     consensus = results["consensus_analysis"]
     scalability = results["scalability_validation"]
+    synchronization = results.get("phase_synchronization", {})
     
     # Validate each claim from your paper
     claims_validation = [
@@ -470,6 +622,12 @@ async def create_validation_report(results: Dict):
         f"  Total Finality Rate: {consensus.get('total_finality_rate', 0):.2%}",
         f"  Consensus Efficiency: {consensus.get('consensus_efficiency', 0):.2%}",
         f"  Processing Time: {metrics.get('average_processing_time', 0):.4f}s per transaction",
+        f"  Transaction Window: {metrics.get('transaction_window', 1)}",
+        f"  Queueing Delay (p50/p99): {metrics.get('queueing_delay', {}).get('p50', 0):.4f}s / "
+        f"{metrics.get('queueing_delay', {}).get('p99', 0):.4f}s",
+        f"  Validation Delay (p50/p99): {metrics.get('validation_delay', {}).get('p50', 0):.4f}s / "
+        f"{metrics.get('validation_delay', {}).get('p99', 0):.4f}s",
+        f"  Kuramoto Order Parameter r: {synchronization.get('final_order_parameter', 0):.4f}",
         "",
         "CONCLUSION:",
         "-" * 50